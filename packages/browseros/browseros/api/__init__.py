@@ -17,15 +17,28 @@ from .enhanced_client import (
     CircuitBreaker,
     CircuitState,
     RequestStats,
+    EndpointStats,
     CacheEntry,
+    CircuitOpenError,
 )
 
+from .response_cache import ResponseCache, ShardedResponseCache
+from .disk_cache import DiskCache
+from .streaming import SSEEvent
+from .rate_limit import AdaptiveConcurrencyLimiter, TokenBucket
+from .hedging import HedgePolicy
+from .pool import Upstream, UpstreamPool
+from .batch import BatchRequest, BatchResult
+
 from .model_discovery import (
     ModelDiscovery,
     ModelInfo,
     BackendInfo,
     BackendType,
+    ModelBenchmark,
 )
+from .discovery_service import DiscoveryService, DiscoverySnapshot, SnapshotDiff
+from .backend_scanner import BackendScanner
 
 from .chatgpt_handler import (
     ChatGPTHandler,
@@ -43,12 +56,30 @@ __all__ = [
     'CircuitBreaker',
     'CircuitState',
     'RequestStats',
+    'EndpointStats',
     'CacheEntry',
+    'CircuitOpenError',
+    'ResponseCache',
+    'ShardedResponseCache',
+    'DiskCache',
+    'SSEEvent',
+    'TokenBucket',
+    'AdaptiveConcurrencyLimiter',
+    'HedgePolicy',
+    'Upstream',
+    'UpstreamPool',
+    'BatchRequest',
+    'BatchResult',
     # Model discovery
     'ModelDiscovery',
     'ModelInfo',
     'BackendInfo',
     'BackendType',
+    'ModelBenchmark',
+    'DiscoveryService',
+    'DiscoverySnapshot',
+    'SnapshotDiff',
+    'BackendScanner',
     # ChatGPT handler
     'ChatGPTHandler',
     'ChatGPTModel',
@@ -0,0 +1,238 @@
+"""
+Backend auto-detection for ModelDiscovery
+
+Finds inference servers on non-default ports and other machines instead of
+relying on ModelDiscovery.DEFAULT_BACKENDS:
+- Targets: hosts (names, IPs or CIDR ranges, also read from a file)
+  crossed with a port list or ranges
+- Bounded parallelism: a fixed number of workers, a short TCP connect
+  probe per target, HTTP only for open ports
+- Fingerprinting from response shapes: Ollama (/api/tags), vLLM (/v1/models
+  with max_model_len), LM Studio and other OpenAI-compatible servers
+
+Results are backend configs for ModelDiscovery.register_backends().
+"""
+
+import asyncio
+import ipaddress
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .model_discovery import BackendType, probe_tcp
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Ports inference servers commonly listen on (Ollama, LM Studio,
+# text-generation-webui, vLLM / llama.cpp / others)
+DEFAULT_SCAN_PORTS = (11434, 1234, 5000, 5001, 8000, 8001, 8080, 8081)
+
+_BACKEND_NAMES = {
+    BackendType.OLLAMA: "Ollama",
+    BackendType.LM_STUDIO: "LM Studio",
+    BackendType.VLLM: "vLLM",
+    BackendType.OPENAI_COMPATIBLE: "OpenAI-compatible",
+}
+
+
+def parse_ports(spec: Union[str, Iterable[int]]) -> List[int]:
+    """
+    Parse a port list such as "11434,1234,8000-8010"
+
+    Args:
+        spec: Comma-separated ports and inclusive ranges, or an iterable of ints
+
+    Returns:
+        Sorted unique ports
+    """
+    if not isinstance(spec, str):
+        return sorted(set(int(port) for port in spec))
+
+    ports = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        ports.update(range(int(first), int(last or first) + 1))
+    if any(not 0 < port < 65536 for port in ports):
+        raise ValueError(f"Invalid port in {spec!r}")
+    return sorted(ports)
+
+
+def expand_hosts(hosts: Iterable[str], max_hosts: int = 4096) -> List[str]:
+    """
+    Expand host names, IPs and CIDR ranges ("192.168.1.0/24") into hosts
+
+    Args:
+        hosts: Host specs
+        max_hosts: Refuse to expand to more hosts than this
+
+    Returns:
+        Hosts in input order, without duplicates
+    """
+    expanded: Dict[str, None] = {}
+    for spec in hosts:
+        spec = spec.strip()
+        if "/" in spec:
+            network = ipaddress.ip_network(spec, strict=False)
+            # Skip network/broadcast addresses except for /31, /32 (and IPv6 equivalents)
+            addresses = network.hosts() if network.num_addresses > 2 else iter(network)
+            if network.num_addresses > max_hosts:
+                raise ValueError(f"{spec} has {network.num_addresses} addresses (max_hosts={max_hosts})")
+            expanded.update((str(address), None) for address in addresses)
+        elif spec:
+            expanded[spec] = None
+    if len(expanded) > max_hosts:
+        raise ValueError(f"{len(expanded)} hosts to scan (max_hosts={max_hosts})")
+    return list(expanded)
+
+
+def read_hosts_file(path: Union[str, Path]) -> List[str]:
+    """Host specs from a file: one host, IP or CIDR range per line, '#' starts a comment"""
+    hosts = []
+    for line in Path(path).expanduser().read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            hosts.append(line)
+    return hosts
+
+
+def fingerprint_models_response(data: Dict) -> BackendType:
+    """Tell OpenAI-compatible servers apart from a /v1/models response"""
+    models = [model for model in data.get("data") or [] if isinstance(model, dict)]
+    if any("max_model_len" in model or model.get("owned_by") == "vllm" for model in models):
+        return BackendType.VLLM
+    if any(model.get("owned_by") == "organization_owner" for model in models):
+        return BackendType.LM_STUDIO
+    return BackendType.OPENAI_COMPATIBLE
+
+
+class BackendScanner:
+    """
+    Concurrent scanner for inference backends on a set of hosts and ports.
+
+    Every (host, port) pair gets a TCP connect probe; open ports are then
+    fingerprinted over HTTP. At most ``concurrency`` targets are in
+    progress at once, and targets are generated lazily, so large ranges do
+    not create one task per target.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str] = ("127.0.0.1",),
+        ports: Union[str, Iterable[int]] = DEFAULT_SCAN_PORTS,
+        concurrency: int = 64,
+        connect_timeout: float = 0.3,
+        http_timeout: float = 2.0,
+        max_hosts: int = 4096,
+    ):
+        """
+        Initialize the scanner
+
+        Args:
+            hosts: Host names, IPs or CIDR ranges (see read_hosts_file() for a file)
+            ports: Ports as ints or a spec such as "11434,8000-8010"
+            concurrency: Maximum targets probed at once
+            connect_timeout: TCP connect timeout per target (seconds)
+            http_timeout: Timeout for fingerprinting requests (seconds)
+            max_hosts: Refuse host lists (after CIDR expansion) larger than this
+        """
+        if not HAS_AIOHTTP:
+            raise ImportError("aiohttp is required. Install with: pip install aiohttp")
+
+        self.hosts = expand_hosts(hosts, max_hosts)
+        self.ports = parse_ports(ports)
+        self.concurrency = concurrency
+        self.connect_timeout = connect_timeout
+        self.http_timeout = http_timeout
+
+        self.probed = 0
+        self.open_ports = 0
+
+    def _targets(self) -> Iterator[Tuple[str, int]]:
+        for host in self.hosts:
+            for port in self.ports:
+                yield host, port
+
+    async def scan(self) -> List[Dict]:
+        """
+        Scan every target
+
+        Returns:
+            Backend configs (type, url, name) in target order, ready for
+            ModelDiscovery.register_backends()
+        """
+        targets = self._targets()
+        found: Dict[Tuple[str, int], Dict] = {}
+
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.http_timeout),
+            connector=aiohttp.TCPConnector(limit=self.concurrency, ssl=False),
+        ) as session:
+
+            async def worker():
+                # Workers share one generator; next() never awaits, so no lock is needed
+                for host, port in targets:
+                    config = await self.scan_target(session, host, port)
+                    if config is not None:
+                        found[(host, port)] = config
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        host_order = {host: index for index, host in enumerate(self.hosts)}
+        return [found[target] for target in sorted(found, key=lambda target: (host_order[target[0]], target[1]))]
+
+    async def scan_target(self, session: "aiohttp.ClientSession", host: str, port: int) -> Optional[Dict]:
+        """
+        Probe one host and port
+
+        Returns:
+            A backend config if an inference server answers, else None
+        """
+        self.probed += 1
+        if await probe_tcp(host, port, self.connect_timeout) is not None:
+            return None
+        self.open_ports += 1
+
+        base_url = f"http://[{host}]:{port}" if ":" in host else f"http://{host}:{port}"
+        backend_type = await self.fingerprint(session, base_url)
+        if backend_type is None:
+            return None
+
+        url = base_url if backend_type == BackendType.OLLAMA else f"{base_url}/v1"
+        return {
+            "type": backend_type,
+            "url": url,
+            "name": f"{_BACKEND_NAMES[backend_type]} ({host}:{port})",
+        }
+
+    async def fingerprint(self, session: "aiohttp.ClientSession", base_url: str) -> Optional[BackendType]:
+        """
+        Identify the server at a base URL from its API responses
+
+        Ollama is checked first, since it also serves /v1/models.
+
+        Returns:
+            The backend type, or None if it is not an inference server
+        """
+        data = await self._get_json(session, f"{base_url}/api/tags")
+        if isinstance(data, dict) and isinstance(data.get("models"), list):
+            return BackendType.OLLAMA
+
+        data = await self._get_json(session, f"{base_url}/v1/models")
+        if isinstance(data, dict) and isinstance(data.get("data"), list):
+            return fingerprint_models_response(data)
+        return None
+
+    async def _get_json(self, session: "aiohttp.ClientSession", url: str) -> Optional[object]:
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
@@ -0,0 +1,49 @@
+"""
+Batch request types for EnhancedAPIClient.request_many() and map()
+
+- BatchRequest: one request in a batch (the arguments of request())
+- BatchResult: its outcome, either response data or the exception it
+  raised, so one failure does not abort the batch
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class BatchRequest:
+    """One request in a batch"""
+    method: str
+    endpoint: str
+    params: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    use_cache: bool = True
+    cache_ttl: Optional[float] = None
+
+    def kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for EnhancedAPIClient.request()"""
+        return {
+            'method': self.method,
+            'endpoint': self.endpoint,
+            'params': self.params,
+            'data': self.data,
+            'headers': self.headers,
+            'use_cache': self.use_cache,
+            'cache_ttl': self.cache_ttl,
+        }
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request"""
+    index: int  # Position in the input
+    request: Optional[BatchRequest]  # None if the input could not be turned into a BatchRequest
+    data: Any = None
+    error: Optional[Exception] = None
+    latency_ms: float = 0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded"""
+        return self.error is None
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the EnhancedAPIClient cache and deduplication path.
+
+Runs many concurrent GET requests through :class:`EnhancedAPIClient` against
+an in-process fake session (no network), so the numbers reflect the
+client's own bookkeeping: cache lookups, request deduplication and cache
+writes. Three variants are compared:
+
+- ``global-lock``: the previous implementation, which took one
+  ``asyncio.Lock`` around every cache read/write and a deduplication lock
+  twice per request (waiting for in-flight requests while holding it)
+- ``lock-free``: the current implementation on a single event loop
+- ``sharded``: the current implementation backed by a thread-safe
+  :class:`ShardedResponseCache`
+
+Usage:
+    python -m browseros.api.cache_benchmark
+    python -m browseros.api.cache_benchmark --concurrency 1000 --keys 200 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .enhanced_client import EnhancedAPIClient
+from .response_cache import ShardedResponseCache
+
+VARIANTS = ("global-lock", "lock-free", "sharded")
+
+
+class _FakeResponse:
+    """Minimal stand-in for aiohttp.ClientResponse"""
+
+    status = 200
+    headers: Dict[str, str] = {}
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class _FakeSession:
+    """Answers every request after a fixed delay"""
+
+    def __init__(self, latency: float, body: bytes):
+        self.latency = latency
+        self.body = body
+
+    def request(self, **kwargs) -> "_DelayedResponse":
+        return _DelayedResponse(self.latency, self.body)
+
+    async def close(self):
+        pass
+
+
+class _DelayedResponse(_FakeResponse):
+    def __init__(self, latency: float, body: bytes):
+        super().__init__(body)
+        self._latency = latency
+
+    async def __aenter__(self):
+        await asyncio.sleep(self._latency)
+        return self
+
+
+class _GlobalLockClient(EnhancedAPIClient):
+    """EnhancedAPIClient with the previous lock-based cache and deduplication"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_lock = asyncio.Lock()
+        self._deduplication_lock = asyncio.Lock()
+
+    async def _get_cached(self, cache_key: str) -> Optional[Any]:
+        async with self._cache_lock:
+            entry = self._cache.get(cache_key)
+        return None if entry is None else entry.data
+
+    async def _set_cached(self, cache_key: str, data: Any, ttl: Optional[float] = None, size: int = 0, *validators):
+        async with self._cache_lock:
+            self._cache.set(cache_key, data, ttl or self.cache_ttl, size)
+
+    async def _deduplicate_request(self, cache_key: str, request_func) -> Tuple[Any, bool]:
+        async with self._deduplication_lock:
+            if cache_key in self._in_flight_requests:
+                return await self._in_flight_requests[cache_key], True
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight_requests[cache_key] = future
+
+        try:
+            result = await request_func()
+            future.set_result(result)
+            return result, False
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            async with self._deduplication_lock:
+                del self._in_flight_requests[cache_key]
+
+
+def _make_client(variant: str, cache_ttl: float) -> EnhancedAPIClient:
+    options = dict(base_url="http://benchmark.invalid", cache_ttl=cache_ttl, cache_sweep_interval=0)
+    if variant == "global-lock":
+        return _GlobalLockClient(**options)
+    if variant == "sharded":
+        return EnhancedAPIClient(response_cache=ShardedResponseCache(), **options)
+    return EnhancedAPIClient(**options)
+
+
+async def run_variant(
+    variant: str,
+    concurrency: int = 1000,
+    requests_per_task: int = 20,
+    keys: int = 200,
+    latency: float = 0.002,
+    cache_ttl: float = 0.005,
+) -> Dict[str, Any]:
+    """
+    Run one variant and return throughput and latency percentiles.
+
+    Args:
+        variant: One of VARIANTS
+        concurrency: Number of concurrent request loops
+        requests_per_task: GET requests issued by each loop
+        keys: Distinct URLs requested (fewer keys = more hits and dedup)
+        latency: Simulated server latency in seconds
+        cache_ttl: Cache TTL; short values keep a mix of hits and misses
+    """
+    client = _make_client(variant, cache_ttl)
+    client.session = _FakeSession(latency, json.dumps({"value": "x" * 256}).encode())
+    samples: List[float] = []
+
+    async def worker(worker_id: int):
+        for i in range(requests_per_task):
+            start = time.perf_counter()
+            await client.get(f"/items/{(worker_id * 7 + i) % keys}")
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = client.get_stats()
+    await client.close()
+
+    samples.sort()
+
+    def at(q: float) -> float:
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+
+    return {
+        "variant": variant,
+        "requests": len(samples),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "p50_ms": at(0.50),
+        "p99_ms": at(0.99),
+        "cached": stats["cached_responses"],
+        "deduplicated": stats["deduplicated_requests"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``python -m browseros.api.cache_benchmark``."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20, help="requests per concurrent loop")
+    parser.add_argument("--keys", type=int, default=200, help="distinct URLs requested")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated server latency")
+    parser.add_argument("--cache-ttl", type=float, default=0.005)
+    parser.add_argument("--variant", choices=VARIANTS, action="append", help="default: all")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [
+        asyncio.run(run_variant(
+            variant,
+            concurrency=args.concurrency,
+            requests_per_task=args.requests,
+            keys=args.keys,
+            latency=args.latency_ms / 1000,
+            cache_ttl=args.cache_ttl,
+        ))
+        for variant in args.variant or VARIANTS
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'variant':<12} {'requests':>9} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'cached':>8} {'dedup':>8}")
+    for r in results:
+        print(
+            f"{r['variant']:<12} {r['requests']:>9} {r['throughput_rps']:>10} "
+            f"{r['p50_ms']:>9} {r['p99_ms']:>9} {r['cached']:>8} {r['deduplicated']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Long-lived model discovery service for BrowserOS
+
+ModelDiscovery probes every backend from scratch on each call, which costs
+up to its timeout per dead backend. DiscoveryService keeps the latest
+results in memory instead:
+- DiscoverySnapshot: backends and models from one discovery pass
+- SnapshotDiff: models added, removed or changed and backends that came
+  up or went down between two snapshots
+- DiscoveryService: refreshes the snapshot in the background on a
+  schedule or on demand, over one long-lived session; reads are a plain
+  attribute access
+
+Sync callers (e.g. Flask views) can run the service on its own event loop
+thread with start_in_thread() and read service.snapshot from any thread.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .model_discovery import BackendInfo, ModelDiscovery, ModelInfo
+
+# (backend, model) pairs, as reported by snapshots and diffs
+ModelEntry = Tuple[BackendInfo, ModelInfo]
+
+
+@dataclass
+class DiscoverySnapshot:
+    """Backends and models from one discovery pass (treat as read-only)"""
+    backends: List[BackendInfo] = field(default_factory=list)
+    version: int = 0  # Incremented whenever a refresh changes anything
+    timestamp: float = 0.0  # When the pass finished (0 = never refreshed)
+    duration_ms: float = 0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether at least one refresh has completed"""
+        return self.timestamp > 0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the pass finished"""
+        return time.time() - self.timestamp
+
+    @property
+    def available_backends(self) -> List[BackendInfo]:
+        """Backends that responded with at least one model"""
+        return [backend for backend in self.backends if backend.is_available]
+
+    def models(self) -> List[ModelEntry]:
+        """Every model with the backend serving it"""
+        return [(backend, model) for backend in self.backends for model in backend.models]
+
+
+@dataclass
+class SnapshotDiff:
+    """Changes between two snapshots"""
+    added: List[ModelEntry] = field(default_factory=list)
+    removed: List[ModelEntry] = field(default_factory=list)
+    changed: List[ModelEntry] = field(default_factory=list)  # Same ID, different metadata
+    backends_up: List[BackendInfo] = field(default_factory=list)
+    backends_down: List[BackendInfo] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing changed"""
+        return not (self.added or self.removed or self.changed or self.backends_up or self.backends_down)
+
+    @classmethod
+    def between(cls, old: DiscoverySnapshot, new: DiscoverySnapshot) -> "SnapshotDiff":
+        """Compare two snapshots (models are matched by backend URL and model ID)"""
+        old_models: Dict[Tuple[str, str], ModelEntry] = {
+            (backend.url, model.model_id): (backend, model) for backend, model in old.models()
+        }
+        new_models: Dict[Tuple[str, str], ModelEntry] = {
+            (backend.url, model.model_id): (backend, model) for backend, model in new.models()
+        }
+        old_available = {backend.url for backend in old.available_backends}
+        new_available = {backend.url for backend in new.available_backends}
+
+        return cls(
+            added=[entry for key, entry in new_models.items() if key not in old_models],
+            removed=[entry for key, entry in old_models.items() if key not in new_models],
+            changed=[
+                entry for key, entry in new_models.items()
+                if key in old_models and old_models[key][1] != entry[1]
+            ],
+            backends_up=[backend for backend in new.available_backends if backend.url not in old_available],
+            backends_down=[backend for backend in old.available_backends if backend.url not in new_available],
+        )
+
+
+class DiscoveryService:
+    """
+    Keeps an up-to-date snapshot of local backends and their models.
+
+    The snapshot is replaced whole after each refresh, so readers never see
+    a half-finished pass and need no locks. Concurrent refresh() calls share
+    one discovery pass.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 30.0,
+        timeout: float = 2.0,
+        custom_backends: Optional[List[Dict]] = None,
+        on_change: Optional[Callable[[SnapshotDiff], None]] = None,
+        discovery: Optional[ModelDiscovery] = None,
+        enrich: bool = True,
+        debug: bool = False,
+    ):
+        """
+        Initialize the service
+
+        Args:
+            refresh_interval: Seconds between background refreshes (0 = on demand only)
+            timeout: Per-backend connection timeout in seconds
+            custom_backends: Backend configs checked in addition to the defaults
+            on_change: Called with the diff after a refresh that changed anything
+            discovery: ModelDiscovery to use instead of a private one (the
+                       caller keeps ownership: close() does not close it)
+            enrich: Fetch per-model details (context length, capabilities, ...);
+                    cached by digest, so only new models cost requests
+            debug: Enable debug logging
+        """
+        self.refresh_interval = refresh_interval
+        self.custom_backends = custom_backends
+        self.on_change = on_change
+        self.enrich = enrich
+        self.debug = debug
+        self.discovery = discovery or ModelDiscovery(timeout=timeout, debug=debug)
+        self._owns_discovery = discovery is None
+
+        self.snapshot = DiscoverySnapshot()
+        self.last_diff = SnapshotDiff()
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+    async def start(self):
+        """Open the session and start background refreshing (the first refresh runs immediately)"""
+        self._loop = asyncio.get_running_loop()
+        await self.discovery.start()
+        if self._loop_task is None and self.refresh_interval > 0:
+            self._loop_task = asyncio.create_task(self._refresh_periodically())
+
+    async def close(self):
+        """Stop refreshing and close the session"""
+        for task in (self._loop_task, self._refresh_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = None
+        self._refresh_task = None
+        if self._owns_discovery:
+            await self.discovery.close()
+
+    async def refresh(self, force: bool = False) -> SnapshotDiff:
+        """
+        Run a discovery pass now (or join the one in progress)
+
+        Args:
+            force: Also probe backends that are backing off after being unreachable
+
+        Returns:
+            Changes against the previous snapshot
+        """
+        if force:
+            self.discovery.reset_backoff()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        # Shielded: a caller giving up must not cancel the pass for the others
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self) -> SnapshotDiff:
+        start_time = time.time()
+        backends = await self.discovery.discover_all(self.custom_backends, enrich=self.enrich)
+
+        previous = self.snapshot
+        snapshot = DiscoverySnapshot(
+            backends=backends,
+            version=previous.version,
+            timestamp=time.time(),
+            duration_ms=(time.time() - start_time) * 1000,
+        )
+        diff = SnapshotDiff.between(previous, snapshot)
+        if not diff.is_empty or not previous.is_ready:
+            snapshot.version += 1
+
+        self.snapshot = snapshot
+        self.last_diff = diff
+        self.refreshes += 1
+
+        if self.debug:
+            print(
+                f"[Discovery Service] v{snapshot.version}: +{len(diff.added)} -{len(diff.removed)} "
+                f"~{len(diff.changed)} models ({snapshot.duration_ms:.0f}ms)"
+            )
+        if not diff.is_empty and self.on_change:
+            self.on_change(diff)
+        return diff
+
+    async def _refresh_periodically(self):
+        """Refresh on a schedule, keeping the last good snapshot on failure"""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.refresh_errors += 1
+                if self.debug:
+                    print(f"[Discovery Service ERROR] Refresh failed: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    # Sync API: the service runs on its own event loop thread
+
+    def start_in_thread(self):
+        """
+        Run the service on a background event loop thread
+
+        Raises:
+            Exception: Whatever start() raised; the thread is not left running
+        """
+        if self._thread is not None:
+            return
+
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        startup_error: List[BaseException] = []
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:
+                startup_error.append(e)
+                loop.run_until_complete(self.close())
+                loop.close()
+                return
+            finally:
+                started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.close())
+            loop.close()
+
+        thread = threading.Thread(target=run, name="model-discovery", daemon=True)
+        thread.start()
+        started.wait()
+        if startup_error:
+            thread.join()
+            raise startup_error[0]
+        self._thread = thread
+
+    def refresh_threadsafe(self, timeout: Optional[float] = None, force: bool = False) -> SnapshotDiff:
+        """Run (or join) a discovery pass from another thread and wait for it"""
+        if self._thread is None:
+            raise RuntimeError("DiscoveryService is not running in a thread; call start_in_thread() first")
+        return asyncio.run_coroutine_threadsafe(self.refresh(force), self._loop).result(timeout)
+
+    def stop_thread(self):
+        """Stop the background thread started by start_in_thread()"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,283 @@
+"""
+Persistent on-disk cache tier for EnhancedAPIClient
+
+Keeps cached responses across restarts so a cold worker pool does not
+re-hit every backend at once:
+- SQLite database in a cache directory, keyed by the client's cache keys
+- Values stored as zlib-compressed JSON
+- Total compressed size capped, evicting least recently used entries
+- Safe for several processes sharing one directory (WAL journal, immediate
+  write transactions, busy timeout)
+- Reads never write: access times are buffered and saved in batches, and
+  the total size is kept up to date by triggers, so hits don't contend for
+  the write lock and writes don't scan the table
+
+Methods block on disk I/O; EnhancedAPIClient calls them in a worker thread.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from .response_cache import CacheEntry
+
+DB_FILENAME = "api_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    ttl REAL NOT NULL,
+    stale_ttl REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+
+-- Running totals over responses, maintained by the triggers below
+CREATE TABLE IF NOT EXISTS cache_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_meta (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM responses;
+INSERT OR IGNORE INTO cache_meta (name, value) SELECT 'entries', COUNT(*) FROM responses;
+
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE cache_meta SET value = value + NEW.size WHERE name = 'bytes';
+    UPDATE cache_meta SET value = value + 1 WHERE name = 'entries';
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE cache_meta SET value = value - OLD.size WHERE name = 'bytes';
+    UPDATE cache_meta SET value = value - 1 WHERE name = 'entries';
+END;
+CREATE TRIGGER IF NOT EXISTS responses_resize AFTER UPDATE OF size ON responses BEGIN
+    UPDATE cache_meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+END;
+"""
+
+# Rows deleted per query while evicting
+_EVICT_BATCH = 64
+
+
+class DiskCache:
+    """
+    SQLite-backed response cache shared by threads and processes.
+
+    Entries keep their original timestamp, TTL and validators, so an entry
+    loaded from disk expires and revalidates exactly like one that never
+    left memory.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+        busy_timeout: float = 30.0,
+        access_flush_size: int = 256,
+    ):
+        """
+        Open (or create) the cache
+
+        Args:
+            directory: Cache directory; created if missing
+            max_bytes: Maximum total compressed size of stored responses
+            compression_level: zlib level (1 = fastest, 9 = smallest)
+            busy_timeout: Seconds to wait for another process's write lock
+            access_flush_size: Hits buffered before their access times are
+                               saved (they are also saved with every write)
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / DB_FILENAME
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.access_flush_size = access_flush_size
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=busy_timeout,
+            isolation_level=None,  # Explicit transactions only
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # One transaction, so no rows land between counting them and adding the triggers
+        self._conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+
+        # Key -> last access time, not yet saved (hits don't write to the database)
+        self._accessed: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Load an entry that is fresh or still within its stale period
+
+        Returns:
+            The entry (with its original timestamp), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, raw_size, created, ttl, stale_ttl, etag, last_modified "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, raw_size, created, ttl, stale_ttl, etag, last_modified = row
+            entry = CacheEntry(
+                data=None,
+                timestamp=created,
+                ttl=ttl,
+                size=raw_size,
+                etag=etag,
+                last_modified=last_modified,
+                stale_ttl=stale_ttl,
+            )
+            if not entry.is_retained():
+                # Left for sweep() or eviction, so a miss never writes
+                self.misses += 1
+                return None
+
+            self._accessed[key] = time.time()
+            self.hits += 1
+            if len(self._accessed) >= self.access_flush_size:
+                self._write(self._flush_accessed)
+
+        entry.data = json.loads(zlib.decompress(value))
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> bool:
+        """
+        Store an entry, evicting least recently used entries over the size cap
+
+        Returns:
+            False if the compressed entry alone exceeds the cap
+        """
+        value = zlib.compress(json.dumps(entry.data).encode(), self.compression_level)
+        if len(value) > self.max_bytes:
+            return False
+
+        def store():
+            # An upsert (not INSERT OR REPLACE) so the size triggers see the replaced row
+            self._conn.execute(
+                "INSERT INTO responses "
+                "(key, value, size, raw_size, created, ttl, stale_ttl, etag, last_modified, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "raw_size = excluded.raw_size, created = excluded.created, ttl = excluded.ttl, "
+                "stale_ttl = excluded.stale_ttl, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, accessed = excluded.accessed",
+                (
+                    key, value, len(value), entry.size, entry.timestamp, entry.ttl,
+                    entry.stale_ttl, entry.etag, entry.last_modified, time.time(),
+                ),
+            )
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            self._evict()
+
+        with self._lock:
+            self._write(store)
+            self.writes += 1
+        return True
+
+    def _write(self, operation: Callable[[], None]):
+        """Run operation() in an immediate write transaction (lock held)"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            operation()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _flush_accessed(self):
+        """Save buffered access times (transaction held)"""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE responses SET accessed = MAX(accessed, ?) WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT value FROM cache_meta WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self):
+        """Delete least recently used rows until under the size cap (transaction held)"""
+        total = self._total_bytes()
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT ?", (_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry; returns whether it existed"""
+        with self._lock:
+            self._accessed.pop(key, None)
+            return self._conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount > 0
+
+    def sweep(self) -> int:
+        """Remove entries past their stale period; returns how many were removed"""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM responses WHERE created + ttl + stale_ttl < ?", (time.time(),)
+            ).rowcount
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM responses")
+
+    def flush(self):
+        """Save buffered access times now"""
+        with self._lock:
+            if self._accessed:
+                self._write(self._flush_accessed)
+
+    def close(self):
+        """Save buffered access times and close the database connection"""
+        with self._lock:
+            if self._accessed:
+                self._write(self._flush_accessed)
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Occupancy (across all processes) and this process's counters"""
+        with self._lock:
+            totals = dict(self._conn.execute("SELECT name, value FROM cache_meta").fetchall())
+        return {
+            'disk_cache_size': totals['entries'],
+            'disk_cache_bytes': totals['bytes'],
+            'disk_cache_max_bytes': self.max_bytes,
+            'disk_cache_hits': self.hits,
+            'disk_cache_misses': self.misses,
+            'disk_cache_writes': self.writes,
+            'disk_cache_evictions': self.evictions,
+        }
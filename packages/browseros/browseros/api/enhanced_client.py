@@ -4,8 +4,20 @@ Enhanced API Client for BrowserOS
 Provides improved performance, reliability, and usability for API interactions:
 - Connection pooling for HTTP requests
 - Request deduplication to prevent duplicate concurrent requests
+- Lock-free cache and deduplication bookkeeping on the event loop
 - Exponential backoff retry logic with jitter
-- Response caching with TTL support
+- Response caching with TTL support, bounded by entry count and size (LRU)
+- Conditional revalidation (ETag/Last-Modified), stale-while-revalidate and
+  stale-if-error
+- Optional persistent disk cache tier shared across restarts and processes
+- Streaming responses (raw chunks, lines, NDJSON, Server-Sent Events)
+- Token-bucket rate limits honoring Retry-After, adaptive (AIMD) concurrency
+- Latency histograms (p50/p95/p99) per endpoint, method and status, with a
+  Prometheus exporter
+- Hedged requests: duplicate slow idempotent requests, first response wins
+- Upstream pools: load balancing across replicas with per-host circuit
+  breakers and health probing
+- Batches: request_many() / map() with bounded concurrency and per-request errors
 - WebSocket support for real-time updates
 - Circuit breaker pattern for fault tolerance
 - Request/response logging integration
@@ -14,12 +26,24 @@ Provides improved performance, reliability, and usability for API interactions:
 import asyncio
 import hashlib
 import json
+import os
+import sqlite3
 import time
 from collections import defaultdict
+from contextlib import asynccontextmanager, nullcontext
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
-from urllib.parse import urljoin
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+from ..metrics import LatencyHistogram
+from .batch import BatchRequest, BatchResult
+from .disk_cache import DiskCache
+from .hedging import HedgePolicy
+from .pool import Upstream, UpstreamPool
+from .rate_limit import AdaptiveConcurrencyLimiter, TokenBucket, parse_retry_after
+from .response_cache import CacheEntry, ResponseCache, ShardedResponseCache
+from .streaming import STREAM_FORMATS, LineSplitter, SSEDecoder, detect_format
 
 try:
     import aiohttp
@@ -29,6 +53,11 @@ except ImportError:
     print("[Warning] aiohttp not installed. Install with: pip install aiohttp")
 
 
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the endpoint's circuit is open"""
+    pass
+
+
 class CircuitState(Enum):
     """Circuit breaker states"""
     CLOSED = "closed"  # Normal operation
@@ -36,18 +65,6 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing if service recovered
 
 
-@dataclass
-class CacheEntry:
-    """Cached response entry"""
-    data: Any
-    timestamp: float
-    ttl: float
-
-    def is_expired(self) -> bool:
-        """Check if cache entry has expired"""
-        return time.time() - self.timestamp > self.ttl
-
-
 @dataclass
 class CircuitBreaker:
     """Circuit breaker for fault tolerance"""
@@ -96,6 +113,67 @@ class CircuitBreaker:
         return self.half_open_calls < self.half_open_max_calls
 
 
+@dataclass
+class EndpointStats:
+    """Request counts and latency histograms for one endpoint or method"""
+    count: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)  # Network requests
+    cache_latency: LatencyHistogram = field(default_factory=LatencyHistogram)  # Cache hits
+
+    def record(self, seconds: float, success: bool, from_cache: bool):
+        """Record one request"""
+        self.count += 1
+        if not success:
+            self.errors += 1
+        if from_cache:
+            self.cache_hits += 1
+            self.cache_latency.observe(seconds)
+        else:
+            self.latency.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts plus latency summaries in milliseconds"""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'latency_ms': self.latency.snapshot(),
+            'cache_latency_ms': self.cache_latency.snapshot(),
+        }
+
+
+# Label used for endpoints beyond RequestStats.max_endpoints
+OTHER_ENDPOINTS = 'other'
+
+# get_stats() values that only ever grow, exported as Prometheus counters
+# (with a _total suffix); other numeric values are exported as gauges
+_COUNTER_STATS = {
+    'total_requests': 'Requests made through the client.',
+    'successful_requests': 'Requests that succeeded.',
+    'failed_requests': 'Requests that failed after retries.',
+    'cached_responses': 'Requests served from the response cache.',
+    'deduplicated_requests': 'Requests that joined an identical request in flight.',
+    'stale_responses': 'Stale cached responses served while revalidating.',
+    'revalidated_responses': 'Cached responses revalidated with a conditional request.',
+    'hedged_requests': 'Hedged duplicate requests sent.',
+    'hedge_wins': 'Requests answered first by a hedge.',
+    'streamed_requests': 'Streaming requests opened.',
+    'streamed_bytes': 'Bytes received by streaming requests.',
+    'cache_evictions': 'Response cache entries evicted for space.',
+    'cache_expirations': 'Response cache entries dropped after expiring.',
+    'disk_cache_hits': 'Disk cache hits in this process.',
+    'disk_cache_misses': 'Disk cache misses in this process.',
+    'disk_cache_writes': 'Disk cache writes in this process.',
+    'disk_cache_evictions': 'Disk cache entries evicted by this process.',
+    'rate_limit_waits': 'Requests delayed by a rate limit.',
+    'rate_limit_wait_ms': 'Milliseconds spent waiting on rate limits.',
+    'concurrency_increases': 'Adaptive concurrency limit increases.',
+    'concurrency_decreases': 'Adaptive concurrency limit decreases.',
+}
+
+
 @dataclass
 class RequestStats:
     """Statistics for API requests"""
@@ -104,10 +182,60 @@ class RequestStats:
     failed_requests: int = 0
     cached_responses: int = 0
     deduplicated_requests: int = 0
+    stale_responses: int = 0
+    revalidated_responses: int = 0
+    streamed_requests: int = 0
+    streamed_bytes: int = 0
+    hedged_requests: int = 0  # Hedges sent
+    hedge_wins: int = 0  # Hedges that answered first
     total_latency_ms: float = 0
 
-    def record_request(self, latency_ms: float, success: bool, from_cache: bool = False, deduplicated: bool = False):
-        """Record request statistics"""
+    # Breakdowns (fixed-memory histograms); endpoints beyond max_endpoints
+    # are grouped under OTHER_ENDPOINTS to bound memory
+    max_endpoints: int = 200
+    overall: EndpointStats = field(default_factory=EndpointStats)
+    endpoints: Dict[str, EndpointStats] = field(default_factory=dict)
+    methods: Dict[str, EndpointStats] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    def record_request(
+        self,
+        latency_ms: float,
+        success: bool,
+        from_cache: bool = False,
+        deduplicated: bool = False,
+        endpoint: Optional[str] = None,
+        method: Optional[str] = None,
+        status: Optional[Union[int, str]] = None,
+    ):
+        """
+        Record request statistics
+
+        Args:
+            latency_ms: Time taken (cache lookup time for cache hits)
+            success: Whether the request succeeded
+            from_cache: Served from cache (timed separately from network requests)
+            deduplicated: Served by another in-flight request
+            endpoint: Endpoint for the per-endpoint breakdown
+            method: HTTP method for the per-method breakdown
+            status: HTTP status code, or an error label such as 'timeout'
+        """
+        seconds = latency_ms / 1000
+        self.overall.record(seconds, success, from_cache)
+        if endpoint is not None:
+            if endpoint not in self.endpoints and len(self.endpoints) >= self.max_endpoints:
+                endpoint = OTHER_ENDPOINTS
+            if endpoint not in self.endpoints:
+                self.endpoints[endpoint] = EndpointStats()
+            self.endpoints[endpoint].record(seconds, success, from_cache)
+        if method is not None:
+            method = method.upper()
+            if method not in self.methods:
+                self.methods[method] = EndpointStats()
+            self.methods[method].record(seconds, success, from_cache)
+        if status is not None:
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
         self.total_requests += 1
         self.total_latency_ms += latency_ms
 
@@ -134,6 +262,72 @@ class RequestStats:
             return 0
         return self.successful_requests / self.total_requests
 
+    def prometheus_lines(self, prefix: str) -> List[str]:
+        """Render the breakdowns in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        groups = (('endpoint', self.endpoints), ('method', self.methods))
+        for label, entries in groups:
+            name = family(f"requests_by_{label}_total", "counter", f"Requests, by {label}.")
+            lines.extend(f'{name}{{{label}="{_label(key)}"}} {stats.count}' for key, stats in entries.items())
+            name = family(f"request_errors_by_{label}_total", "counter", f"Failed requests, by {label}.")
+            lines.extend(f'{name}{{{label}="{_label(key)}"}} {stats.errors}' for key, stats in entries.items())
+            name = family(f"cache_hits_by_{label}_total", "counter", f"Requests served from cache, by {label}.")
+            lines.extend(f'{name}{{{label}="{_label(key)}"}} {stats.cache_hits}' for key, stats in entries.items())
+            name = family(f"request_duration_by_{label}_seconds", "histogram", f"Network request latency, by {label}.")
+            for key, stats in entries.items():
+                lines.extend(stats.latency.prometheus_lines(name, f'{label}="{_label(key)}"'))
+            name = family(f"cache_duration_by_{label}_seconds", "histogram", f"Cache hit latency, by {label}.")
+            for key, stats in entries.items():
+                lines.extend(stats.cache_latency.prometheus_lines(name, f'{label}="{_label(key)}"'))
+
+        name = family("responses_by_status_total", "counter", "Responses, by HTTP status or error.")
+        lines.extend(f'{name}{{status="{_label(status)}"}} {count}' for status, count in self.statuses.items())
+        return lines
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _status_label(error: BaseException) -> str:
+    """Status breakdown label for a failed request"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return str(error.status)
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout'
+    return 'error'
+
+
+def _consume_result(task: asyncio.Future):
+    """Retrieve a finished task's exception so asyncio does not log it as unhandled"""
+    if not task.cancelled():
+        task.exception()
+
+
+def _is_overload(error: Exception) -> bool:
+    """Whether an error means the upstream is overloaded (rather than the request being bad)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+@dataclass
+class _FetchResult:
+    """Decoded response plus the metadata the cache keeps"""
+    data: Any
+    size: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
 
 class EnhancedAPIClient:
     """
@@ -143,13 +337,26 @@ class EnhancedAPIClient:
 
     def __init__(
         self,
-        base_url: str,
+        base_url: Union[str, List[str], UpstreamPool],
         timeout: float = 30.0,
         max_connections: int = 100,
         max_retries: int = 3,
         retry_base_delay: float = 1.0,
         retry_max_delay: float = 32.0,
         cache_ttl: float = 300.0,  # 5 minutes default
+        cache_max_entries: int = 1000,
+        cache_max_bytes: int = 50 * 1024 * 1024,  # 50 MB
+        cache_sweep_interval: float = 60.0,
+        response_cache: Optional[Union[ResponseCache, ShardedResponseCache]] = None,
+        cache_stale_ttl: float = 300.0,
+        stale_while_revalidate: bool = False,
+        stale_if_error: bool = False,
+        disk_cache: Optional[DiskCache] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: Optional[int] = None,
+        endpoint_rate_limits: Optional[Dict[str, Union[float, Tuple[float, int]]]] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
         enable_deduplication: bool = True,
         enable_circuit_breaker: bool = True,
         headers: Optional[Dict[str, str]] = None,
@@ -159,13 +366,38 @@ class EnhancedAPIClient:
         Initialize the enhanced API client
 
         Args:
-            base_url: Base URL for API requests
+            base_url: Base URL for API requests, or a list of replica base
+                      URLs / an UpstreamPool to load-balance across
             timeout: Request timeout in seconds
             max_connections: Maximum number of concurrent connections
             max_retries: Maximum number of retry attempts
             retry_base_delay: Base delay for exponential backoff (seconds)
             retry_max_delay: Maximum delay between retries (seconds)
             cache_ttl: Cache time-to-live in seconds
+            cache_max_entries: Maximum number of cached responses (LRU eviction)
+            cache_max_bytes: Maximum total size of cached response bodies
+            cache_sweep_interval: Seconds between background sweeps of expired
+                                  cache entries (0 disables sweeping)
+            response_cache: Cache instance to use instead of a private one,
+                            e.g. a ShardedResponseCache shared by clients on
+                            several threads (cache_max_* are then ignored)
+            cache_stale_ttl: Seconds an expired entry is kept for conditional
+                             revalidation and stale serving
+            stale_while_revalidate: Serve expired entries immediately while
+                                    refreshing them in the background
+            stale_if_error: Serve expired entries when the request fails or
+                            the endpoint's circuit is open
+            disk_cache: Persistent second cache tier (e.g. DiskCache('~/.cache/browseros/api'));
+                        may be shared by several clients and processes
+            rate_limit: Requests per second allowed to each host (token bucket)
+            rate_limit_burst: Requests a host bucket allows back to back
+                              (default: max(1, rate_limit))
+            endpoint_rate_limits: Per-endpoint limits, mapping an endpoint to
+                                  a rate or a (rate, burst) tuple
+            concurrency_limiter: Adaptive (AIMD) limit on concurrent requests,
+                                 e.g. AdaptiveConcurrencyLimiter(max_limit=64)
+            hedge_policy: Send a duplicate of slow idempotent requests, e.g.
+                          HedgePolicy(alternate_base_urls=['http://replica:11434'])
             enable_deduplication: Enable request deduplication
             enable_circuit_breaker: Enable circuit breaker pattern
             headers: Default headers for all requests
@@ -174,12 +406,20 @@ class EnhancedAPIClient:
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required for EnhancedAPIClient. Install with: pip install aiohttp")
 
-        self.base_url = base_url.rstrip('/')
+        # Pool mode: the first replica's URL still names the API in cache keys
+        if isinstance(base_url, (list, tuple)):
+            base_url = UpstreamPool(base_url)
+        self.pool: Optional[UpstreamPool] = base_url if isinstance(base_url, UpstreamPool) else None
+        self.base_url = self.pool.upstreams[0].base_url if self.pool else base_url.rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_base_delay = retry_base_delay
         self.retry_max_delay = retry_max_delay
         self.cache_ttl = cache_ttl
+        self.cache_sweep_interval = cache_sweep_interval
+        self.cache_stale_ttl = cache_stale_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
         self.enable_deduplication = enable_deduplication
         self.enable_circuit_breaker = enable_circuit_breaker
         self.debug = debug
@@ -195,15 +435,31 @@ class EnhancedAPIClient:
         self.session: Optional[aiohttp.ClientSession] = None
         self.default_headers = headers or {}
 
-        # Caching
-        self._cache: Dict[str, CacheEntry] = {}
-        self._cache_lock = asyncio.Lock()
+        # Caching (no lock: cache operations never await, so they cannot
+        # interleave on the event loop)
+        if response_cache is None:
+            response_cache = ResponseCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+        self._cache = response_cache
+        self._disk_cache = disk_cache
+
+        # Rate limiting and adaptive concurrency
+        self.rate_limit = rate_limit
+        self.rate_limit_burst = rate_limit_burst
+        self._host_buckets: Dict[str, TokenBucket] = {}
+        self._endpoint_buckets: Dict[str, TokenBucket] = {}
+        for limited_endpoint, limit in (endpoint_rate_limits or {}).items():
+            rate, burst = limit if isinstance(limit, tuple) else (limit, None)
+            self._endpoint_buckets['/' + limited_endpoint.lstrip('/')] = TokenBucket(rate, burst)
+        self.concurrency_limiter = concurrency_limiter
+        self.hedge_policy = hedge_policy
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._refresh_tasks: Set[asyncio.Task] = set()
 
         # Request deduplication
         self._in_flight_requests: Dict[str, asyncio.Future] = {}
-        self._deduplication_lock = asyncio.Lock()
 
-        # Circuit breaker per endpoint
+        # Circuit breaker per endpoint (per replica base URL in pool mode)
         self._circuit_breakers: Dict[str, CircuitBreaker] = defaultdict(CircuitBreaker)
 
         # Statistics
@@ -226,9 +482,26 @@ class EnhancedAPIClient:
                 timeout=aiohttp.ClientTimeout(total=self.timeout),
                 headers=self.default_headers,
             )
+        if self._sweep_task is None and self.cache_sweep_interval > 0:
+            self._sweep_task = asyncio.create_task(self._sweep_cache_periodically())
+        if self._probe_task is None and self.pool and self.pool.health_check_path:
+            self._probe_task = asyncio.create_task(self._probe_upstreams_periodically())
 
     async def close(self):
         """Close the client session"""
+        for task in (self._sweep_task, self._probe_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sweep_task = None
+        self._probe_task = None
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
         if self.session:
             await self.session.close()
             self.session = None
@@ -248,58 +521,183 @@ class EnhancedAPIClient:
 
     async def _get_cached(self, cache_key: str) -> Optional[Any]:
         """Get cached response if available and not expired"""
-        async with self._cache_lock:
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
-                if not entry.is_expired():
-                    if self.debug:
-                        print(f"[Cache HIT] {cache_key}")
-                    return entry.data
-                else:
-                    del self._cache[cache_key]
-                    if self.debug:
-                        print(f"[Cache EXPIRED] {cache_key}")
-        return None
-
-    async def _set_cached(self, cache_key: str, data: Any, ttl: Optional[float] = None):
-        """Store response in cache"""
-        async with self._cache_lock:
-            self._cache[cache_key] = CacheEntry(
-                data=data,
-                timestamp=time.time(),
-                ttl=ttl or self.cache_ttl,
-            )
+        entry = self._cache.get(cache_key)
+        if entry is not None:
             if self.debug:
-                print(f"[Cache SET] {cache_key}")
+                print(f"[Cache HIT] {cache_key}")
+            return entry.data
+
+        if self._disk_cache is None:
+            return None
+
+        # Second tier: possibly written by an earlier run or another process
+        try:
+            entry = await asyncio.to_thread(self._disk_cache.get, cache_key)
+        except sqlite3.Error as e:
+            if self.debug:
+                print(f"[Disk Cache ERROR] {cache_key} - {str(e)}")
+            return None
+        if entry is None:
+            return None
+
+        # Promote into memory (stale entries too, for revalidation) unless memory is newer
+        current = self._cache.get_stale(cache_key)
+        if current is None or entry.timestamp > current.timestamp:
+            self._cache.put(cache_key, entry)
+        if entry.is_expired():
+            return None
+        if self.debug:
+            print(f"[Disk Cache HIT] {cache_key}")
+        return entry.data
+
+    async def _set_cached(
+        self,
+        cache_key: str,
+        data: Any,
+        ttl: Optional[float] = None,
+        size: int = 0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store response in cache, evicting least recently used entries if over the limits"""
+        # Expired entries are only worth keeping if they can be revalidated or served stale
+        keep_stale = etag or last_modified or self.stale_while_revalidate or self.stale_if_error
+        entry = CacheEntry(
+            data=data,
+            timestamp=time.time(),
+            ttl=ttl or self.cache_ttl,
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+            stale_ttl=self.cache_stale_ttl if keep_stale else 0.0,
+        )
+        stored = self._cache.put(cache_key, entry)
+        if self.debug:
+            print(f"[Cache SET] {cache_key}" if stored else f"[Cache SKIP] {cache_key} ({size} bytes exceeds limit)")
+
+        if self._disk_cache is not None:
+            try:
+                await asyncio.to_thread(self._disk_cache.set, cache_key, entry)
+            except sqlite3.Error as e:
+                if self.debug:
+                    print(f"[Disk Cache ERROR] {cache_key} - {str(e)}")
+
+    def _refresh_in_background(self, cache_key: str, fetch: Callable):
+        """Refresh a stale entry without blocking the caller (deduplicated with other fetches)"""
+        async def refresh():
+            try:
+                await self._deduplicate_request(cache_key, fetch)
+            except Exception as e:
+                if self.debug:
+                    print(f"[Cache REFRESH ERROR] {cache_key} - {str(e)}")
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _sweep_cache_periodically(self):
+        """Background task removing expired cache entries"""
+        while True:
+            await asyncio.sleep(self.cache_sweep_interval)
+            removed = self._cache.sweep()
+            if self._disk_cache is not None:
+                try:
+                    removed += await asyncio.to_thread(self._disk_cache.sweep)
+                except sqlite3.Error as e:
+                    if self.debug:
+                        print(f"[Disk Cache ERROR] sweep - {str(e)}")
+            if self.debug and removed:
+                print(f"[Cache SWEEP] Removed {removed} expired entries")
 
     async def _deduplicate_request(self, cache_key: str, request_func: Callable) -> Tuple[Any, bool]:
         """Deduplicate concurrent identical requests"""
         if not self.enable_deduplication:
             return await request_func(), False
 
-        async with self._deduplication_lock:
-            if cache_key in self._in_flight_requests:
-                if self.debug:
-                    print(f"[Dedup] Waiting for in-flight request: {cache_key}")
-                # Wait for the in-flight request to complete
-                future = self._in_flight_requests[cache_key]
-                result = await future
-                return result, True
+        # No lock needed: nothing between the lookup and the insert awaits
+        while cache_key in self._in_flight_requests:
+            if self.debug:
+                print(f"[Dedup] Waiting for in-flight request: {cache_key}")
+            future = self._in_flight_requests[cache_key]
+            try:
+                # Shield so a waiter being cancelled does not cancel the shared future
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The original request was cancelled; issue our own
 
-            # Create new future for this request
-            future = asyncio.Future()
-            self._in_flight_requests[cache_key] = future
+        # Create new future for this request
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight_requests[cache_key] = future
 
         try:
             result = await request_func()
-            future.set_result(result)
-            return result, False
-        except Exception as e:
-            future.set_exception(e)
+        except BaseException as e:
+            del self._in_flight_requests[cache_key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # Mark retrieved in case nobody was waiting
+            else:
+                future.cancel()
             raise
-        finally:
-            async with self._deduplication_lock:
-                del self._in_flight_requests[cache_key]
+
+        del self._in_flight_requests[cache_key]
+        future.set_result(result)
+        return result, False
+
+    def _select_upstream(self, avoid: Optional[Upstream] = None) -> Upstream:
+        """
+        Pick a pool replica whose circuit allows a request
+
+        Args:
+            avoid: Replica to skip if another is available (e.g. the one that just failed)
+        """
+        probing = self.pool.health_check_path is not None
+        candidates = []
+        for upstream in self.pool.upstreams:
+            if self.enable_circuit_breaker:
+                circuit_breaker = self._circuit_breakers[upstream.base_url]
+                # With probing, only a successful probe readmits an ejected replica
+                if probing and circuit_breaker.state == CircuitState.OPEN:
+                    continue
+                if not circuit_breaker.can_attempt():
+                    continue
+            candidates.append(upstream)
+
+        if not candidates:
+            raise CircuitOpenError("Circuit breaker OPEN for every upstream. Service unavailable.")
+        if avoid in candidates and len(candidates) > 1:
+            candidates.remove(avoid)
+        return self.pool.choose(candidates)
+
+    async def _probe_upstreams_periodically(self):
+        """Probe ejected replicas and readmit those that answer"""
+        pool = self.pool
+        probe_timeout = aiohttp.ClientTimeout(total=pool.health_check_timeout)
+
+        async def probe(upstream: Upstream):
+            try:
+                async with self.session.get(upstream.url_for(pool.health_check_path), timeout=probe_timeout) as response:
+                    healthy = response.status < 400
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                healthy = False
+            if healthy:
+                # Half-open: a few successful requests close the circuit again
+                circuit_breaker = self._circuit_breakers[upstream.base_url]
+                circuit_breaker.state = CircuitState.HALF_OPEN
+                circuit_breaker.half_open_calls = 0
+            if self.debug:
+                print(f"[Pool] Probe {upstream.base_url} - {'healthy' if healthy else 'unhealthy'}")
+
+        while True:
+            await asyncio.sleep(pool.health_check_interval)
+            ejected = [
+                upstream for upstream in pool.upstreams
+                if self._circuit_breakers[upstream.base_url].state == CircuitState.OPEN
+            ]
+            if ejected and self.session:
+                await asyncio.gather(*(probe(upstream) for upstream in ejected))
 
     def _calculate_backoff_delay(self, attempt: int) -> float:
         """Calculate exponential backoff delay with jitter"""
@@ -308,17 +706,85 @@ class EnhancedAPIClient:
         jitter = delay * 0.2 * (2 * (time.time() % 1) - 1)
         return delay + jitter
 
-    async def _retry_with_backoff(self, request_func: Callable, endpoint: str) -> Any:
-        """Execute request with exponential backoff retry"""
-        circuit_breaker = self._circuit_breakers[endpoint] if self.enable_circuit_breaker else None
+    def _rate_buckets(self, url: str, endpoint: str) -> List[TokenBucket]:
+        """Token buckets that apply to a request"""
+        buckets = []
+        if self.rate_limit:
+            host = urlparse(url).netloc
+            if host not in self._host_buckets:
+                self._host_buckets[host] = TokenBucket(self.rate_limit, self.rate_limit_burst)
+            buckets.append(self._host_buckets[host])
+        endpoint_bucket = self._endpoint_buckets.get('/' + endpoint.lstrip('/'))
+        if endpoint_bucket:
+            buckets.append(endpoint_bucket)
+        return buckets
+
+    @asynccontextmanager
+    async def _limited(self, url: str, endpoint: str):
+        """Wait for rate limits and a concurrency slot around one attempt"""
+        for bucket in self._rate_buckets(url, endpoint):
+            await bucket.acquire()
+
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            yield
+            return
+
+        await limiter.acquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            limiter.release(time.monotonic() - start_time, overloaded=_is_overload(e))
+            raise
+        except BaseException:
+            limiter.release(None)
+            raise
+        else:
+            limiter.release(time.monotonic() - start_time)
+
+    async def _retry_with_backoff(
+        self,
+        request_func: Callable,
+        endpoint: str,
+        url: Optional[str] = None,
+        circuit_key: Optional[str] = None,
+        max_retries: Optional[int] = None,
+    ) -> Any:
+        """
+        Execute request with rate limiting and exponential backoff retry
+
+        Args:
+            request_func: Coroutine function called with the URL of each attempt
+            endpoint: API endpoint (rate limits, circuit breaker)
+            url: Target URL; by default the endpoint on base_url, or in pool
+                 mode on a replica chosen for each attempt
+            circuit_key: Circuit breaker to use (default: the endpoint's)
+            max_retries: Override the client's max_retries
+        """
+        pooled = url is None and self.pool is not None
+        circuit_key = circuit_key or endpoint
+        circuit_breaker = self._circuit_breakers[circuit_key] if self.enable_circuit_breaker else None
+        url = url or urljoin(self.base_url, endpoint.lstrip('/'))
+        max_retries = self.max_retries if max_retries is None else max_retries
+        upstream: Optional[Upstream] = None
+
+        for attempt in range(max_retries + 1):
+            if pooled:
+                # Each attempt may go to a different replica, with that replica's circuit breaker
+                upstream = self._select_upstream(avoid=upstream)
+                url = upstream.url_for(endpoint)
+                if self.enable_circuit_breaker:
+                    circuit_breaker = self._circuit_breakers[upstream.base_url]
 
-        for attempt in range(self.max_retries + 1):
             # Check circuit breaker
-            if circuit_breaker and not circuit_breaker.can_attempt():
-                raise Exception(f"Circuit breaker OPEN for {endpoint}. Service unavailable.")
+            elif circuit_breaker and not circuit_breaker.can_attempt():
+                raise CircuitOpenError(f"Circuit breaker OPEN for {circuit_key}. Service unavailable.")
 
             try:
-                result = await request_func()
+                async with self._limited(url, endpoint):
+                    with self.pool.track(upstream) if upstream else nullcontext():
+                        result = await request_func(url)
 
                 # Record success
                 if circuit_breaker:
@@ -327,24 +793,106 @@ class EnhancedAPIClient:
                 return result
 
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                # Record failure
-                if circuit_breaker:
+                # Honor Retry-After: hold back every request to this host/endpoint
+                retry_after = None
+                if isinstance(e, aiohttp.ClientResponseError) and e.status in (429, 503) and e.headers:
+                    retry_after = parse_retry_after(e.headers.get('Retry-After'))
+                if retry_after is not None:
+                    for bucket in self._rate_buckets(url, endpoint):
+                        bucket.pause(retry_after)
+
+                # Record failure (429 is throttling, handled above, not a fault)
+                throttled = isinstance(e, aiohttp.ClientResponseError) and e.status == 429
+                if circuit_breaker and not throttled:
+                    was_open = circuit_breaker.state == CircuitState.OPEN
                     circuit_breaker.record_failure()
+                    if upstream and not was_open and circuit_breaker.state == CircuitState.OPEN:
+                        upstream.ejections += 1
+                        if self.debug:
+                            print(f"[Pool] Ejected {upstream.base_url}")
 
                 # If this was the last attempt, raise
-                if attempt == self.max_retries:
+                if attempt == max_retries:
                     if self.debug:
                         print(f"[Retry] Max retries exceeded for {endpoint}")
                     raise
 
+                # Don't hold the caller longer than the longest backoff
+                if retry_after is not None and retry_after > self.retry_max_delay:
+                    if self.debug:
+                        print(f"[Retry] Retry-After {retry_after:.0f}s exceeds retry_max_delay for {endpoint}")
+                    raise
+
                 # Calculate backoff delay
-                delay = self._calculate_backoff_delay(attempt)
+                delay = max(self._calculate_backoff_delay(attempt), retry_after or 0)
 
                 if self.debug:
-                    print(f"[Retry] Attempt {attempt + 1}/{self.max_retries} failed. Retrying in {delay:.2f}s...")
+                    print(f"[Retry] Attempt {attempt + 1}/{max_retries} failed. Retrying in {delay:.2f}s...")
 
                 await asyncio.sleep(delay)
 
+    async def _hedged(self, request_func: Callable, endpoint: str) -> Any:
+        """
+        Race the request against hedges sent when it is slower than the policy's delay
+
+        Args:
+            request_func: Coroutine function taking the target URL (one attempt)
+            endpoint: API endpoint (rate limits, circuit breaker, latency window)
+
+        Returns:
+            The first successful result; losers are cancelled
+        """
+        policy = self.hedge_policy
+        endpoint_label = '/' + endpoint.lstrip('/')
+        policy.start_request()
+
+        primary = asyncio.ensure_future(self._retry_with_backoff(request_func, endpoint))
+        racers = [primary]
+        errors: List[BaseException] = []
+        hedges = 0
+        try:
+            while racers:
+                timeout = policy.delay(endpoint_label) if hedges < policy.max_hedges else None
+                done, _ = await asyncio.wait(racers, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    hedges += 1
+                    if not policy.try_hedge():
+                        hedges = policy.max_hedges  # Out of budget: just wait
+                        continue
+
+                    # Hedges make one attempt; the primary owns retries. In pool
+                    # mode without alternates, the pool picks the hedge's replica
+                    hedge_url = circuit_key = None
+                    if policy.alternate_base_urls or self.pool is None:
+                        base_url = policy.hedge_base_url(hedges, self.base_url)
+                        hedge_url = urljoin(base_url + '/', endpoint.lstrip('/'))
+                        circuit_key = endpoint if base_url == self.base_url else base_url + endpoint_label
+                    racers.append(asyncio.ensure_future(self._retry_with_backoff(
+                        request_func, endpoint, hedge_url, circuit_key, max_retries=0
+                    )))
+                    self.stats.hedged_requests += 1
+                    if self.debug:
+                        print(f"[Hedge] {hedge_url or endpoint} after {timeout * 1000:.0f}ms")
+                    continue
+
+                for task in done:
+                    racers.remove(task)
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    errors.append(task.exception())
+
+            # Everything failed: report the primary's error if it has one
+            raise primary.exception() if primary.done() and primary.exception() else errors[0]
+        finally:
+            for task in racers:
+                task.cancel()
+            # Callers hedge to get an answer sooner, so don't wait for losers to unwind
+            for task in (primary, *racers):
+                task.add_done_callback(_consume_result)
+
     async def request(
         self,
         method: str,
@@ -375,60 +923,132 @@ class EnhancedAPIClient:
 
         url = urljoin(self.base_url, endpoint.lstrip('/'))
         cache_key = self._generate_cache_key(method, url, params, data)
+        endpoint_label = '/' + endpoint.lstrip('/')
+        lookup_start = time.perf_counter()
 
         # Try cache for GET requests
-        if method.upper() == 'GET' and use_cache:
+        cacheable = method.upper() == 'GET' and use_cache
+        stale: Optional[CacheEntry] = None
+        if cacheable:
             cached_data = await self._get_cached(cache_key)
             if cached_data is not None:
-                self.stats.record_request(0, True, from_cache=True)
+                lookup_ms = (time.perf_counter() - lookup_start) * 1000
+                self.stats.record_request(lookup_ms, True, from_cache=True, endpoint=endpoint_label, method=method)
                 return cached_data
+            stale = self._cache.get_stale(cache_key)
+
+        # Revalidate an expired entry instead of refetching it
+        request_headers = headers
+        if stale is not None and stale.conditional_headers():
+            request_headers = {**(headers or {}), **stale.conditional_headers()}
 
         # Define request function
-        async def make_request():
+        async def make_request(target_url: str) -> _FetchResult:
             start_time = time.time()
 
             try:
                 async with self.session.request(
                     method=method,
-                    url=url,
+                    url=target_url,
                     params=params,
                     json=data,
-                    headers=headers,
+                    headers=request_headers,
                 ) as response:
+                    if response.status == 304 and stale is not None:
+                        latency_ms = (time.time() - start_time) * 1000
+                        self.stats.record_request(latency_ms, True, endpoint=endpoint_label, method=method, status=304)
+                        if self.hedge_policy:
+                            self.hedge_policy.observe(endpoint_label, latency_ms / 1000)
+
+                        if self.debug:
+                            print(f"[Request] {method} {target_url} - 304 Not Modified ({latency_ms:.2f}ms)")
+
+                        return _FetchResult(
+                            data=None,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified'),
+                            not_modified=True,
+                        )
+
                     response.raise_for_status()
+                    body = await response.read()
                     result = await response.json()
 
                     latency_ms = (time.time() - start_time) * 1000
-                    self.stats.record_request(latency_ms, True)
+                    self.stats.record_request(
+                        latency_ms, True, endpoint=endpoint_label, method=method, status=response.status
+                    )
+                    if self.hedge_policy:
+                        self.hedge_policy.observe(endpoint_label, latency_ms / 1000)
 
                     if self.debug:
-                        print(f"[Request] {method} {url} - {response.status} ({latency_ms:.2f}ms)")
+                        print(f"[Request] {method} {target_url} - {response.status} ({latency_ms:.2f}ms)")
 
-                    return result
+                    return _FetchResult(
+                        data=result,
+                        size=len(body),
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                    )
 
             except Exception as e:
                 latency_ms = (time.time() - start_time) * 1000
-                self.stats.record_request(latency_ms, False)
+                self.stats.record_request(
+                    latency_ms, False, endpoint=endpoint_label, method=method, status=_status_label(e)
+                )
 
                 if self.debug:
-                    print(f"[Request ERROR] {method} {url} - {str(e)} ({latency_ms:.2f}ms)")
+                    print(f"[Request ERROR] {method} {target_url} - {str(e)} ({latency_ms:.2f}ms)")
 
                 raise
 
+        # Retry, resolve 304 Not Modified against the stale entry, and cache GET requests
+        async def fetch() -> _FetchResult:
+            if self.hedge_policy and self.hedge_policy.applies_to(method):
+                fetched = await self._hedged(make_request, endpoint)
+            else:
+                fetched = await self._retry_with_backoff(make_request, endpoint)
+
+            if fetched.not_modified:
+                self.stats.revalidated_responses += 1
+                fetched = _FetchResult(
+                    data=stale.data,
+                    size=stale.size,
+                    etag=fetched.etag or stale.etag,
+                    last_modified=fetched.last_modified or stale.last_modified,
+                )
+
+            if cacheable:
+                await self._set_cached(
+                    cache_key, fetched.data, cache_ttl, fetched.size, fetched.etag, fetched.last_modified
+                )
+            return fetched
+
+        # Serve the expired entry now and refresh it in the background
+        if stale is not None and self.stale_while_revalidate:
+            self._refresh_in_background(cache_key, fetch)
+            lookup_ms = (time.perf_counter() - lookup_start) * 1000
+            self.stats.record_request(lookup_ms, True, from_cache=True, endpoint=endpoint_label, method=method)
+            self.stats.stale_responses += 1
+            if self.debug:
+                print(f"[Cache STALE] {cache_key} (revalidating)")
+            return stale.data
+
         # Deduplicate and retry
-        result, was_deduplicated = await self._deduplicate_request(
-            cache_key,
-            lambda: self._retry_with_backoff(make_request, endpoint)
-        )
+        try:
+            fetched, was_deduplicated = await self._deduplicate_request(cache_key, fetch)
+        except (CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if stale is None or not self.stale_if_error:
+                raise
+            self.stats.stale_responses += 1
+            if self.debug:
+                print(f"[Cache STALE] {cache_key} (serving after error: {str(e)})")
+            return stale.data
 
         if was_deduplicated:
             self.stats.deduplicated_requests += 1
 
-        # Cache GET requests
-        if method.upper() == 'GET' and use_cache:
-            await self._set_cached(cache_key, result, cache_ttl)
-
-        return result
+        return fetched.data
 
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """Convenience method for GET requests"""
@@ -446,15 +1066,326 @@ class EnhancedAPIClient:
         """Convenience method for DELETE requests"""
         return await self.request('DELETE', endpoint, **kwargs)
 
+    async def request_many(
+        self,
+        requests: Iterable[Union[BatchRequest, Dict[str, Any]]],
+        concurrency: int = 10,
+        ordered: bool = False,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Run many requests with bounded concurrency, yielding results as they finish
+
+        Each request goes through request(), so caching, deduplication,
+        retries and rate limits all apply. A failed request yields a result
+        with ``error`` set instead of aborting the batch. The input is read
+        lazily, so it can be a generator.
+
+        Args:
+            requests: BatchRequest objects or dicts of request() arguments
+            concurrency: Maximum requests in progress at once
+            ordered: Yield results in input order instead of completion order
+
+        Yields:
+            BatchResult for each request
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        async def run(index: int, spec: Union[BatchRequest, Dict[str, Any]]) -> BatchResult:
+            batch_request = None
+            start_time = time.time()
+            try:
+                # A malformed spec fails its own result, not the batch
+                batch_request = spec if isinstance(spec, BatchRequest) else BatchRequest(**spec)
+                data = await self.request(**batch_request.kwargs())
+                error = None
+            except Exception as e:
+                data, error = None, e
+                if self.debug:
+                    target = f"{batch_request.method} {batch_request.endpoint}" if batch_request else "invalid request"
+                    print(f"[Batch ERROR] #{index} {target} - {str(e)}")
+            return BatchResult(index, batch_request, data, error, (time.time() - start_time) * 1000)
+
+        source = enumerate(requests)
+        pending: Set[asyncio.Future] = set()
+        buffered: Dict[int, BatchResult] = {}  # Finished out of order (ordered mode)
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                # In ordered mode, a slow request at the head must not let the buffer grow without bound
+                while not exhausted and len(pending) < concurrency and len(buffered) < 4 * concurrency:
+                    item = next(source, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(run(*item)))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for result in sorted((task.result() for task in done), key=lambda result: result.index):
+                    if not ordered:
+                        yield result
+                    else:
+                        buffered[result.index] = result
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            # Consumer stopped early (or was cancelled): drop the rest of the batch
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def map(
+        self,
+        method: str,
+        endpoint: str,
+        items: Iterable[Optional[Dict[str, Any]]],
+        concurrency: int = 10,
+        **kwargs,
+    ) -> List[BatchResult]:
+        """
+        Send the same request once per item and collect the results in input order
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base_url)
+            items: Query parameters (GET, HEAD, DELETE) or request bodies
+                   (other methods), one per request
+            concurrency: Maximum requests in progress at once
+            **kwargs: Other request() arguments (headers, use_cache, cache_ttl)
+
+        Returns:
+            One BatchResult per item; check ``ok`` / ``error`` for failures
+        """
+        payload = 'params' if method.upper() in ('GET', 'HEAD', 'DELETE') else 'data'
+        requests = (
+            BatchRequest(method=method, endpoint=endpoint, **{payload: item}, **kwargs)
+            for item in items
+        )
+        return [result async for result in self.request_many(requests, concurrency, ordered=True)]
+
+    async def _open_stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        chunk_size: int,
+        timeout: Optional[float],
+    ) -> Tuple['aiohttp.ClientResponse', bytes]:
+        """Send a streaming request and read its first chunk, retrying until the first byte arrives"""
+        read_timeout = timeout or self.timeout
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=read_timeout, sock_read=read_timeout)
+
+        async def attempt(url: str):
+            start_time = time.time()
+            response = None
+
+            try:
+                response = await self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    timeout=client_timeout,
+                )
+                response.raise_for_status()
+                first_chunk = await response.content.read(chunk_size)
+                return response, first_chunk
+
+            except BaseException as e:
+                if response is not None:
+                    response.release()
+                if isinstance(e, Exception):
+                    latency_ms = (time.time() - start_time) * 1000
+                    self.stats.record_request(
+                        latency_ms, False, endpoint='/' + endpoint.lstrip('/'), method=method, status=_status_label(e)
+                    )
+
+                    if self.debug:
+                        print(f"[Stream ERROR] {method} {url} - {str(e)} ({latency_ms:.2f}ms)")
+                raise
+
+        return await self._retry_with_backoff(attempt, endpoint)
+
+    async def _iter_stream(
+        self,
+        response: 'aiohttp.ClientResponse',
+        first_chunk: bytes,
+        chunk_size: int,
+        endpoint: str,
+        start_time: float,
+    ) -> AsyncIterator[bytes]:
+        """Yield the body of an opened stream, recording stats when it ends"""
+        success = True
+        status: Union[int, str] = response.status
+
+        # An open stream keeps its replica busy (e.g. a long generation)
+        upstream = self.pool.find(str(response.url)) if self.pool else None
+        if upstream:
+            upstream.outstanding += 1
+        try:
+            chunk = first_chunk
+            while chunk:
+                self.stats.streamed_bytes += len(chunk)
+                yield chunk
+                chunk = await response.content.read(chunk_size)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Bytes were already delivered, so the request cannot be retried
+            success = False
+            status = _status_label(e)
+            if self.enable_circuit_breaker:
+                self._circuit_breakers[upstream.base_url if upstream else endpoint].record_failure()
+            if self.debug:
+                print(f"[Stream ERROR] {response.method} {response.url} - {str(e)} (after first byte)")
+            raise
+
+        finally:
+            if upstream:
+                upstream.outstanding -= 1
+            response.release()
+            latency_ms = (time.time() - start_time) * 1000
+            self.stats.record_request(
+                latency_ms, success, endpoint='/' + endpoint.lstrip('/'), method=response.method, status=status
+            )
+            self.stats.streamed_requests += 1
+
+            if self.debug:
+                print(f"[Stream] {response.method} {response.url} - {response.status} ({latency_ms:.2f}ms)")
+
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = 64 * 1024,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a response body as raw byte chunks
+
+        Retries (with backoff and circuit breaker) apply only until the first
+        byte arrives; an error after that is raised to the caller. Responses
+        are never cached or deduplicated.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base_url)
+            params: Query parameters
+            data: Request body data
+            headers: Additional headers for this request
+            chunk_size: Maximum bytes per yielded chunk
+            timeout: Maximum seconds to wait for each chunk (default: client
+                     timeout); the stream as a whole has no time limit
+
+        Yields:
+            Body chunks as they arrive
+        """
+        if not self.session:
+            await self.start()
+
+        start_time = time.time()
+        response, first_chunk = await self._open_stream(
+            method, endpoint, params, data, headers, chunk_size, timeout
+        )
+
+        body = self._iter_stream(response, first_chunk, chunk_size, endpoint, start_time)
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            await body.aclose()
+
+    async def stream_lines(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        event_format: str = 'auto',
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a response as lines, NDJSON objects or Server-Sent Events
+
+        Same retry and stats behavior as stream().
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base_url)
+            params: Query parameters
+            data: Request body data
+            headers: Additional headers for this request
+            event_format: 'lines' (str per line), 'ndjson' (decoded JSON per
+                          non-empty line), 'sse' (SSEEvent per event), or
+                          'auto' to choose from the Content-Type header
+            timeout: Maximum seconds to wait for each chunk (default: client timeout)
+
+        Yields:
+            One item per line, JSON object or event
+        """
+        if event_format not in STREAM_FORMATS:
+            raise ValueError(f"event_format must be one of {STREAM_FORMATS}, got {event_format!r}")
+
+        if not self.session:
+            await self.start()
+
+        start_time = time.time()
+        chunk_size = 64 * 1024
+        response, first_chunk = await self._open_stream(
+            method, endpoint, params, data, headers, chunk_size, timeout
+        )
+        if event_format == 'auto':
+            event_format = detect_format(response.headers.get('Content-Type', ''))
+
+        splitter = LineSplitter()
+        sse = SSEDecoder() if event_format == 'sse' else None
+
+        def decode(lines: List[str]) -> List[Any]:
+            if sse is not None:
+                return [event for event in map(sse.feed, lines) if event is not None]
+            if event_format == 'ndjson':
+                return [json.loads(line) for line in lines if line.strip()]
+            return lines
+
+        body = self._iter_stream(response, first_chunk, chunk_size, endpoint, start_time)
+        try:
+            async for chunk in body:
+                for item in decode(splitter.feed(chunk)):
+                    yield item
+
+            for item in decode(splitter.flush()):
+                yield item
+            if sse is not None:
+                event = sse.flush()
+                if event is not None:
+                    yield event
+        finally:
+            await body.aclose()
+
     async def clear_cache(self):
-        """Clear all cached responses"""
-        async with self._cache_lock:
-            self._cache.clear()
+        """Clear all cached responses (including the disk tier)"""
+        self._cache.clear()
+        if self._disk_cache is not None:
+            await asyncio.to_thread(self._disk_cache.clear)
         if self.debug:
             print("[Cache] Cleared all cache entries")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get request statistics"""
+        disk_stats = self._disk_cache.get_stats() if self._disk_cache is not None else {}
+        limiter_stats = self.concurrency_limiter.get_stats() if self.concurrency_limiter is not None else {}
+        buckets = [*self._host_buckets.values(), *self._endpoint_buckets.values()]
         return {
             'total_requests': self.stats.total_requests,
             'successful_requests': self.stats.successful_requests,
@@ -462,11 +1393,65 @@ class EnhancedAPIClient:
             'success_rate': self.stats.get_success_rate(),
             'cached_responses': self.stats.cached_responses,
             'deduplicated_requests': self.stats.deduplicated_requests,
+            'stale_responses': self.stats.stale_responses,
+            'revalidated_responses': self.stats.revalidated_responses,
+            'hedged_requests': self.stats.hedged_requests,
+            'hedge_wins': self.stats.hedge_wins,
+            'streamed_requests': self.stats.streamed_requests,
+            'streamed_bytes': self.stats.streamed_bytes,
             'average_latency_ms': self.stats.get_average_latency(),
-            'cache_size': len(self._cache),
+            'latency_ms': self.stats.overall.latency.snapshot(),
+            'cache_latency_ms': self.stats.overall.cache_latency.snapshot(),
             'in_flight_requests': len(self._in_flight_requests),
+            **self._cache.get_stats(),
+            **disk_stats,
+            'rate_limit_waits': sum(bucket.waits for bucket in buckets),
+            'rate_limit_wait_ms': sum(bucket.wait_seconds for bucket in buckets) * 1000,
+            **limiter_stats,
+            'endpoints': {name: stats.snapshot() for name, stats in self.stats.endpoints.items()},
+            'methods': {name: stats.snapshot() for name, stats in self.stats.methods.items()},
+            'statuses': dict(self.stats.statuses),
+            **({'upstreams': self._upstream_stats()} if self.pool else {}),
+        }
+
+    def _upstream_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-replica counters and circuit state in pool mode"""
+        return {
+            upstream.base_url: {
+                **upstream.snapshot(),
+                'circuit_state': self._circuit_breakers[upstream.base_url].state.value,
+            }
+            for upstream in self.pool.upstreams
         }
 
+    def to_prometheus(self, prefix: str = "browseros_api") -> str:
+        """
+        Render statistics in the Prometheus text exposition format
+
+        Includes latency histograms per endpoint and method, status counts,
+        and every numeric value from get_stats(): running totals as counters
+        (``<name>_total``), everything else as gauges.
+        """
+        lines = self.stats.prometheus_lines(prefix)
+        for name, value in self.get_stats().items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if name in _COUNTER_STATS:
+                full_name, kind, help_text = f"{prefix}_{name}_total", "counter", _COUNTER_STATS[name]
+            else:
+                full_name, kind, help_text = f"{prefix}_{name}", "gauge", f"{name.replace('_', ' ').capitalize()}."
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            lines.append(f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "browseros_api"):
+        """Atomically write to_prometheus() output, e.g. for the node_exporter textfile collector"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(temp_path, path)
+
     def get_circuit_breaker_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all circuit breakers"""
         return {
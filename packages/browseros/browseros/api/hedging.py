@@ -0,0 +1,139 @@
+"""
+Hedged requests for EnhancedAPIClient
+
+Cuts tail latency against replicated or flaky backends: when a request has
+not answered within a high percentile of recent latency, a duplicate is
+sent (optionally to an alternate base URL), the first response wins and
+the other is cancelled.
+
+- HedgePolicy: which methods may be hedged, when to send the hedge, where
+  to send it, and a budget capping hedges to a fraction of traffic so a
+  slow backend is not hit with twice the load
+
+Used from a single event loop; takes no locks.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+# Key for endpoints beyond HedgePolicy.max_endpoints
+_OTHER_ENDPOINTS = 'other'
+
+
+class HedgePolicy:
+    """
+    When and where EnhancedAPIClient sends hedged (duplicate) requests.
+
+    The hedge delay is the ``percentile`` of the last ``window`` successful
+    latencies of the same endpoint, clamped to [min_delay, max_delay];
+    ``initial_delay`` is used until ``min_samples`` have been seen.
+
+    Every hedgeable request adds ``budget_ratio`` tokens to the budget (up
+    to ``budget_burst``) and every hedge spends one, so at most about
+    ``budget_ratio`` of requests are hedged over time.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: float = 5.0,
+        max_hedges: int = 1,
+        alternate_base_urls: Optional[Iterable[str]] = None,
+        methods: Iterable[str] = ('GET', 'HEAD', 'OPTIONS'),
+        budget_ratio: float = 0.1,
+        budget_burst: float = 10.0,
+        window: int = 200,
+        min_samples: int = 20,
+        max_endpoints: int = 200,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            percentile: Recent-latency percentile after which to hedge (0-100)
+            initial_delay: Hedge delay until min_samples latencies are known
+            min_delay: Lower bound on the hedge delay (seconds)
+            max_delay: Upper bound on the hedge delay (seconds)
+            max_hedges: Duplicates sent per request at most
+            alternate_base_urls: Replicas to send hedges to, in turn
+                                 (default: the client's base_url)
+            methods: Methods safe to send twice (idempotent)
+            budget_ratio: Long-run fraction of requests that may be hedged
+            budget_burst: Hedges that may be sent back to back
+            window: Latencies remembered per endpoint
+            min_samples: Latencies needed before the percentile is used
+            max_endpoints: Endpoints tracked separately; the rest share one window
+        """
+        if not 0 < percentile < 100:
+            raise ValueError(f"percentile must be between 0 and 100, got {percentile}")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_hedges = max_hedges
+        self.alternate_base_urls: List[str] = [url.rstrip('/') for url in alternate_base_urls or ()]
+        self.methods = frozenset(method.upper() for method in methods)
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.window = window
+        self.min_samples = min_samples
+        self.max_endpoints = max_endpoints
+
+        self.budget = budget_burst
+        self.throttled = 0  # Hedges skipped for lack of budget
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._delays: Dict[str, float] = {}
+
+    def applies_to(self, method: str) -> bool:
+        """Whether requests with this method may be hedged"""
+        return method.upper() in self.methods
+
+    def _key(self, endpoint: str) -> str:
+        if endpoint in self._latencies or len(self._latencies) < self.max_endpoints:
+            return endpoint
+        return _OTHER_ENDPOINTS
+
+    def observe(self, endpoint: str, latency: float):
+        """Record the latency (seconds) of a successful attempt"""
+        key = self._key(endpoint)
+        if key not in self._latencies:
+            self._latencies[key] = deque(maxlen=self.window)
+        latencies = self._latencies[key]
+        latencies.append(latency)
+        self._delays.pop(key, None)  # Recomputed on next use
+
+    def delay(self, endpoint: str) -> float:
+        """Seconds to wait for a response before hedging"""
+        key = self._key(endpoint)
+        if key in self._delays:
+            return self._delays[key]
+
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial_delay
+
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        delay = min(self.max_delay, max(self.min_delay, ordered[index]))
+        self._delays[key] = delay
+        return delay
+
+    def start_request(self):
+        """Credit the budget for a hedgeable request"""
+        self.budget = min(self.budget_burst, self.budget + self.budget_ratio)
+
+    def try_hedge(self) -> bool:
+        """Spend budget on one hedge; False if the budget is exhausted"""
+        if self.budget < 1:
+            self.throttled += 1
+            return False
+        self.budget -= 1
+        return True
+
+    def hedge_base_url(self, hedge_number: int, base_url: str) -> str:
+        """Base URL for the n-th hedge (1-based) of a request"""
+        if not self.alternate_base_urls:
+            return base_url
+        return self.alternate_base_urls[(hedge_number - 1) % len(self.alternate_base_urls)]
@@ -7,13 +7,29 @@ Automatically discovers available models from local backends:
 - Other OpenAI-compatible backends
 
 This eliminates manual model ID entry and keeps the model list up-to-date.
+
+Backends that are not running are detected with a short TCP connect probe
+and then skipped with exponential backoff, so they cost nothing on most calls.
+
+Optional enrichment adds per-model details (context length, quantization,
+parameter count, vision/tool support) from Ollama's /api/show and LM
+Studio's /api/v0/models, cached by model digest.
+
+Optional micro-benchmarks measure time to first token, generation speed and
+cold load time per model, so the fastest local model can be picked
+automatically.
 """
 
 import asyncio
+import ipaddress
 import json
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
+from urllib.parse import urlparse
 
 try:
     import aiohttp
@@ -32,6 +48,38 @@ class BackendType(Enum):
     TEXT_GENERATION_WEBUI = "text_generation_webui"
 
 
+# Fixed prompt for ModelDiscovery.benchmark(), so results are comparable
+BENCHMARK_PROMPT = "Count from one to fifty in words, separated by commas."
+
+# One-token warm-up request; unlike BENCHMARK_PROMPT, so it can't prime a prompt cache for the timed run
+BENCHMARK_WARMUP_PROMPT = "Reply with OK."
+
+# Metrics accepted by ModelDiscovery.fastest_model()
+BENCHMARK_METRICS = ("ttft", "throughput")
+
+
+def _nonce_prompt(prompt: str) -> str:
+    """Prefix a random nonce, so no benchmark run is answered from a server's prompt cache"""
+    return f"[{secrets.token_hex(4)}] {prompt}"
+
+
+@dataclass
+class ModelBenchmark:
+    """Micro-benchmark result for one model"""
+    timestamp: float  # When the run finished (time.time())
+    ttft_ms: Optional[float] = None  # Time to first token, model already loaded
+    tokens_per_second: Optional[float] = None  # Generation speed after the first token
+    output_tokens: int = 0
+    load_ms: Optional[float] = None  # Load time by the warm-up (about 0 if already loaded; estimated for non-Ollama backends)
+    cold: Optional[bool] = None  # Whether the model had to be loaded; None = unknown
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the run finished"""
+        return time.time() - self.timestamp
+
+
 @dataclass
 class ModelInfo:
     """Information about a discovered model"""
@@ -43,6 +91,12 @@ class ModelInfo:
     parameter_count: Optional[str] = None  # e.g., "7B", "13B"
     context_length: Optional[int] = None
     modified_at: Optional[str] = None
+    digest: Optional[str] = None  # Content hash (Ollama)
+    capabilities: Optional[List[str]] = None  # e.g. ["completion", "vision", "tools"]; None = unknown
+    supports_vision: Optional[bool] = None
+    supports_tools: Optional[bool] = None
+    # Latest cached benchmark; not part of equality, so new results don't count as model changes
+    benchmark: Optional[ModelBenchmark] = field(default=None, compare=False)
 
 
 @dataclass
@@ -57,6 +111,140 @@ class BackendInfo:
     error: Optional[str] = None
 
 
+async def probe_tcp(host: str, port: int, timeout: float) -> Optional[str]:
+    """
+    Check that a host accepts TCP connections on a port
+
+    Returns:
+        None if it does, otherwise the error
+    """
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except asyncio.TimeoutError:
+        return f"No response within {timeout}s"
+    except OSError as e:
+        return e.strerror or str(e)
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return None
+
+
+def normalize_backend_url(url: str) -> str:
+    """
+    Comparable form of a backend URL
+
+    Loopback hosts (localhost, 127.0.0.0/8, ::1) become "localhost", default
+    ports are made explicit and trailing slashes are dropped, so
+    "http://127.0.0.1:11434/" and "http://localhost:11434" compare equal.
+    """
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or "http").lower()
+    host = (parsed.hostname or "").lower()
+    if host != "localhost":
+        try:
+            if ipaddress.ip_address(host).is_loopback:
+                host = "localhost"
+        except ValueError:
+            pass
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    port = port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{host}:{port}{parsed.path.rstrip('/')}"
+
+
+def _format_parameter_count(count: Optional[int]) -> Optional[str]:
+    """Format a raw parameter count, e.g. 8030261248 -> "8.0B"."""
+    if not count:
+        return None
+    if count >= 1e9:
+        return f"{count / 1e9:.1f}B"
+    return f"{count / 1e6:.0f}M"
+
+
+def parse_ollama_show(data: Dict) -> Dict[str, Any]:
+    """
+    Extract model details from an Ollama /api/show response
+
+    Returns:
+        Dict with context_length, quantization, family, parameter_count, capabilities
+    """
+    details = data.get("details") or {}
+    model_info = data.get("model_info") or {}
+    context_length = next(
+        (value for key, value in model_info.items() if key.endswith(".context_length")), None
+    )
+
+    capabilities = data.get("capabilities")
+    if capabilities is None:
+        # Older Ollama versions don't report capabilities: infer them
+        capabilities = ["completion"]
+        if data.get("projector_info") or "clip" in (details.get("families") or []):
+            capabilities.append("vision")
+        if ".Tools" in (data.get("template") or ""):
+            capabilities.append("tools")
+
+    return {
+        "context_length": context_length,
+        "quantization": details.get("quantization_level"),
+        "family": details.get("family"),
+        "parameter_count": details.get("parameter_size")
+        or _format_parameter_count(model_info.get("general.parameter_count")),
+        "capabilities": list(capabilities),
+    }
+
+
+def parse_lm_studio_model(data: Dict) -> Dict[str, Any]:
+    """
+    Extract model details from an LM Studio /api/v0/models entry
+
+    Returns:
+        Dict with context_length, quantization, family, capabilities
+    """
+    model_type = data.get("type")
+    capabilities = ["embedding"] if model_type == "embeddings" else ["completion"]
+    if model_type == "vlm":
+        capabilities.append("vision")
+    if "tool_use" in (data.get("capabilities") or []):
+        capabilities.append("tools")
+
+    return {
+        "context_length": data.get("max_context_length"),
+        "quantization": data.get("quantization"),
+        "family": data.get("arch"),
+        "capabilities": capabilities,
+    }
+
+
+def apply_model_details(model: ModelInfo, details: Dict[str, Any]):
+    """Fill a ModelInfo from parsed details, keeping values the listing already had"""
+    for name in ("context_length", "quantization", "family", "parameter_count"):
+        if details.get(name) is not None:
+            setattr(model, name, details[name])
+    capabilities = details.get("capabilities")
+    if capabilities is not None:
+        model.capabilities = list(capabilities)
+        model.supports_vision = "vision" in capabilities
+        model.supports_tools = "tools" in capabilities
+
+
+@dataclass
+class BackendHealth:
+    """Reachability of one backend URL, for negative caching"""
+    failures: int = 0  # Consecutive failed probes
+    retry_at: float = 0.0  # Skip the backend until then (time.monotonic())
+    last_error: Optional[str] = None
+
+    @property
+    def in_backoff(self) -> bool:
+        return time.monotonic() < self.retry_at
+
+
 class ModelDiscovery:
     """
     Discovers models from local backends automatically
@@ -70,19 +258,67 @@ class ModelDiscovery:
         {"type": BackendType.TEXT_GENERATION_WEBUI, "url": "http://localhost:5000/v1", "name": "Text Generation WebUI"},
     ]
 
-    def __init__(self, timeout: float = 2.0):
+    def __init__(
+        self,
+        timeout: float = 2.0,
+        probe_timeout: float = 0.25,
+        backoff_base: float = 5.0,
+        backoff_max: float = 300.0,
+        enrich_concurrency: int = 4,
+        details_cache_size: int = 1024,
+        benchmark_max_tokens: int = 64,
+        benchmark_timeout: float = 120.0,
+        debug: bool = False,
+    ):
         """
         Initialize model discovery
 
         Args:
             timeout: Connection timeout in seconds
+            probe_timeout: TCP connect timeout for the reachability pre-probe
+            backoff_base: Seconds an unreachable backend is skipped after its
+                          first failure (doubled per further failure)
+            backoff_max: Maximum seconds an unreachable backend is skipped
+            enrich_concurrency: Maximum per-model detail requests at once
+            details_cache_size: Model details kept in memory (by digest)
+            benchmark_max_tokens: Tokens generated per benchmark run
+            benchmark_timeout: Seconds allowed per benchmark request (cold
+                               loads of large models can take a while)
+            debug: Print backend status and detail errors on every pass
+                   (default: only when they change)
         """
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required. Install with: pip install aiohttp")
 
         self.timeout = timeout
+        self.probe_timeout = probe_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
         self.session: Optional[aiohttp.ClientSession] = None
 
+        # Negative cache: backend URL -> reachability
+        self._health: Dict[str, BackendHealth] = {}
+
+        # Backends found by BackendScanner (or added by hand), checked with the defaults
+        self.registered_backends: List[Dict] = []
+
+        # Enrichment: model details by digest (or backend URL + model ID + modified time), LRU
+        self.enrich_concurrency = enrich_concurrency
+        self.details_cache_size = details_cache_size
+        self._details_cache: OrderedDict = OrderedDict()
+        self.details_cache_hits = 0
+        self.details_fetches = 0
+        self.details_errors = 0
+
+        # Benchmarks by backend URL + model ID + digest
+        self.benchmark_max_tokens = benchmark_max_tokens
+        self.benchmark_timeout = benchmark_timeout
+        self._benchmarks: Dict[str, ModelBenchmark] = {}
+
+        # Last printed state per backend (and per model for details), so repeated passes stay quiet
+        self.debug = debug
+        self._log_states: Dict[str, Any] = {}
+
     async def __aenter__(self):
         """Async context manager entry"""
         await self.start()
@@ -134,8 +370,11 @@ class ModelDiscovery:
                             parameter_count=model.get("details", {}).get("parameter_size"),
                             context_length=model.get("details", {}).get("context_length"),
                             modified_at=model.get("modified_at"),
+                            digest=model.get("digest"),
                         ))
 
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            raise  # Unreachable: check_backend() backs off
         except Exception as e:
             print(f"[Model Discovery] Ollama error: {e}")
 
@@ -176,11 +415,428 @@ class ModelDiscovery:
                             context_length=context_length,
                         ))
 
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            raise  # Unreachable: check_backend() backs off
         except Exception as e:
             print(f"[Model Discovery] OpenAI-compatible error: {e}")
 
         return models
 
+    def _log_state(self, key: str, state: Any, message: str):
+        """Print message if state differs from the last one logged under key (always in debug mode)"""
+        if self.debug or key not in self._log_states or self._log_states[key] != state:
+            print(message)
+        self._log_states[key] = state
+
+    def _cached_details(self, key: str) -> Optional[Dict[str, Any]]:
+        details = self._details_cache.get(key)
+        if details is not None:
+            self._details_cache.move_to_end(key)
+            self.details_cache_hits += 1
+        return details
+
+    def _cache_details(self, key: str, details: Dict[str, Any]):
+        self._details_cache[key] = details
+        self._details_cache.move_to_end(key)
+        while len(self._details_cache) > self.details_cache_size:
+            self._details_cache.popitem(last=False)
+
+    async def enrich_ollama(self, backend: BackendInfo, semaphore: asyncio.Semaphore):
+        """
+        Add /api/show details to an Ollama backend's models (one request per uncached model)
+
+        Args:
+            backend: Ollama backend with models listed
+            semaphore: Bounds concurrent detail requests across backends
+        """
+
+        async def enrich_model(model: ModelInfo):
+            key = model.digest or f"{backend.url}|{model.model_id}|{model.modified_at}"
+            details = self._cached_details(key)
+            if details is None:
+                try:
+                    async with semaphore:
+                        self.details_fetches += 1
+                        async with self.session.post(f"{backend.url}/api/show", json={"model": model.model_id}) as response:
+                            response.raise_for_status()
+                            details = parse_ollama_show(await response.json())
+                except Exception as e:
+                    self.details_errors += 1
+                    self._log_state(f"{backend.url}|{model.model_id}|details", str(e),
+                                    f"[Model Discovery] {backend.name}: no details for {model.model_id}: {e}")
+                    return
+                self._log_states.pop(f"{backend.url}|{model.model_id}|details", None)
+                self._cache_details(key, details)
+            apply_model_details(model, details)
+
+        await asyncio.gather(*(enrich_model(model) for model in backend.models))
+
+    async def enrich_lm_studio(self, backend: BackendInfo, semaphore: asyncio.Semaphore):
+        """
+        Add /api/v0/models details to an LM Studio backend's models (one request per backend)
+
+        Args:
+            backend: LM Studio backend with models listed
+            semaphore: Bounds concurrent detail requests across backends
+        """
+        base_url = backend.url[:-len("/v1")] if backend.url.endswith("/v1") else backend.url
+        try:
+            async with semaphore:
+                self.details_fetches += 1
+                async with self.session.get(f"{base_url}/api/v0/models") as response:
+                    response.raise_for_status()
+                    data = await response.json()
+        except Exception as e:
+            self.details_errors += 1
+            self._log_state(f"{backend.url}|details", str(e), f"[Model Discovery] {backend.name}: no model details: {e}")
+            return
+        self._log_states.pop(f"{backend.url}|details", None)
+
+        details_by_id = {entry.get("id"): parse_lm_studio_model(entry) for entry in data.get("data", [])}
+        for model in backend.models:
+            if model.model_id in details_by_id:
+                apply_model_details(model, details_by_id[model.model_id])
+
+    async def enrich(self, backends: List[BackendInfo]):
+        """
+        Add per-model details to discovered models, in place
+
+        Ollama details are fetched per model and cached by digest, so only
+        new or changed models cost a request. At most enrich_concurrency
+        requests run at once.
+
+        Args:
+            backends: Results of discover_all()
+        """
+        if not self.session:
+            await self.start()
+
+        semaphore = asyncio.Semaphore(self.enrich_concurrency)
+        tasks = []
+        for backend in backends:
+            if not backend.is_available:
+                continue
+            if backend.type == BackendType.OLLAMA:
+                tasks.append(self.enrich_ollama(backend, semaphore))
+            elif backend.type == BackendType.LM_STUDIO:
+                tasks.append(self.enrich_lm_studio(backend, semaphore))
+        await asyncio.gather(*tasks)
+
+    @staticmethod
+    def _benchmark_key(backend: BackendInfo, model: ModelInfo) -> str:
+        return f"{backend.url.rstrip('/')}|{model.model_id}|{model.digest or ''}"
+
+    def _attach_benchmarks(self, backends: List[BackendInfo]):
+        """Set model.benchmark from the cache for freshly discovered models"""
+        if not self._benchmarks:
+            return
+        for backend in backends:
+            for model in backend.models:
+                model.benchmark = self._benchmarks.get(self._benchmark_key(backend, model))
+
+    async def benchmark(
+        self,
+        backends: List[BackendInfo],
+        max_age: float = 3600.0,
+        model_ids: Optional[List[str]] = None,
+    ):
+        """
+        Benchmark discovered models, in place (sets model.benchmark)
+
+        Models run one at a time, so runs don't compete for the same GPU.
+        Results (including failures) are cached with their timestamp and
+        reused until they are max_age seconds old; discover_all() attaches
+        cached results to the models it returns. Models known to be
+        embedding-only are skipped.
+
+        Args:
+            backends: Results of discover_all()
+            max_age: Seconds a cached result stays valid (0 = always rerun)
+            model_ids: Only benchmark these models (default: all)
+        """
+        if not self.session:
+            await self.start()
+
+        for backend in backends:
+            if not backend.is_available:
+                continue
+            for model in backend.models:
+                if model_ids is not None and model.model_id not in model_ids:
+                    continue
+                if model.capabilities is not None and "completion" not in model.capabilities:
+                    continue
+                key = self._benchmark_key(backend, model)
+                cached = self._benchmarks.get(key)
+                if cached is None or cached.age >= max_age:
+                    cached = await self.benchmark_model(backend, model)
+                    self._benchmarks[key] = cached
+                model.benchmark = cached
+
+    async def benchmark_model(self, backend: BackendInfo, model: ModelInfo) -> ModelBenchmark:
+        """
+        Run the micro-benchmark for one model (uncached)
+
+        Every model gets the same sequence: a one-token warm-up request
+        (BENCHMARK_WARMUP_PROMPT), which loads a cold model and gives the
+        load time, then a timed run of BENCHMARK_PROMPT for time to first
+        token and tokens/sec. Each prompt carries a fresh nonce, so no run is
+        answered from a prompt cache.
+
+        Args:
+            backend: Backend serving the model
+            model: Model to benchmark
+
+        Returns:
+            The result; on failure, a ModelBenchmark with error set
+        """
+        if not self.session:
+            await self.start()
+
+        try:
+            if backend.type == BackendType.OLLAMA:
+                result = await self._benchmark_ollama(backend.url, model.model_id)
+            else:
+                result = await self._benchmark_openai_compatible(backend.url, model.model_id)
+        except Exception as e:
+            result = ModelBenchmark(timestamp=time.time(), error=str(e) or type(e).__name__)
+            print(f"[Model Discovery] {backend.name}: benchmark of {model.model_id} failed: {result.error}")
+        return result
+
+    async def _benchmark_ollama(self, url: str, model_id: str) -> ModelBenchmark:
+        # /api/ps lists the models currently in memory
+        cold = None
+        try:
+            async with self.session.get(f"{url}/api/ps") as response:
+                if response.status == 200:
+                    loaded = (await response.json()).get("models", [])
+                    cold = model_id not in {entry.get("name") for entry in loaded}
+        except Exception:
+            pass
+
+        # Warm up even if loaded, so every model is measured the same way
+        _, _, final = await self._ollama_generate(url, model_id, BENCHMARK_WARMUP_PROMPT, 1)
+        load_ms = final.get("load_duration", 0) / 1e6
+
+        ttft, _, final = await self._ollama_generate(url, model_id, BENCHMARK_PROMPT, self.benchmark_max_tokens)
+        eval_count = final.get("eval_count", 0)
+        eval_duration = final.get("eval_duration", 0)  # Nanoseconds
+        return ModelBenchmark(
+            timestamp=time.time(),
+            ttft_ms=ttft * 1000 if ttft is not None else None,
+            tokens_per_second=eval_count / (eval_duration / 1e9) if eval_duration else None,
+            output_tokens=eval_count,
+            load_ms=load_ms,
+            cold=cold,
+        )
+
+    async def _ollama_generate(
+        self, url: str, model_id: str, prompt: str, max_tokens: int
+    ) -> Tuple[Optional[float], float, Dict]:
+        """Stream one /api/generate run of prompt (nonced); returns (seconds to first token, total seconds, final chunk)"""
+        payload = {
+            "model": model_id,
+            "prompt": _nonce_prompt(prompt),
+            "stream": True,
+            "options": {"num_predict": max_tokens, "temperature": 0},
+        }
+        start_time = time.perf_counter()
+        first_token = None
+        final: Dict = {}
+        async with self.session.post(
+            f"{url}/api/generate",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=self.benchmark_timeout),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if first_token is None and chunk.get("response"):
+                    first_token = time.perf_counter() - start_time
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("done"):
+                    final = chunk
+        return first_token, time.perf_counter() - start_time, final
+
+    async def _benchmark_openai_compatible(self, url: str, model_id: str) -> ModelBenchmark:
+        # No portable way to ask whether a model is loaded: the warm-up run
+        # loads it if needed, and its extra time over the same request
+        # repeated warm (after the timed run) estimates the load time
+        _, warmup_time, _, _ = await self._openai_generate(url, model_id, BENCHMARK_WARMUP_PROMPT, 1)
+        ttft, total_time, tokens, last_token = await self._openai_generate(
+            url, model_id, BENCHMARK_PROMPT, self.benchmark_max_tokens
+        )
+        _, baseline_time, _, _ = await self._openai_generate(url, model_id, BENCHMARK_WARMUP_PROMPT, 1)
+
+        tokens_per_second = None
+        if ttft is not None and tokens > 1 and last_token > ttft:
+            tokens_per_second = (tokens - 1) / (last_token - ttft)
+        return ModelBenchmark(
+            timestamp=time.time(),
+            ttft_ms=ttft * 1000 if ttft is not None else None,
+            tokens_per_second=tokens_per_second,
+            output_tokens=tokens,
+            load_ms=max(0.0, warmup_time - baseline_time) * 1000,
+        )
+
+    async def _openai_generate(
+        self, url: str, model_id: str, prompt: str, max_tokens: int
+    ) -> Tuple[Optional[float], float, int, float]:
+        """
+        Stream one chat completion of prompt (nonced)
+
+        Returns:
+            (seconds to first token, total seconds, output tokens, seconds to last token)
+        """
+        payload = {
+            "model": model_id,
+            "messages": [{"role": "user", "content": _nonce_prompt(prompt)}],
+            "max_tokens": max_tokens,
+            "temperature": 0,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        start_time = time.perf_counter()
+        first_token = None
+        last_token = 0.0
+        content_chunks = 0
+        usage_tokens = None
+        async with self.session.post(
+            f"{url}/chat/completions",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=self.benchmark_timeout),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    usage_tokens = chunk["usage"].get("completion_tokens")
+                for choice in chunk.get("choices") or []:
+                    if (choice.get("delta") or {}).get("content"):
+                        last_token = time.perf_counter() - start_time
+                        if first_token is None:
+                            first_token = last_token
+                        content_chunks += 1
+        # Servers that don't report usage stream about one token per chunk
+        tokens = usage_tokens if usage_tokens is not None else content_chunks
+        return first_token, time.perf_counter() - start_time, tokens, last_token
+
+    def fastest_model(
+        self,
+        backends: List[BackendInfo],
+        metric: str = "ttft",
+        capability: Optional[str] = None,
+    ) -> Optional[Tuple[BackendInfo, ModelInfo]]:
+        """
+        Pick the fastest benchmarked model
+
+        Args:
+            backends: Results of discover_all() after benchmark()
+            metric: "ttft" (lowest time to first token, for short interactive
+                    actions) or "throughput" (highest tokens/sec, for long outputs)
+            capability: Only consider models with this capability (e.g. "tools")
+
+        Returns:
+            (backend, model), or None if no model has a successful benchmark
+        """
+        if metric not in BENCHMARK_METRICS:
+            raise ValueError(f"metric must be one of {BENCHMARK_METRICS}, got {metric!r}")
+
+        candidates = []
+        for backend in backends:
+            if not backend.is_available:
+                continue
+            for model in backend.models:
+                result = model.benchmark
+                if result is None or result.error:
+                    continue
+                if capability and capability not in (model.capabilities or []):
+                    continue
+                if metric == "ttft" and result.ttft_ms is not None:
+                    candidates.append((result.ttft_ms, backend, model))
+                elif metric == "throughput" and result.tokens_per_second is not None:
+                    candidates.append((-result.tokens_per_second, backend, model))
+
+        if not candidates:
+            return None
+        _, backend, model = min(candidates, key=lambda candidate: candidate[0])
+        return backend, model
+
+    async def probe_backend(self, url: str) -> Optional[str]:
+        """
+        Check that a backend accepts TCP connections, without waiting for HTTP
+
+        Args:
+            url: Backend base URL
+
+        Returns:
+            None if reachable, otherwise the error
+        """
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return await probe_tcp(parsed.hostname, port, min(self.probe_timeout, self.timeout))
+
+    def _record_unreachable(self, url: str, error: str) -> BackendHealth:
+        """Count a failed probe and back off exponentially"""
+        health = self._health.setdefault(url, BackendHealth())
+        health.failures += 1
+        health.last_error = error
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (health.failures - 1))
+        health.retry_at = time.monotonic() + backoff
+        return health
+
+    def reset_backoff(self, url: Optional[str] = None):
+        """
+        Forget unreachable backends so the next discovery probes them again
+
+        Args:
+            url: Backend URL to reset (default: all)
+        """
+        if url is None:
+            self._health.clear()
+        else:
+            self._health.pop(url, None)
+
+    def get_backend_health(self) -> Dict[str, Dict[str, Any]]:
+        """Unreachable backends with their failure count, error and seconds until the next probe"""
+        return {
+            url: {
+                "failures": health.failures,
+                "last_error": health.last_error,
+                "retry_in": max(0.0, health.retry_at - time.monotonic()),
+            }
+            for url, health in self._health.items()
+        }
+
+    def register_backends(self, backend_configs: List[Dict]) -> int:
+        """
+        Add backends to check on every discovery (e.g. from BackendScanner.scan())
+
+        Args:
+            backend_configs: Backend configuration dicts with type, url, name
+
+        Returns:
+            Number of backends added (backends already known are skipped,
+            including defaults reached under another loopback name)
+        """
+        known = {normalize_backend_url(config["url"]) for config in self.DEFAULT_BACKENDS + self.registered_backends}
+        added = 0
+        for config in backend_configs:
+            key = normalize_backend_url(config["url"])
+            if key not in known:
+                known.add(key)
+                self.registered_backends.append(config)
+                added += 1
+        return added
+
     async def check_backend(self, backend_config: Dict) -> BackendInfo:
         """
         Check if a backend is available and discover its models
@@ -201,32 +857,59 @@ class ModelDiscovery:
             name=name,
         )
 
-        try:
-            # Discover models based on backend type
-            if backend_type == BackendType.OLLAMA:
-                backend.models = await self.discover_ollama(url)
-                backend.is_available = len(backend.models) > 0
-                print(f"[Model Discovery] {name}: {'✓' if backend.is_available else '✗'} ({len(backend.models)} models)")
-
-            elif backend_type in [BackendType.LM_STUDIO, BackendType.OPENAI_COMPATIBLE,
-                                   BackendType.VLLM, BackendType.TEXT_GENERATION_WEBUI]:
-                backend.models = await self.discover_openai_compatible(url)
-                backend.is_available = len(backend.models) > 0
-                print(f"[Model Discovery] {name}: {'✓' if backend.is_available else '✗'} ({len(backend.models)} models)")
-
-        except Exception as e:
-            backend.error = str(e)
-            backend.is_available = False
-            print(f"[Model Discovery] {name}: ✗ Error: {e}")
+        # Known to be down: skip it until its backoff expires
+        health = self._health.get(url)
+        if health is not None and health.in_backoff:
+            backend.error = health.last_error
+            return backend
+
+        # Cheap TCP probe first, so a dead backend costs probe_timeout, not timeout
+        error = await self.probe_backend(url)
+        if error is None:
+            try:
+                # Discover models based on backend type
+                if backend_type == BackendType.OLLAMA:
+                    backend.models = await self.discover_ollama(url)
+
+                elif backend_type in [BackendType.LM_STUDIO, BackendType.OPENAI_COMPATIBLE,
+                                       BackendType.VLLM, BackendType.TEXT_GENERATION_WEBUI]:
+                    backend.models = await self.discover_openai_compatible(url)
+
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                # Accepts connections but does not answer: back off like a refused probe
+                error = str(e) or type(e).__name__
+
+            except Exception as e:
+                backend.error = str(e)
+                backend.is_available = False
+                self._log_state(url, ("error", str(e)), f"[Model Discovery] {name}: ✗ Error: {e}")
+                return backend
+
+        if error is not None:
+            self._record_unreachable(url, error)
+            backend.error = error
+            self._log_state(url, "unreachable", f"[Model Discovery] {name}: ✗ Unreachable: {error}")
+            return backend
+        if self._health.pop(url, None) is not None:
+            print(f"[Model Discovery] {name}: reachable again")
+
+        backend.is_available = len(backend.models) > 0
+        self._log_state(url, (backend.is_available, len(backend.models)),
+                        f"[Model Discovery] {name}: {'✓' if backend.is_available else '✗'} ({len(backend.models)} models)")
 
         return backend
 
-    async def discover_all(self, custom_backends: Optional[List[Dict]] = None) -> List[BackendInfo]:
+    async def discover_all(
+        self,
+        custom_backends: Optional[List[Dict]] = None,
+        enrich: bool = False,
+    ) -> List[BackendInfo]:
         """
         Discover models from all backends
 
         Args:
             custom_backends: Optional list of custom backend configs to check
+            enrich: Also fetch per-model details (see enrich())
 
         Returns:
             List of BackendInfo for all checked backends
@@ -234,10 +917,14 @@ class ModelDiscovery:
         if not self.session:
             await self.start()
 
-        # Combine default and custom backends
-        backends_to_check = self.DEFAULT_BACKENDS.copy()
-        if custom_backends:
-            backends_to_check.extend(custom_backends)
+        # Combine default, registered and custom backends (each server once)
+        backends_to_check = []
+        seen_urls = set()
+        for backend in self.DEFAULT_BACKENDS + self.registered_backends + (custom_backends or []):
+            key = normalize_backend_url(backend["url"])
+            if key not in seen_urls:
+                seen_urls.add(key)
+                backends_to_check.append(backend)
 
         # Check all backends concurrently
         tasks = [self.check_backend(backend) for backend in backends_to_check]
@@ -249,6 +936,10 @@ class ModelDiscovery:
             if isinstance(result, BackendInfo):
                 backends.append(result)
 
+        if enrich:
+            await self.enrich(backends)
+        self._attach_benchmarks(backends)
+
         return backends
 
     def to_json(self, backends: List[BackendInfo]) -> str:
@@ -280,6 +971,11 @@ class ModelDiscovery:
                             "parameter_count": model.parameter_count,
                             "context_length": model.context_length,
                             "modified_at": model.modified_at,
+                            "digest": model.digest,
+                            "capabilities": model.capabilities,
+                            "supports_vision": model.supports_vision,
+                            "supports_tools": model.supports_tools,
+                            "benchmark": asdict(model.benchmark) if model.benchmark else None,
                         }
                         for model in backend.models
                     ]
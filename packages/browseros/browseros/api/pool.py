@@ -0,0 +1,120 @@
+"""
+Upstream pools for EnhancedAPIClient
+
+Spreads requests across several replicas of one API (e.g. vLLM or Ollama
+servers) instead of a single base URL:
+- Upstream: one replica and its outstanding-request counters
+- UpstreamPool: replica selection by least outstanding requests or
+  power-of-two-choices, plus health-probe settings
+
+The client keeps one circuit breaker per replica, skips replicas whose
+circuit is open and, if a health-check path is set, probes ejected
+replicas until they answer again.
+
+Used from a single event loop; takes no locks.
+"""
+
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urljoin
+
+# Selection strategies accepted by UpstreamPool
+POOL_STRATEGIES = ('least_outstanding', 'p2c')
+
+
+@dataclass(eq=False)
+class Upstream:
+    """One replica in an UpstreamPool"""
+    base_url: str
+    outstanding: int = 0  # Requests (and open streams) in progress
+    requests: int = 0
+    failures: int = 0
+    ejections: int = 0  # Times its circuit opened
+
+    def url_for(self, endpoint: str) -> str:
+        """Full URL of an endpoint on this replica"""
+        return urljoin(self.base_url + '/', endpoint.lstrip('/'))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters for get_stats()"""
+        return {
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+        }
+
+
+class UpstreamPool:
+    """
+    Replicas of one API and how to choose between them.
+
+    ``least_outstanding`` sends each request to the replica with the fewest
+    requests in progress (ties broken at random). ``p2c`` (power of two
+    choices) compares two replicas picked at random, which balances almost
+    as well and stays cheap with many replicas.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        strategy: str = 'least_outstanding',
+        health_check_path: Optional[str] = None,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 5.0,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            base_urls: Base URL of each replica
+            strategy: 'least_outstanding' or 'p2c'
+            health_check_path: Endpoint probed on ejected replicas (e.g.
+                               '/health' for vLLM, '/api/version' for Ollama);
+                               None readmits them after the circuit breaker's
+                               recovery timeout instead
+            health_check_interval: Seconds between probes
+            health_check_timeout: Seconds before a probe counts as failed
+        """
+        if not base_urls:
+            raise ValueError("UpstreamPool needs at least one base URL")
+        if strategy not in POOL_STRATEGIES:
+            raise ValueError(f"strategy must be one of {POOL_STRATEGIES}, got {strategy!r}")
+        self.upstreams: List[Upstream] = [Upstream(url.rstrip('/')) for url in base_urls]
+        self.strategy = strategy
+        self.health_check_path = health_check_path
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+    def choose(self, candidates: List[Upstream]) -> Upstream:
+        """Pick a replica from the available candidates"""
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy == 'p2c':
+            first, second = random.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+
+        fewest = min(upstream.outstanding for upstream in candidates)
+        return random.choice([upstream for upstream in candidates if upstream.outstanding == fewest])
+
+    def find(self, url: str) -> Optional[Upstream]:
+        """The replica a URL belongs to, if any"""
+        for upstream in self.upstreams:
+            if url == upstream.base_url or url.startswith(upstream.base_url + '/'):
+                return upstream
+        return None
+
+    @contextmanager
+    def track(self, upstream: Upstream) -> Iterator[None]:
+        """Count a request as outstanding on a replica while it runs"""
+        upstream.outstanding += 1
+        upstream.requests += 1
+        try:
+            yield
+        except Exception:
+            upstream.failures += 1
+            raise
+        finally:
+            upstream.outstanding -= 1
@@ -0,0 +1,216 @@
+"""
+Rate limiting and adaptive concurrency for EnhancedAPIClient
+
+Keeps request rates under upstream limits instead of overshooting into 429s:
+- TokenBucket: requests/second with a burst allowance; can be paused until
+  a Retry-After deadline
+- AdaptiveConcurrencyLimiter: AIMD limit on concurrent requests, raised
+  while latency stays near its baseline and cut when latency climbs or the
+  upstream reports overload
+- parse_retry_after: Retry-After header (seconds or HTTP date) to seconds
+
+Both limiters are used from a single event loop and take no locks.
+"""
+
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Returns:
+        Seconds to wait (0 or more), or None if missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of ``burst``.
+
+    Callers reserve a token up front and sleep off any deficit, so waiters
+    are released in arrival order, spaced 1/rate apart.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the bucket (full)
+
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests sent back to back (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return
+
+        delay = -self.tokens / self.rate
+        self.waits += 1
+        self.wait_seconds += delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.tokens += 1  # Give the reservation back
+            raise
+
+    def pause(self, seconds: float):
+        """Send nothing for the given time (e.g. from Retry-After), then resume at ``rate``"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limit.
+
+    Each completed request with latency within ``latency_tolerance`` times
+    the baseline adds 1/limit, growing the limit by about one per round
+    trip. A request that was overloaded (429, 5xx, timeout, connection
+    error) or slower than the tolerance multiplies the limit by
+    ``backoff_ratio``, at most once per ``limit`` completions so a single
+    burst of failures is not punished repeatedly. The baseline is the
+    lowest latency seen in the previous window of ``window`` requests.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+        window: int = 100,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lowest the limit may fall to
+            max_limit: Highest the limit may rise to
+            latency_tolerance: Latency above baseline * tolerance counts as congestion
+            backoff_ratio: Factor applied to the limit on congestion or overload
+            window: Requests per baseline-latency window
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.window = window
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self._baseline: Optional[float] = None
+        self._window_min = float('inf')
+        self._window_count = 0
+        self._since_decrease = 0
+
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self):
+        """Wait for a free slot"""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(None)  # Slot was handed over just before cancellation
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self, latency: Optional[float], overloaded: bool = False):
+        """
+        Free a slot and adjust the limit
+
+        Args:
+            latency: Seconds the request took (None to skip adjusting, e.g. cancelled)
+            overloaded: The upstream signalled overload (429, 5xx, timeout, connection error)
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency, overloaded)
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def _observe(self, latency: float, overloaded: bool):
+        self._window_min = min(self._window_min, latency)
+        self._window_count += 1
+        if self._window_count >= self.window:
+            self._baseline = self._window_min
+            self._window_min = float('inf')
+            self._window_count = 0
+        baseline = self._window_min if self._baseline is None else min(self._baseline, self._window_min)
+
+        self._since_decrease += 1
+        congested = latency > baseline * self.latency_tolerance
+
+        if overloaded or congested:
+            if self._since_decrease >= self.limit:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._since_decrease = 0
+                self.decreases += 1
+        elif self._limit < self.max_limit:
+            previous = self.limit
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            if self.limit > previous:
+                self.increases += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit and adjustment counters"""
+        return {
+            'concurrency_limit': self.limit,
+            'concurrency_in_flight': self.in_flight,
+            'concurrency_waiting': len(self._waiters),
+            'concurrency_increases': self.increases,
+            'concurrency_decreases': self.decreases,
+            'baseline_latency_ms': round(self._baseline * 1000, 3) if self._baseline is not None else None,
+        }
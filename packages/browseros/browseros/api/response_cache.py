@@ -0,0 +1,303 @@
+"""
+Bounded response cache for EnhancedAPIClient
+
+Keeps cached responses within fixed limits so long-running processes do not
+grow without bound:
+- LRU eviction once the entry count or total size exceeds its limit
+- Sizes estimated from the response body length
+- Expired entries removed on read and by a periodic sweep, unless they
+  are retained for revalidation (ETag/Last-Modified) or stale serving
+- Eviction and expiration counters for get_stats()
+
+ResponseCache never awaits, so within one event loop it needs no lock.
+ShardedResponseCache is a thread-safe variant for sharing one cache
+between clients running on several threads or event loops.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class CacheEntry:
+    """Cached response entry"""
+    data: Any
+    timestamp: float
+    ttl: float
+    size: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stale_ttl: float = 0.0  # Seconds an expired entry is kept for revalidation/stale serving
+
+    def is_expired(self) -> bool:
+        """Check if cache entry has expired"""
+        return time.time() - self.timestamp > self.ttl
+
+    def is_retained(self) -> bool:
+        """Check if the entry is fresh or still within its stale period"""
+        return time.time() - self.timestamp <= self.ttl + self.stale_ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validator headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    LRU cache of responses bounded by entry count and total size.
+
+    Not synchronized. Every method runs to completion without awaiting, so
+    coroutines on one event loop can share it without a lock; use
+    ShardedResponseCache when several threads access the cache.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses; a single
+                       response larger than this is not cached
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get a fresh entry, marking it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.is_expired():
+            if not entry.is_retained():
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry that is fresh or still within its stale period"""
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_retained():
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        ttl: float,
+        size: int = 0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        stale_ttl: float = 0.0,
+    ) -> bool:
+        """
+        Store a response, evicting least recently used entries as needed
+
+        Args:
+            key: Cache key
+            data: Decoded response
+            ttl: Seconds the entry is fresh
+            size: Response body size in bytes
+            etag: ETag response header, sent back as If-None-Match
+            last_modified: Last-Modified response header, sent back as If-Modified-Since
+            stale_ttl: Seconds the entry is kept after expiring
+
+        Returns:
+            False if the response is too large to cache
+        """
+        return self.put(key, CacheEntry(
+            data=data,
+            timestamp=time.time(),
+            ttl=ttl,
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+            stale_ttl=stale_ttl,
+        ))
+
+    def put(self, key: str, entry: CacheEntry) -> bool:
+        """
+        Store an existing entry as is (keeping its timestamp), e.g. one
+        loaded from the disk tier
+
+        Returns:
+            False if the entry is too large to cache
+        """
+        if entry.size > self.max_bytes:
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self.total_bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry; returns whether it existed"""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def sweep(self) -> int:
+        """Remove every expired entry past its stale period; returns how many were removed"""
+        expired = [key for key, entry in self._entries.items() if not entry.is_retained()]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Occupancy and eviction statistics"""
+        return {
+            'cache_size': len(self._entries),
+            'cache_bytes': self.total_bytes,
+            'cache_max_entries': self.max_entries,
+            'cache_max_bytes': self.max_bytes,
+            'cache_evictions': self.evictions,
+            'cache_expirations': self.expirations,
+        }
+
+
+class ShardedResponseCache:
+    """
+    Thread-safe response cache split into independently locked shards.
+
+    Keys are spread over the shards by hash, so threads touching different
+    keys rarely wait on the same lock. Limits are divided evenly between
+    shards: a response larger than ``max_bytes / shards`` is not cached.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024, shards: int = 16):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses across all shards
+            max_bytes: Maximum total size of cached responses across all shards
+            shards: Number of independently locked shards
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._shards: List[ResponseCache] = [
+            ResponseCache(max_entries=max(1, max_entries // shards), max_bytes=max_bytes // shards)
+            for _ in range(shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard(self, key: str) -> Tuple[ResponseCache, threading.Lock]:
+        index = hash(key) % len(self._shards)
+        return self._shards[index], self._locks[index]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, key: str) -> bool:
+        shard, lock = self._shard(key)
+        with lock:
+            return key in shard
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(shard.total_bytes for shard in self._shards)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get a fresh entry, marking it most recently used"""
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.get(key)
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry that is fresh or still within its stale period"""
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.get_stale(key)
+
+    def set(self, key: str, data: Any, ttl: float, size: int = 0, **options) -> bool:
+        """Store a response (see ResponseCache.set); returns False if it is too large for a shard"""
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.set(key, data, ttl, size, **options)
+
+    def put(self, key: str, entry: CacheEntry) -> bool:
+        """Store an existing entry as is (see ResponseCache.put)"""
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.put(key, entry)
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry; returns whether it existed"""
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.delete(key)
+
+    def sweep(self) -> int:
+        """Remove every expired entry, one shard at a time"""
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                removed += shard.sweep()
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Occupancy and eviction statistics summed over all shards"""
+        return {
+            'cache_size': len(self),
+            'cache_bytes': self.total_bytes,
+            'cache_max_entries': self.max_entries,
+            'cache_max_bytes': self.max_bytes,
+            'cache_evictions': sum(shard.evictions for shard in self._shards),
+            'cache_expirations': sum(shard.expirations for shard in self._shards),
+            'cache_shards': len(self._shards),
+        }
@@ -0,0 +1,122 @@
+"""
+Incremental decoding for EnhancedAPIClient.stream_lines()
+
+Turns a stream of byte chunks into lines, NDJSON objects or Server-Sent
+Events without buffering the whole body:
+- LineSplitter: bytes -> text lines (handles lines split across chunks)
+- SSEDecoder: text lines -> SSEEvent (text/event-stream, as used by
+  OpenAI-compatible token streams)
+- detect_format: pick a decoder from the response Content-Type
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+# Formats accepted by EnhancedAPIClient.stream_lines()
+STREAM_FORMATS = ('auto', 'lines', 'ndjson', 'sse')
+
+_NDJSON_TYPES = (
+    'application/x-ndjson',
+    'application/ndjson',
+    'application/jsonl',
+    'application/x-jsonlines',
+)
+
+
+@dataclass
+class SSEEvent:
+    """A Server-Sent Event"""
+    data: str
+    event: str = 'message'
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+    def json(self) -> Any:
+        """Decode the event data as JSON"""
+        return json.loads(self.data)
+
+
+def detect_format(content_type: str) -> str:
+    """Choose a stream format ('sse', 'ndjson' or 'lines') from a Content-Type header"""
+    mime = content_type.split(';', 1)[0].strip().lower()
+    if mime == 'text/event-stream':
+        return 'sse'
+    if mime in _NDJSON_TYPES:
+        return 'ndjson'
+    return 'lines'
+
+
+class LineSplitter:
+    """Split a byte stream into UTF-8 lines, keeping partial lines between chunks"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Add a chunk; returns the lines it completed (without line endings)"""
+        self._buffer.extend(chunk)
+        if b'\n' not in chunk:
+            return []
+        *lines, rest = self._buffer.split(b'\n')
+        self._buffer = bytearray(rest)
+        return [line.rstrip(b'\r').decode('utf-8') for line in lines]
+
+    def flush(self) -> List[str]:
+        """Return the final line if the stream did not end with a newline"""
+        if not self._buffer:
+            return []
+        line = self._buffer.rstrip(b'\r').decode('utf-8')
+        self._buffer = bytearray()
+        return [line]
+
+
+class SSEDecoder:
+    """Assemble text/event-stream lines into events"""
+
+    def __init__(self):
+        self._data: List[str] = []
+        self._event: Optional[str] = None
+        self._retry: Optional[int] = None
+        self._last_id: Optional[str] = None
+
+    def feed(self, line: str) -> Optional[SSEEvent]:
+        """Process one line; returns an event when a blank line completes one"""
+        if not line:
+            return self._dispatch()
+        if line.startswith(':'):
+            return None  # Comment / keep-alive
+
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+
+        if field == 'data':
+            self._data.append(value)
+        elif field == 'event':
+            self._event = value
+        elif field == 'id' and '\0' not in value:
+            self._last_id = value
+        elif field == 'retry' and value.isdigit():
+            self._retry = int(value)
+        return None
+
+    def flush(self) -> Optional[SSEEvent]:
+        """Dispatch a final event the server did not terminate with a blank line"""
+        return self._dispatch()
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        if not self._data:
+            self._event = None
+            return None
+
+        event = SSEEvent(
+            data='\n'.join(self._data),
+            event=self._event or 'message',
+            id=self._last_id,
+            retry=self._retry,
+        )
+        self._data = []
+        self._event = None
+        self._retry = None
+        return event
@@ -10,22 +10,59 @@ Both transports support the same MCP tool interface.
 
 from .json_transport import (
     JsonRpcErrorCode,
+    JsonRpcException,
     JsonRpcRequest,
     JsonRpcError,
     JsonRpcResponse,
+    ToolSpec,
     MCPJsonRpcServer,
     MCPJsonRpcClient,
     create_stdio_server,
 )
+from .codec import (
+    JsonCodec,
+    available_codecs,
+    get_codec,
+)
+from .framing import (
+    LineFraming,
+    ContentLengthFraming,
+    get_framing,
+)
+from .metrics import (
+    LatencyHistogram,
+    ServerMetrics,
+)
+from .result_cache import ToolResultCache
+from .schema import ArgumentValidator, validate_arguments
+from .stdio_client import (
+    StdioSubprocessClient,
+    AsyncStdioSubprocessClient,
+)
 
 __all__ = [
     "JsonRpcErrorCode",
+    "JsonRpcException",
     "JsonRpcRequest",
     "JsonRpcError",
     "JsonRpcResponse",
+    "ToolSpec",
     "MCPJsonRpcServer",
     "MCPJsonRpcClient",
     "create_stdio_server",
+    "StdioSubprocessClient",
+    "AsyncStdioSubprocessClient",
+    "JsonCodec",
+    "available_codecs",
+    "get_codec",
+    "LineFraming",
+    "ContentLengthFraming",
+    "get_framing",
+    "ArgumentValidator",
+    "validate_arguments",
+    "LatencyHistogram",
+    "ServerMetrics",
+    "ToolResultCache",
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark harness for the MCP JSON-RPC stdio transport.
+
+Spawns an MCP server with synthetic tools in a subprocess, drives it over
+stdio with :class:`AsyncStdioSubprocessClient`, and reports throughput,
+latency percentiles, and the server's CPU time and RSS.
+
+Two load models are supported:
+
+- closed loop (default): ``--concurrency`` workers each send their next
+  request as soon as the previous one completes
+- open loop: ``--rate`` requests per second are sent on a fixed schedule,
+  whether or not earlier ones have completed. Latency is measured from the
+  scheduled send time, so a stalled server is not hidden by the client
+  slowing down (no coordinated omission)
+
+Synthetic tools (configured per run with ``--latency-ms`` and
+``--payload-bytes``):
+
+- ``echo``: returns a payload immediately
+- ``sleep``: sync handler that blocks for the latency (runs on the pool)
+- ``async_sleep``: async handler that awaits for the latency
+- ``cpu``: sync handler that busy-loops for the latency (holds the GIL)
+- ``blob``: returns a bytes payload (raw attachment with content-length
+  framing, base64 otherwise)
+
+Usage:
+    python -m browseros.mcp.benchmark --tool sleep --latency-ms 5 --concurrency 64
+    python -m browseros.mcp.benchmark --tool echo --payload-bytes 65536 --rate 2000
+    python -m browseros.mcp.benchmark --json results.json --baseline baseline.json
+
+With ``--baseline`` the run exits with status 1 if throughput dropped or
+p99 latency grew by more than ``--tolerance`` (default 10%). Runs are only
+compared if they used the same workload (tool, payload, load model,
+framing, codec, server settings); otherwise the exit status is 2, unless
+``--allow-config-mismatch`` is given.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+from .codec import available_codecs
+from .json_transport import JsonRpcException, create_stdio_server
+from .stdio_client import AsyncStdioSubprocessClient
+
+SYNTHETIC_TOOLS = ["echo", "sleep", "async_sleep", "cpu", "blob"]
+
+# Errors reading another process's stats (e.g. it already exited)
+_SAMPLE_ERRORS = (OSError, IndexError, ValueError) + ((psutil.Error,) if HAS_PSUTIL else ())
+
+# BenchmarkConfig fields that define the workload; runs that differ in any of
+# them are not comparable (duration, warmup and timeout only affect precision)
+COMPARABLE_CONFIG_FIELDS = [
+    "tool", "latency_ms", "payload_bytes", "request_bytes", "concurrency", "rate",
+    "framing", "codec", "server_mode", "server_workers",
+]
+
+# Directory that contains the browseros package, for the server subprocess
+_PACKAGE_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+# ============================================================================
+# Synthetic Server
+# ============================================================================
+
+def _payload(params: Dict[str, Any]) -> str:
+    return "x" * int(params.get("payload_bytes", 0))
+
+
+def _echo_tool(params: Dict[str, Any]) -> str:
+    return _payload(params)
+
+
+def _sleep_tool(params: Dict[str, Any]) -> str:
+    time.sleep(params.get("latency_ms", 0) / 1000)
+    return _payload(params)
+
+
+async def _async_sleep_tool(params: Dict[str, Any]) -> str:
+    await asyncio.sleep(params.get("latency_ms", 0) / 1000)
+    return _payload(params)
+
+
+def _cpu_tool(params: Dict[str, Any]) -> str:
+    deadline = time.perf_counter() + params.get("latency_ms", 0) / 1000
+    while time.perf_counter() < deadline:
+        pass
+    return _payload(params)
+
+
+def _blob_tool(params: Dict[str, Any]) -> bytes:
+    return os.urandom(int(params.get("payload_bytes", 0)))
+
+
+def serve(mode: str = "concurrent", codec: Optional[str] = None, max_concurrency: int = 64) -> None:
+    """
+    Run an MCP server exposing the synthetic tools on stdio.
+
+    Args:
+        mode: "concurrent" (worker pool) or "sequential" (one request at a time)
+        codec: JSON codec name (defaults to the fastest installed)
+        max_concurrency: Worker pool size in concurrent mode
+    """
+    server = create_stdio_server(codec=codec, max_concurrency=max_concurrency)
+    server.add_tool("echo", _echo_tool)
+    server.add_tool("sleep", _sleep_tool)
+    server.add_tool("async_sleep", _async_sleep_tool)
+    server.add_tool("cpu", _cpu_tool)
+    server.add_tool("blob", _blob_tool)
+    server.run(concurrent=(mode == "concurrent"))
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+@dataclass
+class BenchmarkConfig:
+    """Parameters of one benchmark run."""
+    tool: str = "echo"
+    latency_ms: float = 0.0
+    payload_bytes: int = 0
+    request_bytes: int = 0
+    concurrency: int = 16
+    rate: Optional[float] = None
+    duration: float = 10.0
+    warmup: float = 1.0
+    timeout: float = 30.0
+    framing: str = "line"
+    codec: Optional[str] = None
+    server_mode: str = "concurrent"
+    server_workers: int = 64
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of one benchmark run; latencies in milliseconds."""
+    config: BenchmarkConfig
+    requests: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    throughput_rps: float = 0.0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    server_cpu_seconds: Optional[float] = None
+    server_cpu_percent: Optional[float] = None
+    server_rss_peak_bytes: Optional[int] = None
+    client_cpu_seconds: float = 0.0
+    client_rss_peak_bytes: Optional[int] = None
+    server_metrics: Dict[str, Any] = field(default_factory=dict)
+    environment: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    """Exact latency percentiles (ms) from a list of samples in seconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 3)
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "p999": at(0.999),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class _ProcessSampler:
+    """
+    Samples a process's CPU time and RSS.
+
+    Uses psutil when installed, otherwise /proc (Linux). On other platforms
+    without psutil the server figures are reported as None.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.peak_rss: Optional[int] = None
+        self._process = psutil.Process(pid) if HAS_PSUTIL else None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def cpu_seconds(self) -> Optional[float]:
+        """User + system CPU time consumed so far."""
+        try:
+            if self._process is not None:
+                times = self._process.cpu_times()
+                return times.user + times.system
+            with open(f"/proc/{self.pid}/stat") as f:
+                # Fields after the parenthesised command name; utime and stime are 14 and 15
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        except _SAMPLE_ERRORS:
+            return None
+
+    def sample_rss(self) -> None:
+        """Record the current RSS, keeping the peak."""
+        rss = None
+        try:
+            if self._process is not None:
+                rss = self._process.memory_info().rss
+            else:
+                with open(f"/proc/{self.pid}/statm") as f:
+                    rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except _SAMPLE_ERRORS:
+            return
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+
+
+def _tool_arguments(config: BenchmarkConfig) -> Dict[str, Any]:
+    arguments: Dict[str, Any] = {
+        "latency_ms": config.latency_ms,
+        "payload_bytes": config.payload_bytes,
+    }
+    if config.request_bytes:
+        arguments["data"] = "x" * config.request_bytes
+    return arguments
+
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Spawn the synthetic server and drive it as described by config.
+
+    Returns:
+        BenchmarkResult for the measured window (warmup excluded)
+    """
+    command = [
+        sys.executable, "-m", "browseros.mcp.benchmark", "serve",
+        "--server-mode", config.server_mode,
+        "--server-workers", str(config.server_workers),
+    ]
+    if config.codec:
+        command += ["--codec", config.codec]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, env.get("PYTHONPATH")]))
+
+    result = BenchmarkResult(config=config)
+    samples: List[float] = []
+    errors: Dict[str, int] = {}
+    arguments = _tool_arguments(config)
+
+    async with AsyncStdioSubprocessClient(
+        command,
+        timeout=config.timeout,
+        env=env,
+        codec=config.codec,
+        framing=config.framing,
+    ) as client:
+        await client.ping()
+        assert client.process is not None
+        sampler = _ProcessSampler(client.process.pid)
+
+        start = time.perf_counter()
+        measure_from = start + config.warmup
+        stop_at = measure_from + config.duration
+
+        async def call(scheduled: float) -> None:
+            try:
+                await client.call_tool(config.tool, arguments)
+                failure = None
+            except JsonRpcException as e:
+                failure = e.code.name
+            if scheduled >= measure_from:
+                if failure is None:
+                    samples.append(time.perf_counter() - scheduled)
+                else:
+                    errors[failure] = errors.get(failure, 0) + 1
+
+        async def closed_loop_worker() -> None:
+            while time.perf_counter() < stop_at:
+                await call(time.perf_counter())
+
+        async def open_loop() -> None:
+            slots = asyncio.Semaphore(config.concurrency)
+            pending = set()
+            interval = 1.0 / config.rate
+            sent = 0
+            while True:
+                scheduled = start + sent * interval
+                if scheduled >= stop_at:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                task = asyncio.create_task(call(scheduled))
+                task.add_done_callback(lambda _: slots.release())
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                sent += 1
+            if pending:
+                await asyncio.gather(*pending)
+
+        async def watch_server() -> None:
+            while True:
+                sampler.sample_rss()
+                await asyncio.sleep(0.1)
+
+        watcher = asyncio.create_task(watch_server())
+        client_cpu_start = time.process_time()
+        cpu_start: Optional[float] = None
+        try:
+            if config.rate:
+                load = asyncio.create_task(open_loop())
+            else:
+                load = asyncio.gather(*(closed_loop_worker() for _ in range(config.concurrency)))
+            await asyncio.sleep(max(0.0, measure_from - time.perf_counter()))
+            cpu_start = sampler.cpu_seconds()
+            measured_start = time.perf_counter()
+            await load
+            elapsed = time.perf_counter() - measured_start
+            cpu_end = sampler.cpu_seconds()
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+
+        try:
+            result.server_metrics = await client.request("server/metrics")
+        except JsonRpcException:
+            pass
+
+    result.requests = len(samples)
+    result.errors = errors
+    result.elapsed_seconds = round(elapsed, 3)
+    result.throughput_rps = round(len(samples) / elapsed, 2) if elapsed else 0.0
+    result.latency_ms = _percentiles(samples)
+    if cpu_start is not None and cpu_end is not None:
+        result.server_cpu_seconds = round(cpu_end - cpu_start, 3)
+        result.server_cpu_percent = round((cpu_end - cpu_start) / elapsed * 100, 1) if elapsed else None
+    result.server_rss_peak_bytes = sampler.peak_rss
+    result.client_cpu_seconds = round(time.process_time() - client_cpu_start, 3)
+    if HAS_RESOURCE:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result.client_rss_peak_bytes = max_rss if sys.platform == "darwin" else max_rss * 1024
+    result.environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "codecs": available_codecs(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    return result
+
+
+def config_differences(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Workload parameters that differ between two runs.
+
+    Args:
+        result: BenchmarkResult.to_dict() of this run
+        baseline: The same for the baseline run
+
+    Returns:
+        One description per differing field (a baseline without a recorded
+        config is reported as a difference too)
+    """
+    current = result.get("config") or {}
+    recorded = baseline.get("config")
+    if not recorded:
+        return ["baseline has no recorded config"]
+    return [
+        f"{name}: {current.get(name)!r} (baseline {recorded.get(name)!r})"
+        for name in COMPARABLE_CONFIG_FIELDS
+        if current.get(name) != recorded.get(name)
+    ]
+
+
+def compare_to_baseline(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    allow_config_mismatch: bool = False,
+) -> List[str]:
+    """
+    Compare a result with a baseline run.
+
+    Args:
+        result: BenchmarkResult.to_dict() of this run
+        baseline: The same for the baseline run
+        tolerance: Allowed relative change (0.1 = 10%)
+        allow_config_mismatch: Compare even if the runs used different workloads
+
+    Returns:
+        Descriptions of every regression beyond the tolerance
+
+    Raises:
+        ValueError: If the runs used different workloads (see config_differences)
+            and allow_config_mismatch is False
+    """
+    differences = config_differences(result, baseline)
+    if differences and not allow_config_mismatch:
+        raise ValueError("Baseline was recorded with a different config: " + "; ".join(differences))
+
+    regressions = []
+    if result["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(
+            f"throughput {result['throughput_rps']} rps < baseline {baseline['throughput_rps']} rps"
+        )
+    current_p99 = result["latency_ms"].get("p99")
+    baseline_p99 = baseline["latency_ms"].get("p99")
+    if current_p99 is not None and baseline_p99 and current_p99 > baseline_p99 * (1 + tolerance):
+        regressions.append(f"p99 latency {current_p99} ms > baseline {baseline_p99} ms")
+    return regressions
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value / (1024 * 1024):.1f} MiB"
+
+
+def print_report(result: BenchmarkResult) -> None:
+    """Print a human-readable summary."""
+    config = result.config
+    load = f"{config.rate:g} req/s" if config.rate else f"concurrency {config.concurrency}"
+    print("=" * 70)
+    print(f"MCP stdio benchmark: tool={config.tool} latency={config.latency_ms:g}ms "
+          f"payload={config.payload_bytes}B {load}")
+    print(f"server={config.server_mode} framing={config.framing} codec={config.codec or 'auto'}")
+    print("=" * 70)
+    print(f"Requests:    {result.requests} in {result.elapsed_seconds}s")
+    print(f"Throughput:  {result.throughput_rps} req/s")
+    if result.errors:
+        print(f"Errors:      {result.errors}")
+    latency = result.latency_ms
+    if latency:
+        print(f"Latency ms:  p50={latency['p50']} p90={latency['p90']} p95={latency['p95']} "
+              f"p99={latency['p99']} max={latency['max']}")
+    cpu = f"{result.server_cpu_percent}%" if result.server_cpu_percent is not None else "n/a"
+    print(f"Server:      CPU {cpu}, peak RSS {_format_bytes(result.server_rss_peak_bytes)}")
+    print(f"Client:      CPU {result.client_cpu_seconds}s, peak RSS {_format_bytes(result.client_rss_peak_bytes)}")
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m browseros.mcp.benchmark",
+        description="Benchmark the MCP JSON-RPC stdio transport.",
+    )
+    parser.add_argument("mode", nargs="?", choices=["run", "serve"], default="run",
+                        help="run a benchmark (default) or act as the synthetic server")
+    parser.add_argument("--tool", choices=SYNTHETIC_TOOLS, default="echo")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated tool latency")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="size of each tool result")
+    parser.add_argument("--request-bytes", type=int, default=0, help="extra bytes in each request")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="workers (closed loop) or max in flight (with --rate)")
+    parser.add_argument("--rate", type=float, help="open-loop request rate per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--framing", choices=["line", "content-length"], default="line")
+    parser.add_argument("--codec", choices=["msgspec", "orjson", "json"])
+    parser.add_argument("--server-mode", choices=["concurrent", "sequential"], default="concurrent")
+    parser.add_argument("--server-workers", type=int, default=64)
+    parser.add_argument("--json", metavar="PATH", help="write the result as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="PATH", help="fail if worse than this result JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression (0.1 = 10%%)")
+    parser.add_argument("--allow-config-mismatch", action="store_true",
+                        help="compare with a baseline recorded with different parameters (warns)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``python -m browseros.mcp.benchmark``."""
+    args = _parser().parse_args(argv)
+
+    if args.mode == "serve":
+        serve(mode=args.server_mode, codec=args.codec, max_concurrency=args.server_workers)
+        return 0
+
+    config = BenchmarkConfig(
+        tool=args.tool,
+        latency_ms=args.latency_ms,
+        payload_bytes=args.payload_bytes,
+        request_bytes=args.request_bytes,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        timeout=args.timeout,
+        framing=args.framing,
+        codec=args.codec,
+        server_mode=args.server_mode,
+        server_workers=args.server_workers,
+    )
+    result = asyncio.run(run_benchmark(config))
+    data = result.to_dict()
+
+    if args.json == "-":
+        print(json.dumps(data, indent=2))
+    else:
+        print_report(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(data, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = config_differences(data, baseline)
+        if differences and not args.allow_config_mismatch:
+            print("Not comparable with the baseline (use --allow-config-mismatch to compare anyway):",
+                  file=sys.stderr)
+            for difference in differences:
+                print(f"  {difference}", file=sys.stderr)
+            return 2
+        for difference in differences:
+            print(f"WARNING: config differs from baseline: {difference}", file=sys.stderr)
+        regressions = compare_to_baseline(data, baseline, args.tolerance, allow_config_mismatch=True)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+JSON codecs for the MCP JSON-RPC transport.
+
+Every message the transport reads or writes goes through a codec. The
+fastest installed backend is picked automatically:
+
+- msgspec: decodes requests straight into the slotted message dataclasses,
+  skipping the intermediate dict
+- orjson: fast decoding to plain values and encoding straight to bytes
+- json: stdlib fallback, always available
+
+All codecs encode to UTF-8 bytes and render ``bytes`` values as base64
+strings, so output is interchangeable whichever backend is installed.
+
+Usage:
+    codec = get_codec()            # best available
+    codec = get_codec("json")      # force stdlib
+    data = codec.encode({"jsonrpc": "2.0", "result": 1, "id": "1"})
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encode values the JSON backends do not handle natively."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Stdlib ``json`` codec, and the interface the faster backends implement.
+
+    ``decode`` raises ``ValueError`` (or a subclass) for malformed input.
+    """
+
+    name = "json"
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """Decode JSON text into plain Python values."""
+        return json.loads(data)
+
+    def decode_typed(self, data: Union[str, bytes], type_: Any) -> Any:
+        """
+        Decode JSON text directly into ``type_`` where the backend supports it.
+
+        Backends without typed decoding, and documents that do not fit
+        ``type_``, fall back to plain values; callers must accept both.
+        """
+        return self.decode(data)
+
+    def encode(self, obj: Any) -> bytes:
+        """Encode a value to compact UTF-8 JSON."""
+        return json.dumps(obj, default=_encode_default, separators=(",", ":")).encode()
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by orjson."""
+
+    name = "orjson"
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecCodec(JsonCodec):
+    """Codec backed by msgspec, with typed decoding into dataclasses."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=_encode_default)
+        self._typed_decoders: Dict[Any, Any] = {}
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return self._decoder.decode(data)
+
+    def decode_typed(self, data: Union[str, bytes], type_: Any) -> Any:
+        decoder = self._typed_decoders.get(type_)
+        if decoder is None:
+            decoder = self._typed_decoders[type_] = msgspec.json.Decoder(type_)
+
+        try:
+            return decoder.decode(data)
+        except msgspec.ValidationError:
+            # Valid JSON that does not match the expected shape; let the
+            # caller report it from the plain values.
+            return self.decode(data)
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+# Preferred backends, fastest first
+_CODECS = {
+    "msgspec": (HAS_MSGSPEC, MsgspecCodec),
+    "orjson": (HAS_ORJSON, OrjsonCodec),
+    "json": (True, JsonCodec),
+}
+
+
+def available_codecs() -> List[str]:
+    """Names of the codecs usable in this environment, fastest first."""
+    return [name for name, (available, _) in _CODECS.items() if available]
+
+
+def get_codec(codec: Optional[Union[str, JsonCodec]] = None) -> JsonCodec:
+    """
+    Resolve a codec.
+
+    Args:
+        codec: A codec instance, a backend name ("msgspec", "orjson",
+               "json"), or None / "auto" for the fastest installed backend
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the named backend is unknown or not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is None or codec == "auto":
+        return _CODECS[available_codecs()[0]][1]()
+
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec: {codec} (choose from {', '.join(_CODECS)})")
+
+    available, codec_class = _CODECS[codec]
+    if not available:
+        raise ValueError(f"Codec '{codec}' is not installed. Install with: pip install {codec}")
+    return codec_class()
+
+
+__all__ = [
+    "JsonCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "available_codecs",
+    "get_codec",
+]
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Message framing for the MCP JSON-RPC stdio transport.
+
+Two framings are supported:
+
+- line (default): one JSON message per line. Binary values are sent as
+  base64 strings inside the JSON.
+- content-length: each message is preceded by a header block, as in the
+  Language Server Protocol. Binary values travel as raw attachments after
+  the JSON body instead of being base64-encoded and escaped::
+
+      Content-Length: 83\r\n
+      Attachment-Lengths: 48213,1024\r\n
+      \r\n
+      {"jsonrpc":"2.0","id":"1","result":{"image":{"$attachment":0},...}}
+      <48213 raw bytes><1024 raw bytes>
+
+  Inside the JSON body each attachment is referenced by a
+  ``{"$attachment": <index>}`` placeholder. A frame whose lengths add up
+  to more than ``max_message_size`` is rejected before anything is read.
+
+A server negotiates the framing from the first bytes the client sends: a
+JSON message means line framing, a header block means content-length
+framing. The server answers in the framing the client chose.
+"""
+
+import asyncio
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
+
+from .codec import JsonCodec
+
+# (JSON body, attachments) as read off the wire
+Frame = Tuple[bytes, List[bytes]]
+
+ATTACHMENT_KEY = "$attachment"
+
+# Largest content-length frame (body plus attachments) accepted by default
+DEFAULT_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def extract_attachments(obj: Any, attachments: List[bytes]) -> Any:
+    """
+    Replace binary values with attachment placeholders.
+
+    Args:
+        obj: Message payload (dicts and lists are walked recursively)
+        attachments: List the binary values are appended to
+
+    Returns:
+        The payload with every bytes-like value replaced by a placeholder
+    """
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        attachments.append(bytes(obj))
+        return {ATTACHMENT_KEY: len(attachments) - 1}
+    if isinstance(obj, dict):
+        return {key: extract_attachments(value, attachments) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [extract_attachments(value, attachments) for value in obj]
+    return obj
+
+
+def inject_attachments(obj: Any, attachments: List[bytes]) -> Any:
+    """
+    Replace attachment placeholders with the attachments they reference.
+
+    Args:
+        obj: Decoded message payload
+        attachments: Attachments read after the JSON body
+
+    Returns:
+        The payload with placeholders replaced by bytes values
+    """
+    if isinstance(obj, dict):
+        if len(obj) == 1 and isinstance(obj.get(ATTACHMENT_KEY), int):
+            return attachments[obj[ATTACHMENT_KEY]]
+        return {key: inject_attachments(value, attachments) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [inject_attachments(value, attachments) for value in obj]
+    return obj
+
+
+class LineFraming:
+    """Newline-delimited JSON; one message per line."""
+
+    name = "line"
+    supports_attachments = False
+
+    def read(self, stream: BinaryIO) -> Optional[Frame]:
+        """Read the next message, or None at end of stream."""
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if line:
+                return line, []
+
+    async def read_async(self, stream: asyncio.StreamReader) -> Optional[Frame]:
+        """Read the next message from an asyncio stream, or None at end of stream."""
+        while True:
+            line = await stream.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if line:
+                return line, []
+
+    def frame(self, body: bytes, attachments: List[bytes]) -> bytes:
+        """Wrap an encoded JSON body for the wire."""
+        return body + b"\n"
+
+
+class ContentLengthFraming:
+    """Header-delimited frames with optional raw binary attachments."""
+
+    name = "content-length"
+    supports_attachments = True
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE):
+        """
+        Args:
+            max_message_size: Largest frame accepted, in bytes (body plus
+                              attachments); larger ones raise ValueError
+        """
+        self.max_message_size = max_message_size
+
+    def read(self, stream: BinaryIO) -> Optional[Frame]:
+        """Read the next message, or None at end of stream."""
+        headers = {}
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                if headers:
+                    break
+                continue
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+
+        body_length, attachment_lengths = self._lengths(headers)
+        body = self._read_exact(stream, body_length)
+        return body, [self._read_exact(stream, length) for length in attachment_lengths]
+
+    async def read_async(self, stream: asyncio.StreamReader) -> Optional[Frame]:
+        """Read the next message from an asyncio stream, or None at end of stream."""
+        headers = {}
+        while True:
+            line = await stream.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                if headers:
+                    break
+                continue
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+
+        body_length, attachment_lengths = self._lengths(headers)
+        try:
+            body = await stream.readexactly(body_length)
+            attachments = [await stream.readexactly(length) for length in attachment_lengths]
+        except asyncio.IncompleteReadError:
+            raise EOFError("Stream closed in the middle of a frame") from None
+        return body, attachments
+
+    def frame(self, body: bytes, attachments: List[bytes]) -> bytes:
+        """Wrap an encoded JSON body and its attachments for the wire."""
+        header = b"Content-Length: %d\r\n" % len(body)
+        if attachments:
+            lengths = b",".join(b"%d" % len(attachment) for attachment in attachments)
+            header += b"Attachment-Lengths: " + lengths + b"\r\n"
+        return b"".join([header, b"\r\n", body, *attachments])
+
+    def _lengths(self, headers: dict) -> Tuple[int, List[int]]:
+        """Parse and bounds-check the body and attachment lengths from a header block."""
+        if b"content-length" not in headers:
+            raise ValueError("Frame is missing the Content-Length header")
+        body_length = self._parse_length(b"Content-Length", headers[b"content-length"])
+        attachment_lengths = [
+            self._parse_length(b"Attachment-Lengths", length)
+            for length in headers.get(b"attachment-lengths", b"").split(b",")
+            if length.strip()
+        ]
+        total = body_length + sum(attachment_lengths)
+        if total > self.max_message_size:
+            raise ValueError(
+                f"Frame of {total} bytes exceeds the maximum message size of {self.max_message_size} bytes"
+            )
+        return body_length, attachment_lengths
+
+    @staticmethod
+    def _parse_length(header: bytes, value: bytes) -> int:
+        """Parse one non-negative length from a header value."""
+        try:
+            length = int(value)
+        except ValueError:
+            raise ValueError(f"Invalid {header.decode()} value: {value!r}") from None
+        if length < 0:
+            raise ValueError(f"Invalid {header.decode()} value: {length} is negative")
+        return length
+
+    @staticmethod
+    def _read_exact(stream: BinaryIO, length: int) -> bytes:
+        """Read exactly length bytes, failing if the stream ends first."""
+        chunks = []
+        remaining = length
+        while remaining:
+            chunk = stream.read(remaining)
+            if not chunk:
+                raise EOFError("Stream closed in the middle of a frame")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+Framing = Union[LineFraming, ContentLengthFraming]
+
+_FRAMINGS = {
+    "line": LineFraming,
+    "content-length": ContentLengthFraming,
+}
+
+
+def get_framing(framing: Union[str, Framing], max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> Framing:
+    """
+    Resolve a framing.
+
+    Args:
+        framing: A framing instance or name ("line", "content-length")
+        max_message_size: Frame size limit for a content-length framing
+                          created by name
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if not isinstance(framing, str):
+        return framing
+    if framing not in _FRAMINGS:
+        raise ValueError(f"Unknown framing: {framing} (choose from {', '.join(_FRAMINGS)})")
+    if framing == ContentLengthFraming.name:
+        return ContentLengthFraming(max_message_size)
+    return _FRAMINGS[framing]()
+
+
+def detect_framing(stream: BinaryIO, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> Framing:
+    """
+    Pick the framing from the first bytes a client sends, without consuming them.
+
+    A message starting with ``{`` or ``[`` is newline-delimited JSON;
+    anything else is a header block, read with ``max_message_size`` as its
+    frame size limit. Streams that cannot peek (e.g. unbuffered pipes) fall
+    back to line framing.
+    """
+    peek = getattr(stream, "peek", None)
+    if peek is None:
+        return LineFraming()
+
+    while True:
+        head = peek(64)
+        if not head:
+            return LineFraming()
+        stripped = head.lstrip()
+        if stripped:
+            break
+        # Discard leading blank lines so the next peek sees the message
+        stream.read(len(head))
+
+    if stripped[:1] in (b"{", b"["):
+        return LineFraming()
+    return ContentLengthFraming(max_message_size)
+
+
+def encode_message(codec: JsonCodec, framing: Framing, payload: Any) -> bytes:
+    """Encode a message payload as one wire frame."""
+    attachments: List[bytes] = []
+    if framing.supports_attachments:
+        payload = extract_attachments(payload, attachments)
+    return framing.frame(codec.encode(payload), attachments)
+
+
+def decode_message(codec: JsonCodec, body: bytes, attachments: List[bytes]) -> Any:
+    """Decode a frame's JSON body, restoring its attachments."""
+    payload = codec.decode(body)
+    if attachments:
+        payload = inject_attachments(payload, attachments)
+    return payload
+
+
+__all__ = [
+    "DEFAULT_MAX_MESSAGE_SIZE",
+    "LineFraming",
+    "ContentLengthFraming",
+    "get_framing",
+    "detect_framing",
+    "encode_message",
+    "decode_message",
+    "extract_attachments",
+    "inject_attachments",
+]
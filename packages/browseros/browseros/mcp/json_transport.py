@@ -12,19 +12,39 @@ Usage:
     server = MCPJsonRpcServer()
     server.add_tool("browser", browser_tool_handler)
     server.run()  # Reads from stdin, writes to stdout
+    server.run(concurrent=True)  # Dispatches requests to a worker pool
 
     # Client-side
     client = MCPJsonRpcClient()
     response = client.call_tool("browser", {"url": "https://example.com"})
 """
 
-import json
+import asyncio
+import concurrent.futures
+import inspect
 import sys
+import threading
+import time
 import uuid
-from typing import Any, Callable, Dict, List, Optional
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from .codec import JsonCodec, get_codec
+from .metrics import ServerMetrics
+from .result_cache import ToolResultCache, cache_key
+from .schema import ArgumentValidator
+from .framing import (
+    DEFAULT_MAX_MESSAGE_SIZE,
+    Framing,
+    LineFraming,
+    decode_message,
+    detect_framing,
+    extract_attachments,
+    get_framing,
+)
+
 
 class JsonRpcErrorCode(Enum):
     """Standard JSON-RPC 2.0 error codes."""
@@ -39,15 +59,30 @@ class JsonRpcErrorCode(Enum):
     TOOL_EXECUTION_ERROR = -32001
     TOOL_TIMEOUT = -32002
     PERMISSION_DENIED = -32003
+    # Raised by clients when a request other than tools/call outlives its timeout
+    REQUEST_TIMEOUT = -32004
+
+    # Sent in reply to a request the client cancelled with $/cancelRequest
+    REQUEST_CANCELLED = -32800
+
+
+class JsonRpcException(Exception):
+    """Raised while handling a request to produce a specific JSON-RPC error."""
 
+    def __init__(self, code: JsonRpcErrorCode, message: str, data: Optional[Any] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
 
-@dataclass
+
+@dataclass(slots=True)
 class JsonRpcRequest:
     """JSON-RPC 2.0 request object."""
     jsonrpc: str = "2.0"
     method: str = ""
     params: Optional[Dict[str, Any]] = None
-    id: Optional[str] = None
+    id: Optional[Union[str, int]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -69,7 +104,7 @@ class JsonRpcRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonRpcError:
     """JSON-RPC 2.0 error object."""
     code: int
@@ -84,13 +119,13 @@ class JsonRpcError:
         return error
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonRpcResponse:
     """JSON-RPC 2.0 response object."""
     jsonrpc: str = "2.0"
     result: Optional[Any] = None
     error: Optional[JsonRpcError] = None
-    id: Optional[str] = None
+    id: Optional[Union[str, int]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -121,6 +156,46 @@ class JsonRpcResponse:
         )
 
 
+# Shape of an incoming line, for codecs that decode straight into dataclasses
+_REQUEST_TYPE = Union[JsonRpcRequest, List[JsonRpcRequest]]
+
+# Notification a client sends to abandon an in-flight request
+CANCEL_METHOD = "$/cancelRequest"
+_CANCEL_MARKER = CANCEL_METHOD.encode()
+
+# Methods recorded under their own name in metrics; anything else is
+# recorded as "other" so unknown method names cannot grow the label set.
+_METRIC_METHODS = {"tools/list", "tools/call", "ping", "server/metrics", CANCEL_METHOD}
+
+
+@dataclass(slots=True)
+class ToolSpec:
+    """Metadata a tool was registered with (see :meth:`MCPJsonRpcServer.add_tool`)."""
+    description: Optional[str] = None
+    input_schema: Optional[Dict[str, Any]] = None
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    idempotent: bool = False
+    cache_ttl: Optional[float] = None
+    # Compiled from input_schema by add_tool
+    validator: Optional[ArgumentValidator] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self, name: str) -> Dict[str, Any]:
+        """Describe the tool for tools/list."""
+        data: Dict[str, Any] = {"name": name, "available": True}
+        if self.description is not None:
+            data["description"] = self.description
+        if self.input_schema is not None:
+            data["inputSchema"] = self.input_schema
+        if self.timeout is not None:
+            data["timeout"] = self.timeout
+        if self.max_concurrency is not None:
+            data["maxConcurrency"] = self.max_concurrency
+        if self.idempotent:
+            data["idempotent"] = True
+        return data
+
+
 class MCPJsonRpcServer:
     """
     MCP Server with JSON-RPC 2.0 transport over stdio.
@@ -129,102 +204,442 @@ class MCPJsonRpcServer:
     Reads requests from stdin and writes responses to stdout.
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(
+        self,
+        debug: bool = False,
+        max_concurrency: int = 16,
+        codec: Optional[Union[str, JsonCodec]] = None,
+        max_frame_size: int = 1024 * 1024,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+        metrics: Optional[ServerMetrics] = None,
+        result_cache: Optional[ToolResultCache] = None,
+    ):
         """
         Initialize the JSON-RPC server.
 
         Args:
             debug: Enable debug logging to stderr
+            max_concurrency: Maximum number of requests executed at once
+                             in concurrent mode (see :meth:`serve`)
+            codec: JSON codec or backend name ("msgspec", "orjson", "json");
+                   defaults to the fastest installed backend
+            max_frame_size: Largest str/bytes chunk sent in one progress
+                            notification when streaming tool results
+            max_message_size: Largest content-length frame accepted from the
+                              client; a larger one ends the session with a
+                              parse error
+            metrics: Metrics registry to record into (a new one by default);
+                     exposed through the ``server/metrics`` method
+            result_cache: Cache for the results of tools registered with
+                          ``idempotent=True`` (no caching by default)
         """
         self.tools: Dict[str, Callable] = {}
+        self.tool_specs: Dict[str, ToolSpec] = {}
         self.debug = debug
+        self.max_concurrency = max_concurrency
+        self.codec = get_codec(codec)
+        self.max_frame_size = max_frame_size
+        self.max_message_size = max_message_size
+        self.metrics = metrics or ServerMetrics()
+        self.result_cache = result_cache
+        if result_cache is not None:
+            self.metrics.add_source("result_cache", result_cache.stats, counters=result_cache.COUNTER_STATS)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._output: Optional[BinaryIO] = None
+        self._framing: Framing = LineFraming()
+        self._write_lock = threading.Lock()
+
+        # Per-tool concurrency limits: threading semaphores for the sync
+        # path, asyncio semaphores (bound to the serving loop) for the async one
+        self._sync_tool_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._tool_slots: Dict[str, asyncio.Semaphore] = {}
+        self._tool_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Dict[Any, asyncio.Task] = {}
 
     def _log(self, message: str) -> None:
         """Log debug message to stderr."""
         if self.debug:
             print(f"[MCP JSON-RPC] {message}", file=sys.stderr)
 
-    def add_tool(self, name: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+    def add_tool(
+        self,
+        name: str,
+        handler: Callable[[Dict[str, Any]], Any],
+        description: Optional[str] = None,
+        input_schema: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        idempotent: bool = False,
+        cache_ttl: Optional[float] = None,
+    ) -> None:
         """
         Register a tool with the server.
 
         Args:
             name: Tool name (e.g., "browser", "filesystem")
             handler: Function that handles tool execution
-                     Takes params dict, returns result or raises exception
+                     Takes params dict, returns result or raises exception.
+                     May be an ``async def`` coroutine function, or a
+                     (sync or async) generator that yields the result in
+                     chunks (see :meth:`_stream_result`).
+            description: Human-readable description, listed by tools/list
+            input_schema: JSON Schema for the arguments; calls that do not
+                          match are rejected with INVALID_PARAMS before the
+                          handler runs
+            timeout: Seconds a call may run before it fails with TOOL_TIMEOUT
+            max_concurrency: Maximum number of calls to this tool executing at
+                             once; further calls wait for a free slot
+            idempotent: The tool has no side effects and returns the same
+                        result for the same arguments, so its results may be
+                        served from the server's ``result_cache``
+            cache_ttl: Seconds a cached result stays valid (defaults to the
+                       cache's ttl)
+
+        Raises:
+            ValueError: If max_concurrency is less than 1, or input_schema is
+                        not a valid JSON Schema
         """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        validator = ArgumentValidator(input_schema) if input_schema is not None else None
+
         self.tools[name] = handler
+        self.tool_specs[name] = ToolSpec(
+            description=description,
+            input_schema=input_schema,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            idempotent=idempotent,
+            cache_ttl=cache_ttl,
+            validator=validator,
+        )
+        if self.result_cache is not None:
+            self.result_cache.invalidate(name)
+        self._tool_slots.pop(name, None)
+        if max_concurrency is None:
+            self._sync_tool_slots.pop(name, None)
+        else:
+            self._sync_tool_slots[name] = threading.BoundedSemaphore(max_concurrency)
         self._log(f"Registered tool: {name}")
 
-    def handle_request(self, request_line: str) -> Optional[str]:
+    def handle_request(self, request_line: Union[str, bytes]) -> Optional[str]:
         """
-        Handle a single JSON-RPC request.
+        Handle a single JSON-RPC request or batch.
+
+        Batch members are executed in order; use :meth:`handle_request_async`
+        to execute them concurrently.
+
+        Args:
+            request_line: JSON-encoded request (or array of requests)
+
+        Returns:
+            JSON-encoded response string, or None for notifications
+        """
+        response = self._encode(self._respond(request_line))
+        if response is None:
+            return None
+        self.metrics.add_bytes_out(len(response))
+        return response.decode()
+
+    async def handle_request_async(self, request_line: Union[str, bytes]) -> Optional[str]:
+        """
+        Handle a single JSON-RPC request or batch without blocking the event loop.
+
+        Async tool handlers are awaited directly; sync handlers run on the
+        server's thread pool. Batch members are executed concurrently.
 
         Args:
-            request_line: JSON-encoded request string
+            request_line: JSON-encoded request (or array of requests)
 
         Returns:
             JSON-encoded response string, or None for notifications
         """
+        response = self._encode(await self._respond_async(request_line))
+        if response is None:
+            return None
+        self.metrics.add_bytes_out(len(response))
+        return response.decode()
+
+    def _respond(self, request_line: Union[str, bytes], attachments: Optional[List[bytes]] = None) -> Optional[Any]:
+        """Handle a request message and return the response payload, if any."""
+        payload, error = self._decode(request_line, attachments)
+        if error is not None:
+            return error
+
+        if isinstance(payload, list):
+            if not payload:
+                return self._empty_batch_response()
+            responses = [self._handle_message(message) for message in payload]
+            return self._collect_batch(responses)
+
+        return self._handle_message(payload)
+
+    async def _respond_async(
+        self,
+        request_line: Union[str, bytes],
+        attachments: Optional[List[bytes]] = None,
+    ) -> Optional[Any]:
+        """Handle a request message on the event loop and return the response payload, if any."""
+        payload, error = self._decode(request_line, attachments)
+        if error is not None:
+            return error
+
+        if isinstance(payload, list):
+            if not payload:
+                return self._empty_batch_response()
+            responses = await asyncio.gather(
+                *(self._handle_message_async(message) for message in payload)
+            )
+            return self._collect_batch(responses)
+
+        return await self._handle_message_async(payload)
+
+    def _handle_message(self, message: Any) -> Optional[Dict[str, Any]]:
+        """Execute one request object and return its response object."""
+        request, error = self._parse_request(message)
+        if request is None:
+            return error
+
+        method, tool = self._metric_labels(request)
+        self.metrics.request_started(method, tool)
+        started = time.perf_counter()
+        failure = None
+        try:
+            result = self._dispatch(request)
+        except Exception as e:
+            failure = self._error_code(e).name
+            return self._exception_response(request, e)
+        finally:
+            self.metrics.request_finished(method, tool, time.perf_counter() - started, failure)
+
+        return self._result_response(request, result)
+
+    async def _handle_message_async(self, message: Any) -> Optional[Dict[str, Any]]:
+        """Execute one request object on the event loop and return its response object."""
+        request, error = self._parse_request(message)
+        if request is None:
+            return error
+
+        method, tool = self._metric_labels(request)
+        self.metrics.request_started(method, tool)
+        started = time.perf_counter()
+        failure = None
         try:
-            # Parse request
-            request_data = json.loads(request_line)
-            request = JsonRpcRequest.from_dict(request_data)
-
-            self._log(f"Received request: {request.method} (id={request.id})")
-
-            # Handle MCP methods
-            if request.method == "tools/list":
-                result = self._handle_list_tools()
-            elif request.method == "tools/call":
-                result = self._handle_call_tool(request.params or {})
-            elif request.method == "ping":
-                result = {"status": "ok"}
+            if request.method == "tools/call" and request.id is not None:
+                result = await self._dispatch_cancellable(request)
             else:
-                # Unknown method
-                return self._error_response(
-                    request.id,
-                    JsonRpcErrorCode.METHOD_NOT_FOUND.value,
-                    f"Method not found: {request.method}"
-                )
-
-            # Create success response
-            response = JsonRpcResponse(result=result, id=request.id)
-            return json.dumps(response.to_dict())
+                result = await self._dispatch_async(request)
+        except Exception as e:
+            failure = self._error_code(e).name
+            return self._exception_response(request, e)
+        finally:
+            self.metrics.request_finished(method, tool, time.perf_counter() - started, failure)
+
+        return self._result_response(request, result)
+
+    def _metric_labels(self, request: JsonRpcRequest) -> Tuple[str, Optional[str]]:
+        """(method, tool) labels to record a request under."""
+        method = request.method if request.method in _METRIC_METHODS else "other"
+        tool = None
+        if method == "tools/call" and isinstance(request.params, dict):
+            name = request.params.get("name")
+            if name in self.tools:
+                tool = name
+        return method, tool
+
+    async def _dispatch_cancellable(self, request: JsonRpcRequest) -> Any:
+        """Run a request as its own task so $/cancelRequest can cancel it."""
+        if request.id in self._in_flight:
+            # A second registration would make a cancel hit the wrong call
+            raise JsonRpcException(
+                JsonRpcErrorCode.INVALID_REQUEST,
+                f"Invalid request: id {request.id!r} is already in flight"
+            )
+        task = asyncio.ensure_future(self._dispatch_async(request))
+        self._in_flight[request.id] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # _cancel_request unregisters the task before cancelling it; if
+            # it is still registered, the cancellation came from outside.
+            if self._in_flight.get(request.id) is task:
+                raise
+            self._log(f"Request cancelled: {request.id}")
+            raise JsonRpcException(
+                JsonRpcErrorCode.REQUEST_CANCELLED,
+                f"Request {request.id} was cancelled"
+            ) from None
+        finally:
+            if self._in_flight.get(request.id) is task:
+                del self._in_flight[request.id]
+
+    def _decode(
+        self,
+        request_line: Union[str, bytes],
+        attachments: Optional[List[bytes]] = None,
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Decode a request message.
 
-        except json.JSONDecodeError as e:
-            # Parse error
-            return self._error_response(
+        Returns:
+            (payload, None) on success, or (None, error response) on failure.
+            The payload is a JsonRpcRequest (or list of them) when the codec
+            decodes straight into dataclasses, otherwise plain JSON values.
+        """
+        self.metrics.add_bytes_in(len(request_line) + sum(len(attachment) for attachment in attachments or ()))
+        try:
+            if attachments:
+                return decode_message(self.codec, request_line, attachments), None
+            return self.codec.decode_typed(request_line, _REQUEST_TYPE), None
+        except (ValueError, IndexError) as e:
+            self.metrics.record_error(JsonRpcErrorCode.PARSE_ERROR.name)
+            return None, self._error_response(
                 None,
                 JsonRpcErrorCode.PARSE_ERROR.value,
                 f"Parse error: {str(e)}"
             )
-        except KeyError as e:
-            # Invalid request (missing required field)
-            return self._error_response(
+
+    def _encode(self, payload: Optional[Any]) -> Optional[bytes]:
+        """Encode a response object or batch, passing None through."""
+        if payload is None:
+            return None
+
+        try:
+            return self.codec.encode(payload)
+        except (TypeError, ValueError, OverflowError) as e:
+            # A tool returned something the codec cannot serialize; report
+            # it per response so the rest of a batch still gets through.
+            if isinstance(payload, list):
+                return b"[" + b",".join(self._encode(item) or b"null" for item in payload) + b"]"
+            return self.codec.encode(self._error_response(
+                payload.get("id"),
+                JsonRpcErrorCode.INTERNAL_ERROR.value,
+                f"Internal error: {str(e)}"
+            ))
+
+    def _encode_frame(self, payload: Any) -> bytes:
+        """Encode a message for the wire in the session's framing."""
+        attachments: List[bytes] = []
+        if self._framing.supports_attachments:
+            payload = extract_attachments(payload, attachments)
+        return self._framing.frame(self._encode(payload) or b"", attachments)
+
+    def _parse_request(self, message: Any) -> Tuple[Optional[JsonRpcRequest], Optional[Dict[str, Any]]]:
+        """
+        Validate a decoded request object.
+
+        Returns:
+            (request, None) on success, or (None, error response) on failure
+        """
+        request, error = self._validate_request(message)
+        if request is None:
+            self.metrics.record_error(JsonRpcErrorCode.INVALID_REQUEST.name)
+        return request, error
+
+    def _validate_request(self, message: Any) -> Tuple[Optional[JsonRpcRequest], Optional[Dict[str, Any]]]:
+        """Build a JsonRpcRequest from a decoded message, or an INVALID_REQUEST response."""
+        if isinstance(message, JsonRpcRequest):
+            request = message
+        elif isinstance(message, dict):
+            try:
+                request = JsonRpcRequest.from_dict(message)
+            except KeyError as e:
+                return None, self._error_response(
+                    None,
+                    JsonRpcErrorCode.INVALID_REQUEST.value,
+                    f"Invalid request: missing {str(e)}"
+                )
+        else:
+            return None, self._error_response(
                 None,
                 JsonRpcErrorCode.INVALID_REQUEST.value,
-                f"Invalid request: missing {str(e)}"
+                "Invalid request: expected a JSON object"
             )
-        except Exception as e:
-            # Internal error
-            return self._error_response(
+
+        if not request.method:
+            return None, self._error_response(
                 None,
-                JsonRpcErrorCode.INTERNAL_ERROR.value,
-                f"Internal error: {str(e)}"
+                JsonRpcErrorCode.INVALID_REQUEST.value,
+                "Invalid request: missing 'method'"
             )
 
+        self._log(f"Received request: {request.method} (id={request.id})")
+        return request, None
+
+    def _empty_batch_response(self) -> Dict[str, Any]:
+        """Error returned for an empty batch array."""
+        return self._error_response(
+            None,
+            JsonRpcErrorCode.INVALID_REQUEST.value,
+            "Invalid request: empty batch"
+        )
+
+    def _collect_batch(self, responses: List[Optional[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """Drop notification slots; a batch of only notifications gets no response."""
+        collected = [response for response in responses if response is not None]
+        return collected or None
+
+    def _dispatch(self, request: JsonRpcRequest) -> Any:
+        """Execute a request synchronously and return its result."""
+        if request.method == "tools/list":
+            return self._handle_list_tools()
+        if request.method == "tools/call":
+            return self._handle_call_tool(request.params or {})
+        if request.method == "ping":
+            return {"status": "ok"}
+        if request.method == CANCEL_METHOD:
+            return self._cancel_request(request.params or {})
+        if request.method == "server/metrics":
+            return self._handle_metrics(request.params or {})
+
+        raise JsonRpcException(
+            JsonRpcErrorCode.METHOD_NOT_FOUND,
+            f"Method not found: {request.method}"
+        )
+
+    async def _dispatch_async(self, request: JsonRpcRequest) -> Any:
+        """Execute a request on the running event loop and return its result."""
+        if request.method == "tools/call":
+            return await self._handle_call_tool_async(request.params or {})
+        return self._dispatch(request)
+
+    def _cancel_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle $/cancelRequest: cancel the in-flight tools/call with ``params.id``.
+
+        The cancelled call is answered with REQUEST_CANCELLED. Async handlers
+        are interrupted at their next await; a sync handler already running
+        on a worker thread runs to completion, but its result is dropped and
+        no further chunks of a generator are pulled.
+        """
+        task = self._in_flight.pop(params.get("id"), None)
+        if task is None:
+            return {"cancelled": False}
+        task.get_loop().call_soon_threadsafe(task.cancel)
+        return {"cancelled": True}
+
+    def _handle_metrics(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle server/metrics method.
+
+        Returns the metrics snapshot, or with ``{"format": "prometheus"}``
+        the Prometheus text dump as ``{"format": "prometheus", "text": ...}``.
+        """
+        if params.get("format") == "prometheus":
+            return {"format": "prometheus", "text": self.metrics.to_prometheus()}
+        return self.metrics.snapshot()
+
     def _handle_list_tools(self) -> Dict[str, Any]:
         """Handle tools/list method."""
         return {
             "tools": [
-                {"name": name, "available": True}
+                self.tool_specs[name].to_dict(name)
                 for name in self.tools.keys()
             ]
         }
 
-    def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle tools/call method."""
+    def _resolve_tool(self, params: Dict[str, Any]) -> Tuple[str, Callable, Dict[str, Any]]:
+        """Look up the tool named in tools/call params."""
         tool_name = params.get("name")
         tool_params = params.get("arguments", {})
 
@@ -234,44 +649,599 @@ class MCPJsonRpcServer:
         if tool_name not in self.tools:
             raise ValueError(f"Tool not found: {tool_name}")
 
+        spec = self.tool_specs[tool_name]
+        if spec.validator is not None:
+            errors = spec.validator.validate(tool_params)
+            if errors:
+                raise JsonRpcException(
+                    JsonRpcErrorCode.INVALID_PARAMS,
+                    f"Invalid arguments for tool '{tool_name}': {errors[0]}",
+                    {"errors": errors}
+                )
+
+        return tool_name, self.tools[tool_name], tool_params
+
+    def _tool_timeout_error(self, tool_name: str) -> JsonRpcException:
+        """Error reported when a tool call outlives its timeout."""
+        timeout = self.tool_specs[tool_name].timeout
+        self._log(f"Tool timed out: {tool_name} ({timeout}s)")
+        return JsonRpcException(
+            JsonRpcErrorCode.TOOL_TIMEOUT,
+            f"Tool '{tool_name}' timed out after {timeout}s"
+        )
+
+    def _cache_key(self, tool_name: str, params: Dict[str, Any], tool_params: Any) -> Optional[str]:
+        """Result cache key for a call, or None if the call must not be cached."""
+        if self.result_cache is None or not self.tool_specs[tool_name].idempotent:
+            return None
+        if (params.get("_meta") or {}).get("progressToken") is not None:
+            # A streamed call must run itself to deliver its chunks
+            return None
+        try:
+            return cache_key(tool_name, tool_params)
+        except (TypeError, ValueError):
+            return None
+
+    def _cached_size(self, result: Any) -> Optional[int]:
+        """Encoded size of a tool result, or None if it must not be cached."""
+        if result.get("streamed"):
+            # The content already went out as progress notifications
+            return None
+        try:
+            return len(self.codec.encode(result))
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/call method, serving idempotent tools from the result cache."""
+        tool_name, handler, tool_params = self._resolve_tool(params)
+        key = self._cache_key(tool_name, params, tool_params)
+        if key is None:
+            return self._call_tool(tool_name, handler, params, tool_params)
+
+        return self.result_cache.get_or_compute(
+            key,
+            tool_name,
+            lambda: self._call_tool(tool_name, handler, params, tool_params),
+            ttl=self.tool_specs[tool_name].cache_ttl,
+            sizeof=self._cached_size,
+        )
+
+    def _call_tool(
+        self,
+        tool_name: str,
+        handler: Callable,
+        params: Dict[str, Any],
+        tool_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Execute a tool call, applying the tool's concurrency limit and timeout."""
+        timeout = self.tool_specs[tool_name].timeout
+        slots = self._sync_tool_slots.get(tool_name)
+
+        if slots is not None:
+            slots.acquire()
+        if timeout is None:
+            try:
+                return self._execute_tool(tool_name, handler, params, tool_params)
+            finally:
+                if slots is not None:
+                    slots.release()
+
+        # A thread cannot be interrupted, so a timed-out call keeps its
+        # daemon thread (and its concurrency slot) until the handler returns.
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def execute() -> None:
+            try:
+                future.set_result(self._execute_tool(tool_name, handler, params, tool_params))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                if slots is not None:
+                    slots.release()
+
+        threading.Thread(target=execute, name=f"mcp-tool-{tool_name}", daemon=True).start()
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise
+            raise self._tool_timeout_error(tool_name) from None
+
+    def _execute_tool(
+        self,
+        tool_name: str,
+        handler: Callable,
+        params: Dict[str, Any],
+        tool_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run a tool handler to completion on the calling thread."""
         try:
             self._log(f"Executing tool: {tool_name}")
-            result = self.tools[tool_name](tool_params)
+            result = handler(tool_params)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            if inspect.isasyncgen(result):
+                return self._stream_result(tool_name, params, self._iter_async_chunks(result))
+            if inspect.isgenerator(result):
+                return self._stream_result(tool_name, params, result)
             return {"result": result, "tool": tool_name}
         except Exception as e:
             self._log(f"Tool execution error: {str(e)}")
             raise
 
-    def _error_response(self, request_id: Optional[str], code: int, message: str) -> str:
-        """Create a JSON-RPC error response."""
-        error = JsonRpcError(code=code, message=message)
-        response = JsonRpcResponse(error=error, id=request_id)
-        return json.dumps(response.to_dict())
+    async def _handle_call_tool_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tools/call method, serving idempotent tools from the result cache."""
+        tool_name, handler, tool_params = self._resolve_tool(params)
+        key = self._cache_key(tool_name, params, tool_params)
+        if key is None:
+            return await self._call_tool_async(tool_name, handler, params, tool_params)
+
+        return await self.result_cache.get_or_compute_async(
+            key,
+            tool_name,
+            lambda: self._call_tool_async(tool_name, handler, params, tool_params),
+            ttl=self.tool_specs[tool_name].cache_ttl,
+            sizeof=self._cached_size,
+        )
+
+    async def _call_tool_async(
+        self,
+        tool_name: str,
+        handler: Callable,
+        params: Dict[str, Any],
+        tool_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Execute a tool call on the event loop, applying the tool's concurrency limit and timeout."""
+        timeout = self.tool_specs[tool_name].timeout
+        slot = await self._acquire_tool_slot(tool_name)
+
+        try:
+            execution = self._execute_tool_async(tool_name, handler, params, tool_params, slot)
+            if timeout is None:
+                return await execution
+            try:
+                return await asyncio.wait_for(execution, timeout)
+            except TimeoutError:
+                raise self._tool_timeout_error(tool_name) from None
+        finally:
+            if slot is not None:
+                slot.release()
+
+    async def _acquire_tool_slot(self, tool_name: str) -> Optional["_ToolSlot"]:
+        """Wait for a free slot under the tool's concurrency limit, if it has one."""
+        limit = self.tool_specs[tool_name].max_concurrency
+        if limit is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._tool_slots_loop is not loop:
+            # asyncio semaphores belong to one event loop
+            self._tool_slots = {}
+            self._tool_slots_loop = loop
+        semaphore = self._tool_slots.get(tool_name)
+        if semaphore is None:
+            semaphore = self._tool_slots[tool_name] = asyncio.Semaphore(limit)
+
+        await semaphore.acquire()
+        return _ToolSlot(semaphore)
+
+    async def _execute_tool_async(
+        self,
+        tool_name: str,
+        handler: Callable,
+        params: Dict[str, Any],
+        tool_params: Dict[str, Any],
+        slot: Optional["_ToolSlot"] = None,
+    ) -> Dict[str, Any]:
+        """Run a tool handler, offloading sync handlers to the thread pool."""
+        try:
+            self._log(f"Executing tool: {tool_name}")
+            if inspect.isasyncgenfunction(handler):
+                result = handler(tool_params)
+            elif inspect.iscoroutinefunction(handler):
+                result = await handler(tool_params)
+            else:
+                result = await self._run_in_worker(slot, handler, tool_params)
+                if inspect.isawaitable(result):
+                    result = await result
+
+            if inspect.isasyncgen(result):
+                stream = _ResultStream(self, tool_name, params)
+                async for chunk in result:
+                    stream.add(chunk)
+                return stream.result()
+            if inspect.isgenerator(result):
+                # Each step of a sync generator may block, so pull chunks on
+                # the thread pool and emit them from the event loop.
+                stream = _ResultStream(self, tool_name, params)
+                while True:
+                    chunk = await self._run_in_worker(slot, next, result, _END_OF_STREAM)
+                    if chunk is _END_OF_STREAM:
+                        break
+                    stream.add(chunk)
+                return stream.result()
+            return {"result": result, "tool": tool_name}
+        except Exception as e:
+            self._log(f"Tool execution error: {str(e)}")
+            raise
+
+    def _run_in_worker(self, slot: Optional["_ToolSlot"], func: Callable, *args: Any) -> asyncio.Future:
+        """Run a blocking call on the thread pool, holding the tool slot until it returns."""
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        if slot is not None:
+            slot.hold_until(future)
+        return future
 
-    def run(self) -> None:
+    def _stream_result(self, tool_name: str, params: Dict[str, Any], chunks: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Deliver a chunked tool result.
+
+        If the request carries ``_meta.progressToken`` and the server is
+        attached to an output stream, each chunk is sent immediately as a
+        ``notifications/progress`` message and the final response only
+        reports the chunk count. Otherwise the chunks are joined into one
+        result (see :class:`_ResultStream`).
+        """
+        stream = _ResultStream(self, tool_name, params)
+        for chunk in chunks:
+            stream.add(chunk)
+        return stream.result()
+
+    def _iter_async_chunks(self, chunks: Any) -> Iterator[Any]:
+        """
+        Iterate an async generator from sync code, one chunk at a time.
+
+        Each chunk is pulled on a private event loop and handed on before
+        the next is requested, so the sync path streams async generators
+        without buffering them.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(chunks.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(chunks.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def send_notification(self, method: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write a notification to the client while the server is running.
+
+        Safe to call from tool handlers, including ones on worker threads.
+
+        Returns:
+            True if the notification was written, False if the server is not
+            attached to an output stream (e.g. direct handle_request calls)
+        """
+        if self._output is None:
+            return False
+        self._send(JsonRpcRequest(method=method, params=params).to_dict())
+        return True
+
+    def _send(self, payload: Any) -> None:
+        """Encode a message and write it to the attached output stream."""
+        frame = self._encode_frame(payload)
+        with self._write_lock:
+            output = self._output
+            if output is None:
+                return
+            output.write(frame)
+            output.flush()
+        self.metrics.add_bytes_out(len(frame))
+
+    def _result_response(self, request: JsonRpcRequest, result: Any) -> Optional[Dict[str, Any]]:
+        """Create a JSON-RPC success response (None for notifications)."""
+        if request.id is None:
+            return None
+        return JsonRpcResponse(result=result, id=request.id).to_dict()
+
+    @staticmethod
+    def _error_code(error: Exception) -> JsonRpcErrorCode:
+        """Error code an exception raised while executing a request is reported with."""
+        if isinstance(error, JsonRpcException):
+            return error.code
+        return JsonRpcErrorCode.INTERNAL_ERROR
+
+    def _exception_response(self, request: JsonRpcRequest, error: Exception) -> Optional[Dict[str, Any]]:
+        """Map an exception raised while executing a request to an error response."""
+        if request.id is None:
+            return None
+        if isinstance(error, JsonRpcException):
+            return self._error_response(request.id, error.code.value, error.message, error.data)
+        return self._error_response(
+            request.id,
+            JsonRpcErrorCode.INTERNAL_ERROR.value,
+            f"Internal error: {str(error)}"
+        )
+
+    def _error_response(
+        self,
+        request_id: Optional[str],
+        code: int,
+        message: str,
+        data: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Create a JSON-RPC error response."""
+        error = JsonRpcError(code=code, message=message, data=data)
+        return JsonRpcResponse(error=error, id=request_id).to_dict()
+
+    def run(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        framing: Union[str, Framing] = "auto",
+    ) -> None:
         """
         Run the server, reading from stdin and writing to stdout.
 
         This method blocks and processes requests until stdin is closed.
+
+        Args:
+            concurrent: Dispatch requests concurrently via :meth:`serve`.
+                        Responses are then written as each request completes,
+                        so they may arrive out of order (correlate by ``id``).
+            max_concurrency: Worker pool size for concurrent mode
+                             (defaults to the server's ``max_concurrency``)
+            framing: "line", "content-length", or "auto" to follow the
+                     framing of the client's first message
         """
         self._log("MCP JSON-RPC server started")
         self._log(f"Available tools: {', '.join(self.tools.keys())}")
 
+        if concurrent:
+            try:
+                asyncio.run(self.serve(max_concurrency=max_concurrency, framing=framing))
+            except KeyboardInterrupt:
+                self._log("Server stopped by user")
+            return
+
+        input_stream = _binary_stream(sys.stdin)
+        self._attach(input_stream, sys.stdout, framing)
         try:
-            for line in sys.stdin:
-                line = line.strip()
-                if not line:
-                    continue
+            while True:
+                frame = self._read_frame(self._framing.read, input_stream)
+                if frame is None:
+                    break
 
-                response = self.handle_request(line)
+                response = self._respond(*frame)
                 if response:
-                    print(response, flush=True)
+                    self._send(response)
 
         except KeyboardInterrupt:
             self._log("Server stopped by user")
         except Exception as e:
             self._log(f"Server error: {str(e)}")
             raise
+        finally:
+            self._output = None
+            self._framing = LineFraming()
+
+    async def serve(
+        self,
+        input_stream: Optional[Union[BinaryIO, TextIO]] = None,
+        output_stream: Optional[Union[BinaryIO, TextIO]] = None,
+        max_concurrency: Optional[int] = None,
+        framing: Union[str, Framing] = "auto",
+    ) -> None:
+        """
+        Serve requests concurrently until the input stream is closed.
+
+        Each request is dispatched to a bounded worker pool as soon as it is
+        read; its response is written the moment it completes. Reading pauses
+        while all workers are busy, which applies back-pressure to the client.
+
+        Responses are encoded straight to bytes; text streams are unwrapped
+        to their underlying binary buffer.
+
+        Args:
+            input_stream: Stream to read requests from (defaults to stdin)
+            output_stream: Stream to write responses to (defaults to stdout)
+            max_concurrency: Maximum number of requests executing at once
+            framing: "line", "content-length", or "auto" to follow the
+                     framing of the client's first message
+        """
+        input_stream = _binary_stream(input_stream or sys.stdin)
+        limit = max_concurrency or self.max_concurrency
+
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(limit)
+        pending: Set[asyncio.Task] = set()
+
+        # Blocking reads run on their own thread so they never compete
+        # with tool handlers for a worker.
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-stdin")
+        self._executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="mcp-tool")
+
+        async def serve_one(body: bytes, attachments: List[bytes], limited: bool = True) -> None:
+            try:
+                response = await self._respond_async(body, attachments)
+                if response:
+                    self._send(response)
+            except Exception as e:
+                self._log(f"Server error: {str(e)}")
+            finally:
+                if limited:
+                    slots.release()
+
+        try:
+            # Negotiation peeks at stdin, which may block until the client speaks
+            await loop.run_in_executor(reader, self._attach, input_stream, output_stream or sys.stdout, framing)
+
+            while True:
+                frame = await loop.run_in_executor(reader, self._read_frame, self._framing.read, input_stream)
+                if frame is None:
+                    break
+
+                # Cancellations skip the queue so they can reach busy workers
+                limited = not self._is_cancel_notification(*frame)
+                if limited:
+                    await slots.acquire()
+                task = loop.create_task(serve_one(*frame, limited=limited))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            reader.shutdown(wait=False)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._output = None
+            self._framing = LineFraming()
+
+    def _is_cancel_notification(self, body: bytes, attachments: List[bytes]) -> bool:
+        """
+        Whether a frame is a single $/cancelRequest notification.
+
+        Only these may bypass the concurrency limit; a batch or a call that
+        merely mentions the method name still waits for a slot. The byte
+        search keeps the full decode off the path of ordinary requests.
+        """
+        if attachments or _CANCEL_MARKER not in body:
+            return False
+        try:
+            message = self.codec.decode(body)
+        except (ValueError, IndexError):
+            return False
+        return isinstance(message, dict) and message.get("method") == CANCEL_METHOD and message.get("id") is None
+
+    def _attach(
+        self,
+        input_stream: BinaryIO,
+        output_stream: Union[BinaryIO, TextIO],
+        framing: Union[str, Framing],
+    ) -> None:
+        """Attach the output stream and settle the session framing."""
+        self._output = _binary_stream(output_stream)
+        if framing == "auto":
+            self._framing = detect_framing(input_stream, self.max_message_size)
+        else:
+            self._framing = get_framing(framing, self.max_message_size)
+        self._log(f"Using {self._framing.name} framing")
+
+    def _read_frame(self, read: Callable[[BinaryIO], Any], input_stream: BinaryIO) -> Any:
+        """
+        Read the next frame, or None when the session is over.
+
+        A malformed frame header cannot be resynchronized, so it is
+        reported once as a parse error and ends the session.
+        """
+        try:
+            return read(input_stream)
+        except EOFError:
+            return None
+        except ValueError as e:
+            self._send(self._error_response(
+                None,
+                JsonRpcErrorCode.PARSE_ERROR.value,
+                f"Invalid frame: {str(e)}"
+            ))
+            return None
+
+
+class _ToolSlot:
+    """
+    One acquired unit of a tool's concurrency limit.
+
+    Released when the call finishes; but if the call is abandoned (timeout
+    or cancellation) while a worker thread is still running its handler,
+    the slot stays taken until that thread returns, so runaway handlers
+    keep counting against the limit.
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore):
+        self._semaphore = semaphore
+        self._worker: Optional[asyncio.Future] = None
+        self._finished = False
+        self._released = False
+
+    def hold_until(self, worker: asyncio.Future) -> None:
+        """Keep the slot while a worker thread runs, even if the call is abandoned."""
+        self._worker = worker
+        worker.add_done_callback(self._worker_done)
+
+    def release(self) -> None:
+        """Give the slot back once no worker thread is still using it."""
+        self._finished = True
+        if self._worker is None or self._worker.done():
+            self._release()
+
+    def _worker_done(self, worker: asyncio.Future) -> None:
+        if self._finished and worker is self._worker:
+            self._release()
+
+    def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._semaphore.release()
+
+
+# Sentinel returned by next() once a sync result generator is exhausted
+_END_OF_STREAM = object()
+
+
+class _ResultStream:
+    """
+    Accumulates the chunks of a streamed tool result.
+
+    When the request asked for progress (``params._meta.progressToken``) and
+    the server has an output stream, str/bytes chunks are split to at most
+    ``max_frame_size`` and each frame is sent at once as a
+    ``notifications/progress`` message, so nothing is buffered. Otherwise
+    chunks are kept and joined at the end: str and bytes chunks are
+    concatenated, anything else is returned as a list.
+    """
+
+    def __init__(self, server: "MCPJsonRpcServer", tool_name: str, params: Dict[str, Any]):
+        self.server = server
+        self.tool_name = tool_name
+        meta = params.get("_meta") or {}
+        self.token = meta.get("progressToken")
+        self.streaming = self.token is not None and server._output is not None
+        self.frames = 0
+        self.chunks: List[Any] = []
+
+    def add(self, chunk: Any) -> None:
+        if not self.streaming:
+            self.chunks.append(chunk)
+            return
+
+        for frame in self._split(chunk):
+            self.frames += 1
+            self.server.send_notification("notifications/progress", {
+                "progressToken": self.token,
+                "progress": self.frames,
+                "chunk": frame,
+            })
+
+    def _split(self, chunk: Any) -> Iterator[Any]:
+        size = self.server.max_frame_size
+        if isinstance(chunk, (str, bytes)) and len(chunk) > size:
+            for start in range(0, len(chunk), size):
+                yield chunk[start:start + size]
+        else:
+            yield chunk
+
+    def result(self) -> Dict[str, Any]:
+        if self.streaming:
+            return {"result": None, "tool": self.tool_name, "streamed": True, "chunks": self.frames}
+
+        chunks = self.chunks
+        if chunks and all(isinstance(chunk, str) for chunk in chunks):
+            return {"result": "".join(chunks), "tool": self.tool_name}
+        if chunks and all(isinstance(chunk, bytes) for chunk in chunks):
+            return {"result": b"".join(chunks), "tool": self.tool_name}
+        return {"result": chunks, "tool": self.tool_name}
+
+
+def _binary_stream(stream: Union[BinaryIO, TextIO]) -> BinaryIO:
+    """Return the binary buffer beneath a text stream (or the stream itself)."""
+    return getattr(stream, "buffer", stream)
 
 
 class MCPJsonRpcClient:
@@ -339,6 +1309,45 @@ class MCPJsonRpcClient:
         response = self._send_request(request)
         return response.get("status") == "ok"
 
+    def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[JsonRpcResponse]:
+        """
+        Call several tools in a single JSON-RPC batch.
+
+        The server executes batch members concurrently and answers with one
+        array, so N calls cost a single round-trip.
+
+        Args:
+            calls: (tool_name, arguments) pairs
+
+        Returns:
+            One response per call, in call order. Failed calls carry
+            ``error`` instead of raising, so one failure does not hide
+            the other results.
+        """
+        requests = [
+            JsonRpcRequest(
+                method="tools/call",
+                params={"name": tool_name, "arguments": arguments},
+                id=self._next_id()
+            )
+            for tool_name, arguments in calls
+        ]
+        return self.send_batch(requests)
+
+    def send_batch(self, requests: List[JsonRpcRequest]) -> List[JsonRpcResponse]:
+        """
+        Send several requests as one JSON-RPC batch.
+
+        Args:
+            requests: Requests to send; those without an id are notifications
+
+        Returns:
+            One response per non-notification request, in request order
+        """
+        if not requests:
+            return []
+        return _order_batch_responses(requests, self._send_batch(requests))
+
     def _send_request(self, request: JsonRpcRequest) -> Any:
         """
         Send a request and return the result.
@@ -357,13 +1366,66 @@ class MCPJsonRpcClient:
         """
         raise NotImplementedError("Subclasses must implement _send_request")
 
+    def _send_batch(self, requests: List[JsonRpcRequest]) -> List[JsonRpcResponse]:
+        """
+        Send a batch and return the responses in whatever order they arrive.
+
+        This is a template method to be overridden by subclasses
+        with specific transport implementations.
+
+        Args:
+            requests: The requests to send as one array
+
+        Returns:
+            The responses from the server's response array
+        """
+        raise NotImplementedError("Subclasses must implement _send_batch")
+
+
+def _order_batch_responses(
+    requests: List[JsonRpcRequest],
+    responses: List[JsonRpcResponse],
+) -> List[JsonRpcResponse]:
+    """
+    Match batch responses to their requests by id.
+
+    The server may answer batch members in any order. Requests that the
+    server failed to answer get an INTERNAL_ERROR response so callers always
+    receive one entry per request.
+
+    Args:
+        requests: The requests that were sent
+        responses: The responses that came back
+
+    Returns:
+        One response per non-notification request, in request order
+    """
+    by_id = {response.id: response for response in responses}
+    ordered = []
+    for request in requests:
+        if request.id is None:
+            continue
+        response = by_id.get(request.id)
+        if response is None:
+            response = JsonRpcResponse(
+                error=JsonRpcError(
+                    code=JsonRpcErrorCode.INTERNAL_ERROR.value,
+                    message="No response received for batch request"
+                ),
+                id=request.id
+            )
+        ordered.append(response)
+    return ordered
+
 
-def create_stdio_server(debug: bool = False) -> MCPJsonRpcServer:
+def create_stdio_server(debug: bool = False, **options: Any) -> MCPJsonRpcServer:
     """
     Create an MCP JSON-RPC server that communicates via stdio.
 
     Args:
         debug: Enable debug logging
+        **options: Further MCPJsonRpcServer options
+                   (max_concurrency, codec, max_frame_size, max_message_size)
 
     Returns:
         Configured server instance
@@ -373,14 +1435,17 @@ def create_stdio_server(debug: bool = False) -> MCPJsonRpcServer:
         server.add_tool("echo", lambda params: params)
         server.run()
     """
-    return MCPJsonRpcServer(debug=debug)
+    return MCPJsonRpcServer(debug=debug, **options)
 
 
 __all__ = [
     "JsonRpcErrorCode",
+    "JsonRpcException",
     "JsonRpcRequest",
     "JsonRpcError",
     "JsonRpcResponse",
+    "ToolSpec",
+    "CANCEL_METHOD",
     "MCPJsonRpcServer",
     "MCPJsonRpcClient",
     "create_stdio_server",
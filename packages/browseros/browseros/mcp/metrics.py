@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Built-in instrumentation for the MCP JSON-RPC server.
+
+Every request handled by :class:`~browseros.mcp.json_transport.MCPJsonRpcServer`
+is recorded in a :class:`ServerMetrics`: counts per method and per tool,
+errors by ``JsonRpcErrorCode``, in-flight gauges, bytes in/out and latency
+histograms. Clients read them with the ``server/metrics`` method; the
+same data can be rendered in the Prometheus text exposition format.
+
+Latencies are recorded in fixed-memory histograms (see
+:class:`browseros.metrics.LatencyHistogram`).
+
+Usage:
+    snapshot = server.metrics.snapshot()
+    print(snapshot["tools"]["browser"]["latency_ms"]["p99"])
+
+    text = server.metrics.to_prometheus()
+    server.metrics.write_prometheus("/var/lib/node_exporter/mcp.prom")
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..metrics import LatencyHistogram
+
+
+class _Series:
+    """Counters, gauge and latency histogram for one method or tool."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "latency_ms": self.latency.snapshot(),
+        }
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ServerMetrics:
+    """
+    Thread-safe request metrics for an MCP server.
+
+    The server calls :meth:`request_started` / :meth:`request_finished`
+    around every request; bytes are counted at the transport.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._methods: Dict[str, _Series] = defaultdict(_Series)
+        self._tools: Dict[str, _Series] = defaultdict(_Series)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        # name -> (stats callable, fields that are monotonic counters)
+        self._sources: Dict[str, Tuple[Callable[[], Dict[str, Any]], FrozenSet[str]]] = {}
+
+    def add_source(
+        self,
+        name: str,
+        stats: Callable[[], Dict[str, Any]],
+        counters: Iterable[str] = (),
+    ) -> None:
+        """
+        Include another component's counters (e.g. a result cache).
+
+        Args:
+            name: Key in the snapshot and metric name infix in Prometheus
+            stats: Returns a flat dict of numbers; called on every read
+            counters: Fields of stats that only ever grow; Prometheus gets
+                      them as ``_total`` counters and everything else
+                      (sizes, ratios) as gauges
+        """
+        self._sources[name] = (stats, frozenset(counters))
+
+    def request_started(self, method: str, tool: Optional[str] = None) -> None:
+        """Mark a request as in flight."""
+        with self._lock:
+            self._methods[method].in_flight += 1
+            if tool is not None:
+                self._tools[tool].in_flight += 1
+
+    def request_finished(
+        self,
+        method: str,
+        tool: Optional[str],
+        seconds: float,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            method: JSON-RPC method
+            tool: Tool name for tools/call requests
+            seconds: Time spent handling the request
+            error: ``JsonRpcErrorCode`` name if the request failed
+        """
+        with self._lock:
+            series = [self._methods[method]]
+            if tool is not None:
+                series.append(self._tools[tool])
+            for entry in series:
+                entry.in_flight -= 1
+                entry.count += 1
+                entry.latency.observe(seconds)
+                if error is not None:
+                    entry.errors += 1
+            if error is not None:
+                self._errors[error] += 1
+
+    def record_error(self, error: str) -> None:
+        """Count an error raised before a request could be dispatched (e.g. PARSE_ERROR)."""
+        with self._lock:
+            self._errors[error] += 1
+
+    def add_bytes_in(self, count: int) -> None:
+        """Count bytes read from the client."""
+        with self._lock:
+            self.bytes_in += count
+
+    def add_bytes_out(self, count: int) -> None:
+        """Count bytes written to the client."""
+        with self._lock:
+            self.bytes_out += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain values (latencies in milliseconds)."""
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self._started_at, 3),
+                "in_flight": sum(series.in_flight for series in self._methods.values()),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "methods": {name: series.snapshot() for name, series in self._methods.items()},
+                "tools": {name: series.snapshot() for name, series in self._tools.items()},
+                "errors": dict(self._errors),
+                **{name: stats() for name, (stats, _) in self._sources.items()},
+            }
+
+    def to_prometheus(self, prefix: str = "browseros_mcp") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        with self._lock:
+            groups = (("method", self._methods, "request"), ("tool", self._tools, "tool"))
+            for label, entries, noun in groups:
+                name = family(f"{noun}s_total", "counter", f"Completed {noun}s, by {label}.")
+                lines.extend(f'{name}{{{label}="{_label(key)}"}} {series.count}' for key, series in entries.items())
+                name = family(f"{noun}_errors_total", "counter", f"Failed {noun}s, by {label}.")
+                lines.extend(f'{name}{{{label}="{_label(key)}"}} {series.errors}' for key, series in entries.items())
+                name = family(f"{noun}s_in_flight", "gauge", f"{noun.capitalize()}s currently executing, by {label}.")
+                lines.extend(f'{name}{{{label}="{_label(key)}"}} {series.in_flight}' for key, series in entries.items())
+                name = family(f"{noun}_duration_seconds", "histogram", f"{noun.capitalize()} latency, by {label}.")
+                for key, series in entries.items():
+                    lines.extend(series.latency.prometheus_lines(name, f'{label}="{_label(key)}"'))
+
+            name = family("errors_total", "counter", "Error responses, by JSON-RPC error code.")
+            lines.extend(f'{name}{{code="{_label(code)}"}} {count}' for code, count in self._errors.items())
+            name = family("received_bytes_total", "counter", "Bytes of requests received.")
+            lines.append(f"{name} {self.bytes_in}")
+            name = family("sent_bytes_total", "counter", "Bytes of responses and notifications sent.")
+            lines.append(f"{name} {self.bytes_out}")
+            name = family("uptime_seconds", "gauge", "Seconds since the server started.")
+            lines.append(f"{name} {time.time() - self._started_at:.3f}")
+
+            for source, (stats, counters) in self._sources.items():
+                for field, value in stats().items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        help_text = f"{source.replace('_', ' ').capitalize()} {field}."
+                        if field in counters:
+                            name = family(f"{source}_{field}_total", "counter", help_text)
+                        else:
+                            name = family(f"{source}_{field}", "gauge", help_text)
+                        lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "browseros_mcp") -> None:
+        """
+        Atomically write the Prometheus dump to a file, e.g. for the
+        node_exporter textfile collector.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(temp_path, path)
+
+
+__all__ = [
+    "LatencyHistogram",
+    "ServerMetrics",
+]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Result cache for idempotent MCP tools.
+
+Agents often call the same read-only tool (page metadata, file reads) with
+the same arguments many times per session. A :class:`ToolResultCache`
+attached to the server answers repeats from memory:
+
+- entries are keyed by a stable hash of the tool name and its arguments
+  (argument order does not matter)
+- entries expire after a TTL and are evicted least-recently-used once the
+  entry count or total encoded size exceeds its bound
+- concurrent identical calls are coalesced: the first executes the tool,
+  the others wait for its result
+- errors are never cached
+
+Only tools registered with ``idempotent=True`` are cached.
+
+Usage:
+    server = MCPJsonRpcServer(result_cache=ToolResultCache(ttl=60))
+    server.add_tool("page_metadata", page_metadata, idempotent=True)
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .codec import _encode_default
+
+# Returns the encoded size of a result, or None if it must not be cached
+Sizer = Callable[[Any], Optional[int]]
+
+
+@dataclass(slots=True)
+class _Entry:
+    tool: str
+    value: Any
+    size: int
+    expires_at: float
+
+
+def cache_key(tool_name: str, arguments: Any) -> str:
+    """
+    Stable hash of a tool call.
+
+    Dict keys are sorted at every level, so ``{"a": 1, "b": 2}`` and
+    ``{"b": 2, "a": 1}`` produce the same key.
+    """
+    canonical = json.dumps(
+        [tool_name, arguments],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_encode_default,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ToolResultCache:
+    """
+    Thread-safe TTL + LRU cache of tool results with in-flight coalescing.
+
+    Safe to share between the sync and async request paths: coalescing uses
+    ``concurrent.futures.Future``, which both threads and coroutines can wait on.
+    """
+
+    # Fields of stats() that only ever grow (the rest describe occupancy)
+    COUNTER_STATS = ("hits", "misses", "coalesced", "evictions", "expirations")
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 300.0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total encoded size of cached results; a single
+                       result larger than this is never cached
+            ttl: Default seconds a result stays valid (tools may override it)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(
+        self,
+        key: str,
+        tool_name: str,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        sizeof: Optional[Sizer] = None,
+    ) -> Any:
+        """
+        Return the cached result for key, computing and storing it on a miss.
+
+        If another caller is already computing the same key, wait for its
+        result instead of computing it again.
+
+        Args:
+            key: Cache key (see :func:`cache_key`)
+            tool_name: Tool the result belongs to (for :meth:`invalidate`)
+            compute: Executes the tool; exceptions propagate and are not cached
+            ttl: Seconds the result stays valid (defaults to the cache's ttl)
+            sizeof: Encoded size of a result, or None to skip caching it
+        """
+        while True:
+            found, value, future, leader = self._claim(key)
+            if found:
+                return value
+            if not leader:
+                try:
+                    return future.result()
+                except concurrent.futures.CancelledError:
+                    continue  # the caller computing it gave up; try again
+
+            try:
+                value = compute()
+            except BaseException as e:
+                self._abandon(key, future, e)
+                raise
+            self._complete(key, future, tool_name, value, ttl, sizeof)
+            return value
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        tool_name: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        sizeof: Optional[Sizer] = None,
+    ) -> Any:
+        """Async variant of :meth:`get_or_compute`; ``compute`` returns an awaitable."""
+        while True:
+            found, value, future, leader = self._claim(key)
+            if found:
+                return value
+            if not leader:
+                try:
+                    # Shield so a follower's own cancellation does not cancel
+                    # the shared future the leader will resolve.
+                    return await asyncio.shield(asyncio.wrap_future(future))
+                except asyncio.CancelledError:
+                    if future.cancelled():
+                        continue  # the leader gave up; try again
+                    raise
+
+            try:
+                value = await compute()
+            except BaseException as e:
+                self._abandon(key, future, e)
+                raise
+            self._complete(key, future, tool_name, value, ttl, sizeof)
+            return value
+
+    def _claim(self, key: str) -> Tuple[bool, Any, Optional[concurrent.futures.Future], bool]:
+        """
+        Look up key.
+
+        Returns:
+            (found, value, future, leader): a fresh hit, or the in-flight
+            future to wait on, or a new future the caller must resolve
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry.value, None, False
+                self._remove(key)
+                self.expirations += 1
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, None, future, False
+
+            self.misses += 1
+            future = self._in_flight[key] = concurrent.futures.Future()
+            return False, None, future, True
+
+    def _complete(
+        self,
+        key: str,
+        future: concurrent.futures.Future,
+        tool_name: str,
+        value: Any,
+        ttl: Optional[float],
+        sizeof: Optional[Sizer],
+    ) -> None:
+        """Store a computed result and hand it to waiting callers."""
+        size = sizeof(value) if sizeof is not None else 0
+        ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if size is not None and size <= self.max_bytes and ttl > 0:
+                if key in self._entries:
+                    self._remove(key)
+                self._entries[key] = _Entry(tool_name, value, size, time.monotonic() + ttl)
+                self._bytes += size
+                self._evict()
+        future.set_result(value)
+
+    def _abandon(self, key: str, future: concurrent.futures.Future, error: BaseException) -> None:
+        """Release waiting callers after the computation failed or was cancelled."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.cancel()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both bounds hold (lock held)."""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def invalidate(self, tool_name: Optional[str] = None) -> int:
+        """
+        Drop cached results, e.g. after a tool that changes state ran.
+
+        Args:
+            tool_name: Only drop this tool's results (default: everything)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if tool_name is None or entry.tool == tool_name
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
+
+
+__all__ = [
+    "ToolResultCache",
+    "cache_key",
+]
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Input schema validation for MCP tool arguments.
+
+Tools registered with an ``input_schema`` have their arguments checked
+before the handler runs. If the ``jsonschema`` package is installed it is
+used for full JSON Schema support; otherwise a built-in validator covers
+the keywords tool schemas commonly use: ``type``, ``properties``,
+``required``, ``additionalProperties``, ``items``, ``enum``, ``minimum``,
+``maximum``, ``minLength`` and ``maxLength``.
+
+Schemas are checked and compiled once, when the tool is registered
+(:class:`ArgumentValidator`); a malformed schema raises ValueError then
+rather than failing every call.
+
+Usage:
+    errors = validate_arguments(
+        {"type": "object", "properties": {"url": {"type": "string"}}, "required": ["url"]},
+        {"url": 42},
+    )
+    # ["url: expected string, got integer"]
+"""
+
+from typing import Any, Dict, List
+
+try:
+    import jsonschema
+    HAS_JSONSCHEMA = True
+except ImportError:
+    HAS_JSONSCHEMA = False
+
+_SCHEMA_TYPES = {"null", "boolean", "object", "array", "number", "integer", "string"}
+
+_TYPE_NAMES = {
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+    type(None): "null",
+}
+
+
+def _type_name(value: Any) -> str:
+    """JSON Schema type name of a decoded JSON value."""
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _is_type(value: Any, expected: str) -> bool:
+    """Check a value against a single JSON Schema type name."""
+    actual = _type_name(value)
+    if expected == "number":
+        return actual in ("integer", "number")
+    if expected == "integer" and actual == "number":
+        return float(value).is_integer()
+    return actual == expected
+
+
+def _validate(schema: Dict[str, Any], value: Any, path: str, errors: List[str]) -> None:
+    """Append a message to errors for every way value violates schema."""
+    where = path or "arguments"
+
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_is_type(value, name) for name in types):
+            errors.append(f"{where}: expected {' or '.join(types)}, got {_type_name(value)}")
+            return
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{where}: {value!r} is not one of {schema['enum']!r}")
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{where}: {value} is less than the minimum of {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{where}: {value} is greater than the maximum of {schema['maximum']}")
+
+    if isinstance(value, str):
+        if "minLength" in schema and len(value) < schema["minLength"]:
+            errors.append(f"{where}: shorter than {schema['minLength']} characters")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{where}: longer than {schema['maxLength']} characters")
+
+    if isinstance(value, list) and isinstance(schema.get("items"), dict):
+        for index, item in enumerate(value):
+            _validate(schema["items"], item, f"{path}[{index}]", errors)
+
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{where}: missing required property '{name}'")
+        for name, item in value.items():
+            child = f"{path}.{name}" if path else name
+            if name in properties:
+                _validate(properties[name], item, child, errors)
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{where}: unexpected property '{name}'")
+            elif isinstance(schema.get("additionalProperties"), dict):
+                _validate(schema["additionalProperties"], item, child, errors)
+
+
+def _check_schema(schema: Any, path: str) -> None:
+    """Raise ValueError for a schema the built-in validator cannot apply."""
+    where = path or "schema"
+    if not isinstance(schema, dict):
+        raise ValueError(f"{where}: expected an object, got {_type_name(schema)}")
+
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        unknown = [name for name in types if name not in _SCHEMA_TYPES]
+        if unknown:
+            raise ValueError(f"{where}.type: unknown type {unknown[0]!r}")
+
+    if not isinstance(schema.get("required", []), list):
+        raise ValueError(f"{where}.required: expected an array")
+    if "enum" in schema and not isinstance(schema["enum"], list):
+        raise ValueError(f"{where}.enum: expected an array")
+    properties = schema.get("properties", {})
+    if not isinstance(properties, dict):
+        raise ValueError(f"{where}.properties: expected an object")
+    for name, child in properties.items():
+        _check_schema(child, f"{where}.properties.{name}")
+    for keyword in ("items", "additionalProperties"):
+        if isinstance(schema.get(keyword), dict):
+            _check_schema(schema[keyword], f"{where}.{keyword}")
+
+
+class ArgumentValidator:
+    """
+    Validator for one tool's input schema.
+
+    The schema is checked when the validator is created, and with
+    ``jsonschema`` installed the compiled validator is reused for every
+    call.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Args:
+            schema: JSON Schema describing the tool's arguments object
+
+        Raises:
+            ValueError: If the schema is not a valid JSON Schema
+        """
+        self.schema = schema
+        self._validator = None
+        if HAS_JSONSCHEMA:
+            try:
+                jsonschema.Draft202012Validator.check_schema(schema)
+            except jsonschema.SchemaError as e:
+                raise ValueError(f"Invalid input schema: {e.message}") from None
+            self._validator = jsonschema.Draft202012Validator(schema)
+        else:
+            try:
+                _check_schema(schema, "")
+            except ValueError as e:
+                raise ValueError(f"Invalid input schema: {e}") from None
+
+    def validate(self, arguments: Any) -> List[str]:
+        """
+        Validate tool arguments.
+
+        Args:
+            arguments: Decoded ``arguments`` from a tools/call request
+
+        Returns:
+            Human-readable validation errors (empty if the arguments are valid)
+        """
+        if self._validator is not None:
+            return [
+                f"{'.'.join(str(part) for part in error.absolute_path) or 'arguments'}: {error.message}"
+                for error in self._validator.iter_errors(arguments)
+            ]
+
+        errors: List[str] = []
+        _validate(self.schema, arguments, "", errors)
+        return errors
+
+
+def validate_arguments(schema: Dict[str, Any], arguments: Any) -> List[str]:
+    """
+    Validate tool arguments against a JSON Schema.
+
+    Compiles the schema on every call; servers keep an
+    :class:`ArgumentValidator` per tool instead.
+
+    Args:
+        schema: JSON Schema describing the tool's arguments object
+        arguments: Decoded ``arguments`` from a tools/call request
+
+    Returns:
+        Human-readable validation errors (empty if the arguments are valid)
+
+    Raises:
+        ValueError: If the schema is not a valid JSON Schema
+    """
+    return ArgumentValidator(schema).validate(arguments)
+
+
+__all__ = [
+    "ArgumentValidator",
+    "validate_arguments",
+]
@@ -0,0 +1,828 @@
+#!/usr/bin/env python3
+"""
+Stdio subprocess clients for the MCP JSON-RPC transport.
+
+Both clients spawn an MCP server process and talk to it over its stdin and
+stdout. Requests are pipelined: any number can be in flight over the one
+pipe, and a reader matches each response to its caller by ``id`` through a
+table of pending futures. A call that outlives its timeout fails with
+``JsonRpcErrorCode.TOOL_TIMEOUT`` (``REQUEST_TIMEOUT`` for methods other
+than ``tools/call``), and the server is told to stop working on it with a
+``$/cancelRequest`` notification. Errors the server sends with ``"id": null``
+(parse errors, invalid requests) fail the request or batch that caused them.
+
+Server notifications are routed too: ``call_tool(..., on_chunk=...)``
+receives each chunk of a streamed tool result as it arrives, and
+``on_notification`` sees every notification.
+
+Pass ``framing="content-length"`` to send bytes arguments and receive bytes
+results as raw attachments instead of base64 (see ``framing``).
+
+Usage:
+    # Blocking client (thread-safe; share one instance across threads)
+    with StdioSubprocessClient(["python", "my_mcp_server.py"]) as client:
+        result = client.call_tool("browser", {"url": "https://example.com"})
+
+    # Asyncio client
+    async with AsyncStdioSubprocessClient(["python", "my_mcp_server.py"]) as client:
+        results = await asyncio.gather(
+            client.call_tool("browser", {"url": "https://a.example"}),
+            client.call_tool("browser", {"url": "https://b.example"}),
+        )
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import subprocess
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .codec import JsonCodec, get_codec
+from .framing import Framing, decode_message, encode_message, get_framing
+from .json_transport import (
+    CANCEL_METHOD,
+    JsonRpcErrorCode,
+    JsonRpcException,
+    JsonRpcRequest,
+    JsonRpcResponse,
+    MCPJsonRpcClient,
+    _order_batch_responses,
+)
+
+NotificationHandler = Callable[[str, Dict[str, Any]], None]
+
+
+def _decode_messages(
+    codec: JsonCodec,
+    body: bytes,
+    attachments: List[bytes],
+) -> Tuple[List[JsonRpcResponse], List[Dict[str, Any]]]:
+    """Decode one frame from the server into (responses, notifications)."""
+    payload = decode_message(codec, body, attachments)
+    if not isinstance(payload, list):
+        payload = [payload]
+
+    responses = []
+    notifications = []
+    for item in payload:
+        if "method" in item:
+            notifications.append(item)
+        else:
+            responses.append(JsonRpcResponse.from_dict(item))
+    return responses, notifications
+
+
+def _encode_requests(codec: JsonCodec, framing: Framing, requests: Sequence[JsonRpcRequest]) -> bytes:
+    """Encode a single request or a batch as one frame."""
+    if len(requests) == 1:
+        payload: Any = requests[0].to_dict()
+    else:
+        payload = [request.to_dict() for request in requests]
+    return encode_message(codec, framing, payload)
+
+
+def _cancel_requests(requests: Sequence[JsonRpcRequest]) -> List[JsonRpcRequest]:
+    """$/cancelRequest notifications for every request that expects a response."""
+    return [
+        JsonRpcRequest(method=CANCEL_METHOD, params={"id": request.id})
+        for request in requests
+        if request.id is not None
+    ]
+
+
+def _raise_for_error(response: JsonRpcResponse) -> Any:
+    """Return the response result, raising JsonRpcException on an error response."""
+    if response.error is None:
+        return response.result
+
+    try:
+        code = JsonRpcErrorCode(response.error.code)
+    except ValueError:
+        code = JsonRpcErrorCode.INTERNAL_ERROR
+    raise JsonRpcException(code, response.error.message, response.error.data)
+
+
+def _timeout_error(request: JsonRpcRequest, timeout: Optional[float]) -> JsonRpcException:
+    """Error raised when a request outlives its timeout."""
+    if request.method == "tools/call":
+        code = JsonRpcErrorCode.TOOL_TIMEOUT
+    else:
+        code = JsonRpcErrorCode.REQUEST_TIMEOUT
+    return JsonRpcException(
+        code,
+        f"Request {request.id} ({request.method}) timed out after {timeout}s"
+    )
+
+
+def _frame_ids(requests: Sequence[JsonRpcRequest]) -> Tuple[Any, ...]:
+    """Ids of the requests sent together in one frame."""
+    return tuple(request.id for request in requests if request.id is not None)
+
+
+def _address_responses(
+    responses: List[JsonRpcResponse],
+    frames: Dict[Any, Tuple[Any, ...]],
+) -> List[JsonRpcResponse]:
+    """
+    Responses to deliver by id, with errors sent as ``"id": null`` re-addressed.
+
+    The server answers parse errors and invalid requests with a null id. In
+    a batch response such an error belongs to the members of that batch its
+    siblings leave unanswered; on its own it belongs to the oldest frame with
+    no answer yet (exact for a server that answers frames in order). Each of
+    those requests gets a copy of the error under its own id.
+
+    Args:
+        responses: Responses decoded from one frame
+        frames: Pending request id -> ids of the frame it was sent in, in
+                send order
+
+    Returns:
+        Responses with an id; a null-id error nothing is waiting for is dropped
+    """
+    addressed = [response for response in responses if response.id is not None]
+    errors = [response.error for response in responses if response.id is None and response.error is not None]
+    if not errors:
+        return addressed
+
+    answered = {response.id for response in addressed}
+    orphaned: List[Any] = []
+    if answered:
+        frame = next((frames[request_id] for request_id in answered if request_id in frames), ())
+        orphaned = [request_id for request_id in frame if request_id in frames and request_id not in answered]
+    else:
+        frame = next((frame for frame in frames.values() if all(request_id in frames for request_id in frame)), ())
+        orphaned = list(frame)
+
+    for index, request_id in enumerate(orphaned):
+        addressed.append(JsonRpcResponse(error=errors[min(index, len(errors) - 1)], id=request_id))
+    return addressed
+
+
+def _closed_error() -> JsonRpcException:
+    """Error delivered to requests still pending when the server goes away."""
+    return JsonRpcException(
+        JsonRpcErrorCode.INTERNAL_ERROR,
+        "MCP server process closed the connection"
+    )
+
+
+class _NotificationRouter:
+    """Routes server notifications to streamed-chunk callbacks and ``on_notification``."""
+
+    on_notification: Optional[NotificationHandler]
+    _chunk_handlers: Dict[Any, Callable[[Any], None]]
+    # Provided by the concrete clients
+    _next_id: Callable[[], str]
+    _log: Callable[[str], None]
+
+    def _tool_call_request(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        on_chunk: Optional[Callable[[Any], None]],
+    ) -> JsonRpcRequest:
+        """Build a tools/call request, asking for progress if on_chunk is given."""
+        request_id = self._next_id()
+        params: Dict[str, Any] = {"name": tool_name, "arguments": arguments}
+        if on_chunk is not None:
+            params["_meta"] = {"progressToken": request_id}
+            self._chunk_handlers[request_id] = on_chunk
+        return JsonRpcRequest(method="tools/call", params=params, id=request_id)
+
+    def _route_notification(self, message: Dict[str, Any]) -> None:
+        """Run the callbacks for one notification; a failing callback is logged, not raised."""
+        method = message.get("method", "")
+        params = message.get("params") or {}
+        if method == "notifications/progress":
+            handler = self._chunk_handlers.get(params.get("progressToken"))
+            if handler is not None:
+                try:
+                    handler(params.get("chunk"))
+                except Exception as e:
+                    self._log(f"on_chunk callback failed: {e}")
+        if self.on_notification is not None:
+            try:
+                self.on_notification(method, params)
+            except Exception as e:
+                self._log(f"on_notification callback failed: {e}")
+
+
+class StdioSubprocessClient(_NotificationRouter, MCPJsonRpcClient):
+    """
+    Blocking MCP client that spawns a server process and talks over its stdio.
+
+    A background thread reads responses and resolves the matching pending
+    future, so calls made from several threads share one pipe without
+    waiting on each other. Use :meth:`submit` to pipeline requests from a
+    single thread.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        timeout: Optional[float] = 30.0,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        codec: Optional[Union[str, JsonCodec]] = None,
+        framing: Union[str, Framing] = "line",
+        on_notification: Optional[NotificationHandler] = None,
+        debug: bool = False,
+    ):
+        """
+        Initialize the client. The server is spawned by :meth:`start`.
+
+        Args:
+            command: Server command line, e.g. ``["python", "server.py"]``
+            timeout: Default per-call timeout in seconds (None waits forever)
+            env: Environment for the server process
+            cwd: Working directory for the server process
+            codec: JSON codec or backend name (defaults to the fastest installed)
+            framing: Wire framing, "line" or "content-length" (the server
+                     follows whichever the client uses)
+            on_notification: Called with (method, params) for every server
+                             notification, on the reader thread
+            debug: Enable debug logging to stderr
+        """
+        super().__init__()
+        self.command = command
+        self.timeout = timeout
+        self.env = env
+        self.cwd = cwd
+        self.codec = get_codec(codec)
+        self.framing = get_framing(framing)
+        self.on_notification = on_notification
+        self.debug = debug
+        self._chunk_handlers = {}
+
+        self.process: Optional[subprocess.Popen] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[Any, concurrent.futures.Future] = {}
+        # Pending request id -> ids sent in the same frame (guarded by _pending_lock)
+        self._frames: Dict[Any, Tuple[Any, ...]] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StdioSubprocessClient":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _log(self, message: str) -> None:
+        """Log debug message to stderr."""
+        if self.debug:
+            print(f"[MCP Client] {message}", file=sys.stderr)
+
+    def _next_id(self) -> str:
+        """Generate next request ID (thread-safe)."""
+        return str(next(self._ids))
+
+    def start(self) -> None:
+        """Spawn the server process and start the response reader."""
+        if self.process is not None:
+            return
+
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=self.env,
+            cwd=self.cwd,
+        )
+        self._reader = threading.Thread(
+            target=self._read_responses,
+            name="mcp-client-reader",
+            daemon=True,
+        )
+        self._reader.start()
+        self._log(f"Started server: {' '.join(self.command)} (pid={self.process.pid})")
+
+    def close(self, wait: float = 5.0) -> None:
+        """
+        Close the server's stdin and wait for it to exit.
+
+        Args:
+            wait: Seconds to wait before killing the process
+        """
+        process = self.process
+        if process is None:
+            return
+        self.process = None
+
+        try:
+            if process.stdin:
+                process.stdin.close()
+            process.wait(timeout=wait)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+        if self._reader is not None:
+            self._reader.join(timeout=wait)
+            self._reader = None
+        self._fail_pending(_closed_error())
+
+    def submit(self, request: JsonRpcRequest) -> concurrent.futures.Future:
+        """
+        Send a request without waiting for its response.
+
+        Returns:
+            Future resolved with the JsonRpcResponse (None for notifications)
+        """
+        return self._submit([request])[0]
+
+    def _submit(self, requests: Sequence[JsonRpcRequest]) -> List[concurrent.futures.Future]:
+        """Register futures for the requests, then write them as one frame."""
+        if self.process is None:
+            self.start()
+
+        futures = []
+        frame = _frame_ids(requests)
+        with self._pending_lock:
+            for request in requests:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                if request.id is None:
+                    future.set_result(None)
+                else:
+                    self._pending[request.id] = future
+                    self._frames[request.id] = frame
+                futures.append(future)
+
+        try:
+            with self._write_lock:
+                assert self.process is not None and self.process.stdin is not None
+                self.process.stdin.write(_encode_requests(self.codec, self.framing, requests))
+                self.process.stdin.flush()
+        except (OSError, ValueError):
+            self._discard(requests)
+            raise _closed_error()
+
+        return futures
+
+    def _discard(self, requests: Sequence[JsonRpcRequest]) -> None:
+        """Forget pending requests whose responses are no longer wanted."""
+        with self._pending_lock:
+            for request in requests:
+                self._pending.pop(request.id, None)
+                self._frames.pop(request.id, None)
+
+    def _cancel_remote(self, requests: Sequence[JsonRpcRequest]) -> None:
+        """Ask the server to stop working on abandoned requests (best effort)."""
+        cancels = _cancel_requests(requests)
+        if not cancels:
+            return
+        try:
+            self._submit(cancels)
+        except JsonRpcException:
+            pass
+
+    def _wait(
+        self,
+        requests: Sequence[JsonRpcRequest],
+        futures: List[concurrent.futures.Future],
+        timeout: Optional[float],
+    ) -> List[JsonRpcResponse]:
+        """Wait for every future, mapping a timeout to TOOL_TIMEOUT or REQUEST_TIMEOUT."""
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        if not_done:
+            self._discard(requests)
+            self._cancel_remote(requests)
+            late = next(request for request, future in zip(requests, futures) if future in not_done)
+            raise _timeout_error(late, timeout)
+        return [future.result() for future in futures if future.result() is not None]
+
+    def _send_request(self, request: JsonRpcRequest, timeout: Optional[float] = None) -> Any:
+        """Send a request, wait for its response and return the result."""
+        timeout = self.timeout if timeout is None else timeout
+        responses = self._wait([request], self._submit([request]), timeout)
+        if not responses:
+            return None
+        return _raise_for_error(responses[0])
+
+    def _send_batch(self, requests: List[JsonRpcRequest], timeout: Optional[float] = None) -> List[JsonRpcResponse]:
+        """Send a batch as one frame and wait for every member's response."""
+        timeout = self.timeout if timeout is None else timeout
+        return self._wait(requests, self._submit(requests), timeout)
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Call an arbitrary method and return its result.
+
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+            timeout: Per-call timeout in seconds (defaults to the client's)
+
+        Raises:
+            JsonRpcException: On error responses or timeout (TOOL_TIMEOUT
+                              for tools/call, REQUEST_TIMEOUT otherwise)
+        """
+        request = JsonRpcRequest(method=method, params=params, id=self._next_id())
+        return self._send_request(request, timeout)
+
+    def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+        on_chunk: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        Call a tool on the server.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool-specific arguments
+            timeout: Per-call timeout in seconds (defaults to the client's)
+            on_chunk: Receives each chunk of a streamed result as it arrives
+                      (on the reader thread); the returned result then only
+                      reports the chunk count
+
+        Returns:
+            Tool execution result
+
+        Raises:
+            JsonRpcException: On error responses or timeout (TOOL_TIMEOUT)
+        """
+        request = self._tool_call_request(tool_name, arguments, on_chunk)
+        try:
+            return self._send_request(request, timeout)
+        finally:
+            self._chunk_handlers.pop(request.id, None)
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a notification (no response expected)."""
+        self._submit([JsonRpcRequest(method=method, params=params)])
+
+    def _read_responses(self) -> None:
+        """Reader thread: resolve pending futures until the server's stdout closes."""
+        process = self.process
+        assert process is not None and process.stdout is not None
+
+        try:
+            while True:
+                try:
+                    frame = self.framing.read(process.stdout)
+                except (EOFError, ValueError) as e:
+                    self._log(f"Stopped reading responses: {e}")
+                    break
+                if frame is None:
+                    break
+                try:
+                    responses, notifications = _decode_messages(self.codec, *frame)
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    self._log(f"Ignoring malformed response: {e}")
+                    continue
+
+                for notification in notifications:
+                    self._route_notification(notification)
+                with self._pending_lock:
+                    responses = _address_responses(responses, self._frames)
+                for response in responses:
+                    with self._pending_lock:
+                        future = self._pending.pop(response.id, None)
+                        self._frames.pop(response.id, None)
+                    if future is None:
+                        self._log(f"Ignoring response for unknown id: {response.id}")
+                    elif not future.done():
+                        future.set_result(response)
+        finally:
+            self._fail_pending(_closed_error())
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every pending request with the given error."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._frames.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+
+class AsyncStdioSubprocessClient(_NotificationRouter):
+    """
+    Asyncio MCP client that spawns a server process and talks over its stdio.
+
+    Any number of coroutines may await calls concurrently; a reader task
+    resolves each pending future as its response arrives.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        timeout: Optional[float] = 30.0,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        max_line_size: int = 64 * 1024 * 1024,
+        codec: Optional[Union[str, JsonCodec]] = None,
+        framing: Union[str, Framing] = "line",
+        on_notification: Optional[NotificationHandler] = None,
+        debug: bool = False,
+    ):
+        """
+        Initialize the client. The server is spawned by :meth:`start`.
+
+        Args:
+            command: Server command line, e.g. ``["python", "server.py"]``
+            timeout: Default per-call timeout in seconds (None waits forever)
+            env: Environment for the server process
+            cwd: Working directory for the server process
+            max_line_size: Largest response line accepted, in bytes
+            codec: JSON codec or backend name (defaults to the fastest installed)
+            framing: Wire framing, "line" or "content-length" (the server
+                     follows whichever the client uses)
+            on_notification: Called with (method, params) for every server
+                             notification, on the reader task
+            debug: Enable debug logging to stderr
+        """
+        self.command = command
+        self.timeout = timeout
+        self.env = env
+        self.cwd = cwd
+        self.max_line_size = max_line_size
+        self.codec = get_codec(codec)
+        self.framing = get_framing(framing)
+        self.on_notification = on_notification
+        self.debug = debug
+        self._chunk_handlers = {}
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[Any, asyncio.Future] = {}
+        # Pending request id -> ids sent in the same frame
+        self._frames: Dict[Any, Tuple[Any, ...]] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncStdioSubprocessClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _log(self, message: str) -> None:
+        """Log debug message to stderr."""
+        if self.debug:
+            print(f"[MCP Client] {message}", file=sys.stderr)
+
+    def _next_id(self) -> str:
+        """Generate next request ID."""
+        return str(next(self._ids))
+
+    async def start(self) -> None:
+        """Spawn the server process and start the response reader."""
+        if self.process is not None:
+            return
+
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=self.env,
+            cwd=self.cwd,
+            limit=self.max_line_size,
+        )
+        self._reader = asyncio.create_task(self._read_responses())
+        self._log(f"Started server: {' '.join(self.command)} (pid={self.process.pid})")
+
+    async def close(self, wait: float = 5.0) -> None:
+        """
+        Close the server's stdin and wait for it to exit.
+
+        Args:
+            wait: Seconds to wait before killing the process
+        """
+        process = self.process
+        if process is None:
+            return
+        self.process = None
+
+        try:
+            if process.stdin:
+                process.stdin.close()
+            await asyncio.wait_for(process.wait(), timeout=wait)
+        except (OSError, asyncio.TimeoutError):
+            process.kill()
+            await process.wait()
+
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        self._fail_pending(_closed_error())
+
+    async def _submit(self, requests: Sequence[JsonRpcRequest]) -> List[Optional[asyncio.Future]]:
+        """Register futures for the requests, then write them as one frame."""
+        if self.process is None:
+            await self.start()
+        assert self.process is not None and self.process.stdin is not None
+
+        loop = asyncio.get_running_loop()
+        futures: List[Optional[asyncio.Future]] = []
+        frame = _frame_ids(requests)
+        for request in requests:
+            if request.id is None:
+                futures.append(None)
+                continue
+            future = loop.create_future()
+            self._pending[request.id] = future
+            self._frames[request.id] = frame
+            futures.append(future)
+
+        try:
+            self.process.stdin.write(_encode_requests(self.codec, self.framing, requests))
+            await self.process.stdin.drain()
+        except (OSError, RuntimeError):
+            self._discard(requests)
+            raise _closed_error()
+
+        return futures
+
+    def _discard(self, requests: Sequence[JsonRpcRequest]) -> None:
+        """Forget pending requests whose responses are no longer wanted."""
+        for request in requests:
+            self._pending.pop(request.id, None)
+            self._frames.pop(request.id, None)
+
+    def _cancel_remote(self, requests: Sequence[JsonRpcRequest]) -> None:
+        """
+        Ask the server to stop working on abandoned requests (best effort).
+
+        Writes without draining, so it is safe inside a cancelled task.
+        """
+        cancels = _cancel_requests(requests)
+        process = self.process
+        if not cancels or process is None or process.stdin is None:
+            return
+        try:
+            process.stdin.write(_encode_requests(self.codec, self.framing, cancels))
+        except (OSError, RuntimeError):
+            pass
+
+    async def _exchange(
+        self,
+        requests: Sequence[JsonRpcRequest],
+        timeout: Optional[float],
+    ) -> List[JsonRpcResponse]:
+        """Send requests as one frame and wait for every response."""
+        timeout = self.timeout if timeout is None else timeout
+        submitted = await self._submit(requests)
+        waiting = [(request, future) for request, future in zip(requests, submitted) if future is not None]
+        if not waiting:
+            return []
+
+        futures = [future for _, future in waiting]
+        try:
+            done, not_done = await asyncio.wait(futures, timeout=timeout)
+        except asyncio.CancelledError:
+            self._discard(requests)
+            self._cancel_remote(requests)
+            raise
+        if not_done:
+            self._discard(requests)
+            self._cancel_remote(requests)
+            late = next(request for request, future in waiting if future in not_done)
+            raise _timeout_error(late, timeout)
+        return [future.result() for future in futures]
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Call an arbitrary method and return its result.
+
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+            timeout: Per-call timeout in seconds (defaults to the client's)
+
+        Raises:
+            JsonRpcException: On error responses or timeout (TOOL_TIMEOUT
+                              for tools/call, REQUEST_TIMEOUT otherwise)
+        """
+        request = JsonRpcRequest(method=method, params=params, id=self._next_id())
+        responses = await self._exchange([request], timeout)
+        return _raise_for_error(responses[0])
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a notification (no response expected)."""
+        await self._submit([JsonRpcRequest(method=method, params=params)])
+
+    async def list_tools(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """List available tools from the server."""
+        return await self.request("tools/list", timeout=timeout)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+        on_chunk: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        Call a tool on the server.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool-specific arguments
+            timeout: Per-call timeout in seconds (defaults to the client's)
+            on_chunk: Receives each chunk of a streamed result as it arrives;
+                      the returned result then only reports the chunk count
+
+        Raises:
+            JsonRpcException: On error responses or timeout (TOOL_TIMEOUT)
+        """
+        request = self._tool_call_request(tool_name, arguments, on_chunk)
+        try:
+            responses = await self._exchange([request], timeout)
+            return _raise_for_error(responses[0])
+        finally:
+            self._chunk_handlers.pop(request.id, None)
+
+    async def ping(self, timeout: Optional[float] = None) -> bool:
+        """Ping the server to check if it's alive."""
+        result = await self.request("ping", timeout=timeout)
+        return result.get("status") == "ok"
+
+    async def send_batch(self, requests: List[JsonRpcRequest], timeout: Optional[float] = None) -> List[JsonRpcResponse]:
+        """
+        Send several requests as one JSON-RPC batch.
+
+        Returns:
+            One response per non-notification request, in request order
+        """
+        if not requests:
+            return []
+        return _order_batch_responses(requests, await self._exchange(requests, timeout))
+
+    async def call_tools(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        timeout: Optional[float] = None,
+    ) -> List[JsonRpcResponse]:
+        """
+        Call several tools in a single JSON-RPC batch.
+
+        Returns:
+            One response per call, in call order
+        """
+        requests = [
+            JsonRpcRequest(
+                method="tools/call",
+                params={"name": tool_name, "arguments": arguments},
+                id=self._next_id()
+            )
+            for tool_name, arguments in calls
+        ]
+        return await self.send_batch(requests, timeout)
+
+    async def _read_responses(self) -> None:
+        """Reader task: resolve pending futures until the server's stdout closes."""
+        process = self.process
+        assert process is not None and process.stdout is not None
+
+        try:
+            while True:
+                try:
+                    frame = await self.framing.read_async(process.stdout)
+                except (EOFError, ValueError) as e:
+                    self._log(f"Stopped reading responses: {e}")
+                    break
+                if frame is None:
+                    break
+                try:
+                    responses, notifications = _decode_messages(self.codec, *frame)
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    self._log(f"Ignoring malformed response: {e}")
+                    continue
+
+                for notification in notifications:
+                    self._route_notification(notification)
+                for response in _address_responses(responses, self._frames):
+                    future = self._pending.pop(response.id, None)
+                    self._frames.pop(response.id, None)
+                    if future is None:
+                        self._log(f"Ignoring response for unknown id: {response.id}")
+                    elif not future.done():
+                        future.set_result(response)
+        finally:
+            self._fail_pending(_closed_error())
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every pending request with the given error."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        self._frames.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+
+__all__ = [
+    "StdioSubprocessClient",
+    "AsyncStdioSubprocessClient",
+]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Shared latency histogram for BrowserOS instrumentation.
+
+Used by the MCP server metrics (browseros.mcp) and the HTTP client stats
+(browseros.api); it lives here so neither package has to import the other.
+
+Histograms use fixed log-spaced buckets (10 per decade, 10µs to 100s), so
+memory stays constant however many durations are recorded, and
+percentiles are accurate to within one bucket (about 12%).
+"""
+
+import math
+from typing import Dict, List
+
+_MIN_BOUND = 1e-5
+_BUCKETS_PER_DECADE = 10
+_DECADES = 7
+
+# Upper bounds (seconds) of the histogram buckets; one overflow bucket follows
+_BOUNDS = [
+    _MIN_BOUND * 10 ** (i / _BUCKETS_PER_DECADE)
+    for i in range(_BUCKETS_PER_DECADE * _DECADES + 1)
+]
+
+# Bucket boundaries exported to Prometheus (two per decade, to keep dumps short)
+_EXPORTED_BOUNDS = range(0, len(_BOUNDS), _BUCKETS_PER_DECADE // 2)
+
+
+class LatencyHistogram:
+    """Fixed-memory histogram of durations in seconds."""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        if seconds <= _MIN_BOUND:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log10(seconds / _MIN_BOUND) * _BUCKETS_PER_DECADE),
+                len(_BOUNDS),
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g. 0.99)
+
+        Returns:
+            Estimated duration in seconds (0.0 if nothing was recorded)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = _BOUNDS[index - 1] if index else self.min
+            upper = _BOUNDS[index] if index < len(_BOUNDS) else self.max
+            # Interpolate geometrically, matching the log-spaced buckets
+            fraction = (rank - seen) / bucket_count
+            estimate = lower * (upper / lower) ** fraction if lower > 0 else upper * fraction
+            return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """Summary statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50": round(self.percentile(0.50) * 1000, 3),
+            "p95": round(self.percentile(0.95) * 1000, 3),
+            "p99": round(self.percentile(0.99) * 1000, 3),
+            "max": round(self.max * 1000, 3),
+        }
+
+    def prometheus_lines(self, name: str, labels: str) -> List[str]:
+        """Render as Prometheus ``_bucket``/``_sum``/``_count`` samples."""
+        lines = []
+        cumulative = 0
+        exported = set(_EXPORTED_BOUNDS)
+        for index, bucket_count in enumerate(self.counts[:-1]):
+            cumulative += bucket_count
+            if index in exported:
+                lines.append(f'{name}_bucket{{{labels},le="{_BOUNDS[index]:.6g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.9g}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+__all__ = [
+    "LatencyHistogram",
+]
@@ -19,6 +19,7 @@ import asyncio
 import json
 import logging
 import sys
+import threading
 import webbrowser
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -36,7 +37,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Import BrowserOS modules
 try:
-    from browseros.api import ModelDiscovery, ChatGPTHandler, BackendType
+    from browseros.api import DiscoveryService, ChatGPTHandler, BackendType
     from browseros.mcp.json_transport import MCPJsonRpcServer
 except ImportError as e:
     print(f"Error importing BrowserOS modules: {e}")
@@ -64,6 +65,21 @@ app_state = {
     'files': [],
 }
 
+# Model discovery runs in the background; /api/discover serves its snapshot
+discovery_service: Optional[DiscoveryService] = None
+discovery_service_lock = threading.Lock()
+
+
+def get_discovery_service() -> DiscoveryService:
+    """Start the shared discovery service on first use"""
+    global discovery_service
+    with discovery_service_lock:
+        if discovery_service is None:
+            service = DiscoveryService(refresh_interval=30.0)
+            service.start_in_thread()
+            discovery_service = service
+    return discovery_service
+
 # ============================================================================
 # Routes for HTML Interfaces
 # ============================================================================
@@ -557,27 +573,24 @@ def api_discover():
                 'error': 'aiohttp not installed. Install with: pip install aiohttp'
             })
 
-        # Run async code in a new event loop (Flask doesn't support async routes)
-        async def do_discovery():
-            async with ModelDiscovery() as discovery:
-                return await discovery.discover_all()
-
-        # Create new event loop for this request
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            backends = loop.run_until_complete(do_discovery())
-        finally:
-            loop.close()
+        # Serve the background snapshot; only the first request (or ?refresh=1) waits for a pass
+        service = get_discovery_service()
+        if request.args.get('refresh'):
+            service.refresh_threadsafe(force=True)
+        elif not service.snapshot.is_ready:
+            service.refresh_threadsafe()
+        snapshot = service.snapshot
 
         # Convert to serializable format
         result = {
             'success': True,
             'backends': [],
-            'total_models': 0
+            'total_models': 0,
+            'version': snapshot.version,
+            'refreshed_at': snapshot.timestamp,
         }
 
-        for backend in backends:
+        for backend in snapshot.backends:
             # ONLY include backends that are actually available/running
             if not backend.is_available or len(backend.models) == 0:
                 continue
@@ -596,7 +609,9 @@ def api_discover():
                     'name': model.name or model.model_id,
                     'parameter_count': model.parameter_count,
                     'quantization': model.quantization,
-                    'size': model.size
+                    'size': model.size,
+                    'context_length': model.context_length,
+                    'capabilities': model.capabilities,
                 }
                 backend_data['models'].append(model_data)
                 result['total_models'] += 1
@@ -7,6 +7,7 @@ Tests actual runtime behavior, not just imports
 import asyncio
 import sys
 import json
+import time
 from pathlib import Path
 from typing import List, Dict
 
@@ -81,6 +82,40 @@ try:
     assert "TEXT_GENERATION_WEBUI" in backend_types or "TEXT_GEN_WEBUI" in backend_types
     log_test("BackendType enum", "PASS", f"All {len(backend_types)} backend types present")
 
+    # Test snapshot diffs
+    from browseros.api.discovery_service import DiscoverySnapshot, SnapshotDiff
+    old_snapshot = DiscoverySnapshot(backends=[BackendInfo(
+        type=BackendType.OLLAMA, name="Ollama", url="http://localhost:11434", is_available=True,
+        models=[ModelInfo(model_id="llama3.1:8b", name="llama3.1:8b"), ModelInfo(model_id="mistral:7b", name="mistral:7b")],
+    )], version=1, timestamp=1.0)
+    new_snapshot = DiscoverySnapshot(backends=[BackendInfo(
+        type=BackendType.OLLAMA, name="Ollama", url="http://localhost:11434", is_available=True,
+        models=[ModelInfo(model_id="llama3.1:8b", name="llama3.1:8b", modified_at="2024-02-01T00:00:00Z"),
+                ModelInfo(model_id="qwen2:7b", name="qwen2:7b")],
+    )], version=2, timestamp=2.0)
+    snapshot_diff = SnapshotDiff.between(old_snapshot, new_snapshot)
+    assert [m.model_id for _, m in snapshot_diff.added] == ["qwen2:7b"]
+    assert [m.model_id for _, m in snapshot_diff.removed] == ["mistral:7b"]
+    assert [m.model_id for _, m in snapshot_diff.changed] == ["llama3.1:8b"]
+    assert SnapshotDiff.between(new_snapshot, new_snapshot).is_empty
+    assert [b.name for b in SnapshotDiff.between(DiscoverySnapshot(), new_snapshot).backends_up] == ["Ollama"]
+    log_test("Discovery snapshot diff", "PASS", "+1 -1 ~1 models")
+
+    # Test backend scanner target parsing and fingerprinting
+    from browseros.api.backend_scanner import expand_hosts, fingerprint_models_response, parse_ports
+    assert parse_ports("11434, 8000-8002") == [8000, 8001, 8002, 11434]
+    assert len(expand_hosts(["192.168.1.0/24", "gpu-box", "192.168.1.7"])) == 255
+    assert expand_hosts(["10.0.0.4/31"]) == ["10.0.0.4", "10.0.0.5"]
+    try:
+        expand_hosts(["10.0.0.0/8"])
+        raise AssertionError("oversized range accepted")
+    except ValueError:
+        pass
+    assert fingerprint_models_response({"data": [{"id": "m", "max_model_len": 8192}]}) == BackendType.VLLM
+    assert fingerprint_models_response({"data": [{"id": "m", "owned_by": "organization_owner"}]}) == BackendType.LM_STUDIO
+    assert fingerprint_models_response({"data": []}) == BackendType.OPENAI_COMPATIBLE
+    log_test("Backend scanner parsing", "PASS", "ports, CIDR ranges and fingerprints")
+
     # Check if aiohttp is available for ModelDiscovery tests
     try:
         import aiohttp
@@ -95,6 +130,172 @@ try:
         assert len(discovery.DEFAULT_BACKENDS) >= 3
         log_test("ModelDiscovery init", "PASS", f"{len(discovery.DEFAULT_BACKENDS)} default backends")
 
+        # Test negative caching of unreachable backends (port 1 refuses connections)
+        async def check_refused_backend():
+            async with ModelDiscovery(backoff_base=5.0) as disco:
+                config = {"type": BackendType.OLLAMA, "url": "http://127.0.0.1:1", "name": "Refused"}
+                first = await disco.check_backend(config)
+                second = await disco.check_backend(config)
+                return first, second, disco.get_backend_health()
+
+        refused_first, refused_second, refused_health = asyncio.run(check_refused_backend())
+        assert not refused_first.is_available and refused_first.error
+        assert refused_second.error == refused_first.error
+        assert refused_health["http://127.0.0.1:1"]["failures"] == 1  # Second call skipped by backoff
+        assert 0 < refused_health["http://127.0.0.1:1"]["retry_in"] <= 5.0
+        log_test("Discovery negative caching", "PASS", refused_first.error)
+
+        # Test a backend that accepts connections but never answers is negative-cached too, and logged once
+        import contextlib
+        import io
+
+        async def check_silent_backend():
+            async def never_answer(reader, writer):
+                await reader.read()
+                writer.close()
+
+            server = await asyncio.start_server(never_answer, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with ModelDiscovery(timeout=0.2, backoff_base=5.0) as disco:
+                    config = {"type": BackendType.OLLAMA, "url": f"http://127.0.0.1:{port}", "name": "Silent"}
+                    first_output, second_output = io.StringIO(), io.StringIO()
+                    with contextlib.redirect_stdout(first_output):
+                        first = await disco.check_backend(config)
+                    health = disco.get_backend_health()[config["url"]]
+                    disco.reset_backoff()
+                    with contextlib.redirect_stdout(second_output):
+                        await disco.check_backend(config)
+                    return first, health, first_output.getvalue(), second_output.getvalue()
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        silent, silent_health, silent_first_log, silent_second_log = asyncio.run(check_silent_backend())
+        assert not silent.is_available and silent.error
+        assert silent_health["failures"] == 1 and silent_health["retry_in"] > 0
+        assert "Unreachable" in silent_first_log and silent_second_log == ""  # Unchanged state is not printed again
+        log_test("Discovery HTTP timeout caching", "PASS", silent.error)
+
+        # Test model detail parsing (Ollama /api/show, LM Studio /api/v0/models)
+        from browseros.api.model_discovery import parse_ollama_show, parse_lm_studio_model
+        show = parse_ollama_show({
+            "details": {"family": "llama", "quantization_level": "Q4_K_M"},
+            "model_info": {"general.parameter_count": 8030261248, "llama.context_length": 131072},
+            "template": "{{ if .Tools }}...{{ end }}",
+        })
+        assert show["context_length"] == 131072 and show["parameter_count"] == "8.0B"
+        assert show["capabilities"] == ["completion", "tools"]
+        lm_studio = parse_lm_studio_model({"type": "vlm", "max_context_length": 32768, "capabilities": ["tool_use"]})
+        assert lm_studio["context_length"] == 32768
+        assert lm_studio["capabilities"] == ["completion", "vision", "tools"]
+        log_test("Model detail parsing", "PASS", f"{show['capabilities']}, {lm_studio['capabilities']}")
+
+        # Test a failing detail request is reported once, not on every pass
+        async def enrich_unreachable():
+            from browseros.api.model_discovery import BackendInfo, ModelInfo
+            async with ModelDiscovery() as disco:
+                backend = BackendInfo(type=BackendType.OLLAMA, url="http://127.0.0.1:1", name="Refused",
+                                      is_available=True, models=[ModelInfo("m", "m")])
+                outputs = []
+                for _ in range(2):
+                    output = io.StringIO()
+                    with contextlib.redirect_stdout(output):
+                        await disco.enrich([backend])
+                    outputs.append(output.getvalue())
+                return outputs, disco.details_errors
+
+        enrich_outputs, enrich_errors = asyncio.run(enrich_unreachable())
+        assert enrich_errors == 2
+        assert "no details for m" in enrich_outputs[0] and enrich_outputs[1] == ""
+        log_test("Model detail error logging", "PASS", "printed once per model")
+
+        # Test picking the fastest benchmarked model
+        from browseros.api.model_discovery import BackendInfo, ModelBenchmark, ModelInfo
+        now = time.time()
+        bench_backend = BackendInfo(type=BackendType.OLLAMA, url="http://localhost:11434", name="Ollama", is_available=True, models=[
+            ModelInfo("small", "small", capabilities=["completion"], benchmark=ModelBenchmark(now, ttft_ms=40, tokens_per_second=90)),
+            ModelInfo("large", "large", capabilities=["completion", "tools"], benchmark=ModelBenchmark(now, ttft_ms=120, tokens_per_second=30)),
+            ModelInfo("broken", "broken", benchmark=ModelBenchmark(now, error="timeout")),
+        ])
+        assert discovery.fastest_model([bench_backend])[1].model_id == "small"
+        assert discovery.fastest_model([bench_backend], capability="tools")[1].model_id == "large"
+        assert bench_backend.models[0] == ModelInfo("small", "small", capabilities=["completion"])  # Benchmarks don't affect equality
+        log_test("Model benchmark selection", "PASS", "fastest by ttft and capability")
+
+        # Test every benchmark warms up with its own nonced prompt, also when Ollama reports the model loaded
+        from aiohttp import web
+        from browseros.api.model_discovery import BENCHMARK_PROMPT, BENCHMARK_WARMUP_PROMPT
+
+        async def run_fake_benchmarks():
+            prompts = []
+
+            async def ollama_ps(request):
+                return web.json_response({"models": [{"name": "warm"}]})
+
+            async def ollama_generate(request):
+                body = await request.json()
+                prompts.append(body["prompt"])
+                final = {"done": True, "load_duration": 0, "eval_count": 2, "eval_duration": 10**6}
+                return web.Response(text=json.dumps({"response": "a"}) + "\n" + json.dumps(final) + "\n")
+
+            async def chat_completions(request):
+                body = await request.json()
+                prompts.append(body["messages"][0]["content"])
+                chunk = {"choices": [{"delta": {"content": "a"}}]}
+                return web.Response(text=f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n")
+
+            app = web.Application()
+            app.router.add_get("/api/ps", ollama_ps)
+            app.router.add_post("/api/generate", ollama_generate)
+            app.router.add_post("/v1/chat/completions", chat_completions)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+            try:
+                async with ModelDiscovery() as disco:
+                    ollama = await disco.benchmark_model(BackendInfo(type=BackendType.OLLAMA, url=url, name="Ollama"), ModelInfo("warm", "warm"))
+                    openai = await disco.benchmark_model(BackendInfo(type=BackendType.VLLM, url=f"{url}/v1", name="vLLM"), ModelInfo("m", "m"))
+            finally:
+                await runner.cleanup()
+            return prompts, ollama, openai
+
+        bench_prompts, ollama_bench, openai_bench = asyncio.run(run_fake_benchmarks())
+        assert ollama_bench.error is None and openai_bench.error is None
+        assert ollama_bench.cold is False and ollama_bench.load_ms == 0
+        expected = [BENCHMARK_WARMUP_PROMPT, BENCHMARK_PROMPT, BENCHMARK_WARMUP_PROMPT, BENCHMARK_PROMPT, BENCHMARK_WARMUP_PROMPT]
+        assert [prompt.split("] ", 1)[1] for prompt in bench_prompts] == expected
+        assert len(set(bench_prompts)) == len(bench_prompts)  # Nonces: no run repeats a cached prompt
+        assert openai_bench.load_ms is not None and openai_bench.load_ms >= 0
+        log_test("Model benchmark warm-up", "PASS", "same warm-up sequence, nonced prompts")
+
+        # Test a failed start in thread mode reaches the caller instead of hanging it
+        from browseros.api import DiscoveryService
+
+        class FailingDiscovery(ModelDiscovery):
+            async def start(self):
+                raise OSError("no sockets")
+
+        try:
+            DiscoveryService(discovery=FailingDiscovery()).start_in_thread()
+            raise AssertionError("start_in_thread() did not raise")
+        except OSError as e:
+            log_test("Discovery service startup errors", "PASS", str(e))
+
+        # Test scan results for a default backend under another loopback name are not registered twice
+        scanned = [
+            {"type": BackendType.OLLAMA, "url": "http://127.0.0.1:11434", "name": "Ollama (127.0.0.1:11434)"},
+            {"type": BackendType.LM_STUDIO, "url": "http://[::1]:1234/v1/", "name": "LM Studio (::1:1234)"},
+            {"type": BackendType.VLLM, "url": "http://192.168.1.20:8000/v1", "name": "vLLM (192.168.1.20:8000)"},
+            {"type": BackendType.VLLM, "url": "http://192.168.1.20:8000/v1/", "name": "vLLM (duplicate)"},
+        ]
+        dedup_discovery = ModelDiscovery()
+        assert dedup_discovery.register_backends(scanned) == 1
+        assert [config["url"] for config in dedup_discovery.registered_backends] == ["http://192.168.1.20:8000/v1"]
+        log_test("Backend URL de-duplication", "PASS", "loopback aliases of defaults skipped")
+
         # Test async discovery
         async def test_discovery_async():
             async with ModelDiscovery() as disco:
@@ -243,6 +444,207 @@ try:
     assert not cache_entry.is_expired()  # Should not be expired immediately
     log_test("CacheEntry instantiation", "PASS", f"TTL: {cache_entry.ttl}s")
 
+    # Test bounded ResponseCache (LRU eviction by count and bytes)
+    from browseros.api.response_cache import ResponseCache
+    response_cache = ResponseCache(max_entries=2, max_bytes=100)
+    response_cache.set("a", 1, ttl=300.0, size=10)
+    response_cache.set("b", 2, ttl=300.0, size=10)
+    response_cache.get("a")
+    response_cache.set("c", 3, ttl=300.0, size=10)
+    assert "a" in response_cache and "b" not in response_cache
+    response_cache.set("d", 4, ttl=300.0, size=95)
+    assert len(response_cache) == 1 and response_cache.total_bytes == 95
+    assert not response_cache.set("e", 5, ttl=300.0, size=101)
+    response_cache.set("f", 6, ttl=-1.0, size=5)
+    assert response_cache.sweep() == 1
+    cache_stats = response_cache.get_stats()
+    assert cache_stats["cache_evictions"] == 3 and cache_stats["cache_expirations"] == 1
+    log_test("ResponseCache bounds", "PASS", f"{cache_stats['cache_evictions']} evictions")
+
+    # Test stale retention and conditional headers
+    response_cache.set("etag", {"v": 1}, ttl=-1.0, size=1, etag='"v1"', stale_ttl=300.0)
+    assert response_cache.get("etag") is None
+    stale_entry = response_cache.get_stale("etag")
+    assert stale_entry is not None and stale_entry.data == {"v": 1}
+    assert stale_entry.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert response_cache.sweep() == 0
+    log_test("ResponseCache stale revalidation", "PASS", "Expired entry kept with validators")
+
+    # Test persistent DiskCache tier (survives reopening, enforces size cap)
+    import os
+    import tempfile
+    from browseros.api.disk_cache import DiskCache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk = DiskCache(cache_dir, max_bytes=2000)
+        disk.set("models", CacheEntry(data={"models": ["llama3"]}, timestamp=time.time(), ttl=300.0, size=20))
+        disk.close()
+        disk = DiskCache(cache_dir, max_bytes=2000)
+        changes_before = disk._conn.total_changes
+        assert disk.get("models").data == {"models": ["llama3"]}
+        assert disk._conn.total_changes == changes_before  # Hits don't write
+        for i in range(50):
+            disk.set(f"k{i}", CacheEntry(data={"i": i, "pad": os.urandom(64).hex()}, timestamp=time.time(), ttl=300.0))
+        disk_stats = disk.get_stats()
+        assert disk_stats["disk_cache_bytes"] <= 2000 and disk_stats["disk_cache_evictions"] > 0
+        assert disk_stats["disk_cache_bytes"] == disk._conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+        disk.close()
+    log_test("DiskCache persistence", "PASS", f"{disk_stats['disk_cache_size']} entries after eviction")
+
+    # Test incremental stream decoding (lines split across chunks, SSE events)
+    from browseros.api.streaming import LineSplitter, SSEDecoder, detect_format
+    splitter = LineSplitter()
+    stream_lines = splitter.feed(b'data: {"tok": 1}\r\n\nda') + splitter.feed(b"ta: [DONE]\n\n: ping\n")
+    sse_decoder = SSEDecoder()
+    sse_events = [event for event in map(sse_decoder.feed, stream_lines) if event is not None]
+    assert [event.data for event in sse_events] == ['{"tok": 1}', "[DONE]"]
+    assert sse_events[0].json() == {"tok": 1}
+    assert detect_format("text/event-stream; charset=utf-8") == "sse"
+    assert detect_format("application/x-ndjson") == "ndjson"
+    log_test("Stream decoding", "PASS", f"{len(sse_events)} SSE events")
+
+    # Test token bucket pacing and AIMD concurrency limit
+    from browseros.api.rate_limit import AdaptiveConcurrencyLimiter, TokenBucket, parse_retry_after
+
+    async def test_rate_limits():
+        bucket = TokenBucket(rate=100.0, burst=5)
+        started = time.monotonic()
+        for _ in range(15):
+            await bucket.acquire()
+        paced = time.monotonic() - started
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8, window=10)
+        for _ in range(40):
+            await limiter.acquire()
+            limiter.release(0.01)
+        grown = limiter.limit
+        await limiter.acquire()
+        limiter.release(0.01, overloaded=True)
+        return paced, grown, limiter.limit
+
+    paced, grown, shrunk = asyncio.run(test_rate_limits())
+    assert 0.08 <= paced < 0.5  # 10 tokens beyond the burst at 100/s
+    assert grown > 4 and shrunk < grown
+    assert parse_retry_after("3") == 3.0 and parse_retry_after("soon") is None
+    log_test("Rate limiting", "PASS", f"AIMD limit {grown} -> {shrunk}")
+
+    # Test per-endpoint latency breakdowns and Prometheus export
+    from browseros.api.enhanced_client import RequestStats
+    request_stats = RequestStats(max_endpoints=2)
+    for i in range(100):
+        request_stats.record_request(i + 1, True, endpoint="/api/tags", method="get", status=200)
+    request_stats.record_request(500, False, endpoint="/api/chat", method="POST", status=503)
+    request_stats.record_request(0.01, True, from_cache=True, endpoint="/api/show", method="GET")
+    tags_latency = request_stats.endpoints["/api/tags"].latency.snapshot()
+    assert 40 <= tags_latency["p50"] <= 60 and tags_latency["p99"] <= 100
+    assert set(request_stats.endpoints) == {"/api/tags", "/api/chat", "other"}
+    assert request_stats.methods["GET"].cache_hits == 1
+    assert request_stats.statuses == {"200": 100, "503": 1}
+    prometheus_text = "\n".join(request_stats.prometheus_lines("test"))
+    assert 'test_responses_by_status_total{status="503"} 1' in prometheus_text
+    assert 'test_request_duration_by_method_seconds_count{method="GET"} 100' in prometheus_text
+    log_test("Request latency breakdowns", "PASS", f"/api/tags p50={tags_latency['p50']}ms")
+
+    # Test the HTTP client package does not pull in the MCP package
+    import subprocess
+    mcp_loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, browseros.api; print(any(m.startswith('browseros.mcp') for m in sys.modules))"],
+        cwd=str(Path(__file__).parent), capture_output=True, text=True,
+    ).stdout.strip()
+    assert mcp_loaded == "False", mcp_loaded
+    log_test("API package independent of MCP", "PASS", "browseros.metrics shared")
+
+    # Test hedge policy delay and budget
+    from browseros.api.hedging import HedgePolicy
+    hedge_policy = HedgePolicy(percentile=90.0, min_samples=10, budget_ratio=0.5, budget_burst=1)
+    assert hedge_policy.delay("/api/tags") == hedge_policy.initial_delay
+    for i in range(100):
+        hedge_policy.observe("/api/tags", (i + 1) / 1000)
+    assert abs(hedge_policy.delay("/api/tags") - 0.091) < 1e-9
+    assert hedge_policy.try_hedge() and not hedge_policy.try_hedge()
+    hedge_policy.start_request()
+    hedge_policy.start_request()
+    assert hedge_policy.try_hedge()
+    assert hedge_policy.applies_to("get") and not hedge_policy.applies_to("POST")
+    log_test("Hedge policy", "PASS", f"delay={hedge_policy.delay('/api/tags') * 1000:.0f}ms")
+
+    # Test upstream pool selection
+    from browseros.api.pool import UpstreamPool
+    upstream_pool = UpstreamPool(["http://gpu-1:8000/", "http://gpu-2:8000", "http://gpu-3:8000"])
+    first, second, third = upstream_pool.upstreams
+    first.outstanding, second.outstanding, third.outstanding = 3, 1, 2
+    assert upstream_pool.choose(upstream_pool.upstreams) is second
+    assert upstream_pool.choose([first, third]) is third
+    with upstream_pool.track(third):
+        assert third.outstanding == 3
+    assert third.outstanding == 2 and third.requests == 1
+    assert upstream_pool.find("http://gpu-1:8000/v1/models") is first
+    assert first.url_for("/v1/models") == "http://gpu-1:8000/v1/models"
+    p2c_pool = UpstreamPool(["http://a", "http://b"], strategy="p2c")
+    p2c_pool.upstreams[0].outstanding = 5
+    assert p2c_pool.choose(p2c_pool.upstreams) is p2c_pool.upstreams[1]
+    log_test("Upstream pool", "PASS", "least outstanding and p2c selection")
+
+    # Test thread-safe ShardedResponseCache
+    import threading
+    from browseros.api.response_cache import ShardedResponseCache
+    sharded_cache = ShardedResponseCache(max_entries=400, shards=4)
+
+    def fill_shards(offset):
+        for i in range(100):
+            sharded_cache.set(f"k{offset + i}", i, ttl=300.0, size=1)
+            sharded_cache.get(f"k{offset + i}")
+
+    fill_threads = [threading.Thread(target=fill_shards, args=(n * 100,)) for n in range(4)]
+    for t in fill_threads:
+        t.start()
+    for t in fill_threads:
+        t.join()
+    assert len(sharded_cache) + sharded_cache.get_stats()["cache_evictions"] == 400
+    assert sharded_cache.total_bytes == len(sharded_cache)
+    log_test("ShardedResponseCache threads", "PASS", f"{len(sharded_cache)} entries in 4 shards")
+
+    # Test lock-free deduplication through the client (in-process fake server)
+    from browseros.api.enhanced_client import HAS_AIOHTTP
+    if HAS_AIOHTTP:
+        from browseros.api.cache_benchmark import run_variant
+        dedup_run = asyncio.run(run_variant("lock-free", concurrency=50, requests_per_task=2, keys=5, latency=0.01))
+        assert dedup_run["requests"] == 100
+        assert dedup_run["deduplicated"] > 0
+        log_test("Lock-free request deduplication", "PASS", f"{dedup_run['deduplicated']} deduplicated")
+    else:
+        log_test("Lock-free request deduplication", "WARN", "aiohttp not installed (optional)")
+
+    # Test batch requests through the client (in-process fake server)
+    if HAS_AIOHTTP:
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        from browseros.api.batch import BatchRequest
+
+        async def echo_handler(request):
+            return web.json_response({"path": request.path, **request.query})
+
+        async def run_batch():
+            batch_app = web.Application()
+            batch_app.router.add_get("/{tail:.*}", echo_handler)
+            async with TestServer(batch_app) as server:
+                async with EnhancedAPIClient(str(server.make_url("/"))) as batch_client:
+                    requests = [BatchRequest("GET", f"/item/{i}") for i in range(30)]
+                    requests.append({"method": "GET", "endpoint": "/item/0", "use_cache": False})
+                    requests.append({"method": "GET", "endpoint": "/item/0", "bogus": True})  # Malformed spec
+                    ordered = [r async for r in batch_client.request_many(requests, concurrency=4, ordered=True)]
+                    mapped = await batch_client.map("GET", "/item", [{"page": str(i)} for i in range(5)])
+                    return ordered, mapped
+
+        ordered_results, mapped_results = asyncio.run(run_batch())
+        assert [r.index for r in ordered_results] == list(range(32))
+        assert all(r.ok for r in ordered_results[:31] + mapped_results)
+        assert isinstance(ordered_results[31].error, TypeError) and ordered_results[31].request is None
+        assert ordered_results[7].data == {"path": "/item/7"}
+        assert [r.data["page"] for r in mapped_results] == [str(i) for i in range(5)]
+        log_test("Batch requests", "PASS", f"{len(ordered_results)} ordered, {len(mapped_results)} mapped")
+    else:
+        log_test("Batch requests", "WARN", "aiohttp not installed (optional)")
+
     # Test EnhancedAPIClient initialization
     try:
         client = EnhancedAPIClient(
@@ -339,6 +741,322 @@ try:
     assert "result" in response_data or "error" in response_data
     log_test("MCPJsonRpcServer request handling", "PASS", "Request processed")
 
+    # Test concurrent request handling
+    async def slow_tool(params: dict) -> str:
+        await asyncio.sleep(0.05)
+        return "done"
+
+    server.add_tool("slow_tool", slow_tool)
+
+    async def test_concurrent_handling():
+        requests = [
+            json.dumps({
+                "jsonrpc": "2.0",
+                "method": "tools/call",
+                "params": {"name": "slow_tool", "arguments": {}},
+                "id": i,
+            })
+            for i in range(10)
+        ]
+        return await asyncio.gather(*(server.handle_request_async(r) for r in requests))
+
+    responses = [json.loads(r) for r in asyncio.run(test_concurrent_handling())]
+    assert [r["id"] for r in responses] == list(range(10))
+    assert all(r["result"]["result"] == "done" for r in responses)
+    log_test("MCPJsonRpcServer concurrent handling", "PASS", f"{len(responses)} requests")
+
+    # Test batch request handling
+    batch_json = json.dumps([
+        {"jsonrpc": "2.0", "method": "ping", "id": "a"},
+        {"jsonrpc": "2.0", "method": "tools/list", "id": "b"},
+        {"jsonrpc": "2.0", "method": "ping"},
+    ])
+    batch_data = json.loads(server.handle_request(batch_json))
+    assert sorted(r["id"] for r in batch_data) == ["a", "b"]
+    log_test("MCPJsonRpcServer batch handling", "PASS", f"{len(batch_data)} responses")
+
+    # Test both stdio clients against a real server subprocess
+    from browseros.mcp import AsyncStdioSubprocessClient, JsonRpcErrorCode, JsonRpcException, JsonRpcRequest, StdioSubprocessClient
+    stdio_command = [sys.executable, "-c", f"""
+import asyncio, os, sys, time
+sys.path.insert(0, {str(Path(__file__).parent)!r})
+from browseros.mcp import create_stdio_server
+server = create_stdio_server()
+server.add_tool("echo", lambda params: params)
+server.add_tool("sleep", lambda params: time.sleep(params["seconds"]) or "slept")
+server.add_tool("exit", lambda params: os._exit(0))
+server.add_tool("count", lambda params: (str(i) for i in range(params["n"])))
+cancelled = []
+async def hang(params):
+    try:
+        await asyncio.sleep(30)
+    except asyncio.CancelledError:
+        cancelled.append(params)
+        raise
+server.add_tool("hang", hang)
+server.add_tool("cancelled", lambda params: len(cancelled))
+server.run(concurrent="--concurrent" in sys.argv)
+"""]
+
+    def expect_error(call):
+        try:
+            call()
+        except JsonRpcException as e:
+            return e.code
+        raise AssertionError("call did not fail")
+
+    with StdioSubprocessClient(stdio_command, timeout=10) as stdio_client:
+        assert stdio_client.call_tool("echo", {"n": 1})["result"] == {"n": 1}
+        stdio_batch = stdio_client.call_tools([("echo", {"n": 2}), ("echo", {"n": 3})])
+        assert [response.result["result"]["n"] for response in stdio_batch] == [2, 3]
+        # The sequential server is busy with the sleep, so the next calls time out
+        slow = stdio_client.submit(JsonRpcRequest(method="tools/call", params={"name": "sleep", "arguments": {"seconds": 0.5}}, id="slow"))
+        assert expect_error(lambda: stdio_client.request("ping", timeout=0.05)) == JsonRpcErrorCode.REQUEST_TIMEOUT
+        assert expect_error(lambda: stdio_client.call_tool("echo", {}, timeout=0.05)) == JsonRpcErrorCode.TOOL_TIMEOUT
+        assert slow.result(timeout=5).result["result"] == "slept"
+        stdio_chunks = []
+        streamed = stdio_client.call_tool("count", {"n": 3}, on_chunk=stdio_chunks.append)
+        assert stdio_chunks == ["0", "1", "2"] and streamed["chunks"] == 3
+        assert expect_error(lambda: stdio_client.call_tool("exit", {})) == JsonRpcErrorCode.INTERNAL_ERROR
+    log_test("StdioSubprocessClient", "PASS", "call, batch, timeouts, streaming, server exit")
+
+    async def drive_async_stdio_client():
+        async def expect_async_error(call):
+            try:
+                await call
+            except JsonRpcException as e:
+                return e.code
+            raise AssertionError("call did not fail")
+
+        async with AsyncStdioSubprocessClient(stdio_command, timeout=10) as client:
+            assert (await client.call_tool("echo", {"n": 1}))["result"] == {"n": 1}
+            batch = await client.call_tools([("echo", {"n": 2}), ("echo", {"n": 3})])
+            assert [response.result["result"]["n"] for response in batch] == [2, 3]
+            slow = asyncio.ensure_future(client.call_tool("sleep", {"seconds": 0.5}))
+            await asyncio.sleep(0.05)
+            assert await expect_async_error(client.ping(timeout=0.05)) == JsonRpcErrorCode.REQUEST_TIMEOUT
+            assert await expect_async_error(client.call_tool("echo", {}, timeout=0.05)) == JsonRpcErrorCode.TOOL_TIMEOUT
+            assert (await slow)["result"] == "slept"
+            chunks = []
+            streamed = await client.call_tool("count", {"n": 3}, on_chunk=chunks.append)
+            assert chunks == ["0", "1", "2"] and streamed["chunks"] == 3
+            assert await expect_async_error(client.call_tool("exit", {})) == JsonRpcErrorCode.INTERNAL_ERROR
+
+    asyncio.run(drive_async_stdio_client())
+    log_test("AsyncStdioSubprocessClient", "PASS", "call, batch, timeouts, streaming, server exit")
+
+    # Test errors sent with "id": null fail the request or batch member that caused them
+    null_id_command = [sys.executable, "-c", """
+import json, sys
+for line in sys.stdin:
+    message = json.loads(line)
+    error = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid request"}}
+    if isinstance(message, list):
+        print(json.dumps([{"jsonrpc": "2.0", "id": message[0]["id"], "result": {}}, error]), flush=True)
+    else:
+        print(json.dumps(error), flush=True)
+"""]
+    null_id_batch = [JsonRpcRequest(method="ping", id="p"), JsonRpcRequest(method="ping", id="q")]
+    with StdioSubprocessClient(null_id_command, timeout=5) as null_id_client:
+        assert expect_error(lambda: null_id_client.request("ping")) == JsonRpcErrorCode.INVALID_REQUEST
+        mixed = null_id_client.send_batch(null_id_batch)
+        assert mixed[0].error is None and mixed[1].error.code == JsonRpcErrorCode.INVALID_REQUEST.value
+
+    async def drive_async_null_id_client():
+        async with AsyncStdioSubprocessClient(null_id_command, timeout=5) as client:
+            try:
+                await client.request("ping")
+                raise AssertionError("call did not fail")
+            except JsonRpcException as e:
+                assert e.code == JsonRpcErrorCode.INVALID_REQUEST
+            return await client.send_batch(null_id_batch)
+
+    mixed = asyncio.run(drive_async_null_id_client())
+    assert mixed[0].error is None and mixed[1].error.code == JsonRpcErrorCode.INVALID_REQUEST.value
+    log_test("Stdio client null-id errors", "PASS", "request and batch member failed")
+
+    # Test a timed-out call is cancelled on the server with $/cancelRequest
+    with StdioSubprocessClient(stdio_command + ["--concurrent"], timeout=10) as stdio_client:
+        assert expect_error(lambda: stdio_client.call_tool("hang", {}, timeout=0.1)) == JsonRpcErrorCode.TOOL_TIMEOUT
+        deadline = time.time() + 5
+        while stdio_client.call_tool("cancelled", {})["result"] < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        assert stdio_client.call_tool("cancelled", {})["result"] == 1
+
+    async def cancel_async_stdio_call():
+        async with AsyncStdioSubprocessClient(stdio_command + ["--concurrent"], timeout=10) as client:
+            try:
+                await client.call_tool("hang", {}, timeout=0.1)
+                raise AssertionError("hang did not time out")
+            except JsonRpcException as e:
+                assert e.code == JsonRpcErrorCode.TOOL_TIMEOUT
+            deadline = time.time() + 5
+            while (await client.call_tool("cancelled", {}))["result"] < 1 and time.time() < deadline:
+                await asyncio.sleep(0.01)
+            return (await client.call_tool("cancelled", {}))["result"]
+
+    assert asyncio.run(cancel_async_stdio_call()) == 1
+    log_test("MCP stdio client cancellation", "PASS", "timed-out calls cancelled on the server")
+
+    # Test every installed codec produces the same response
+    from browseros.mcp.codec import available_codecs
+    codec_outputs = set()
+    for codec_name in available_codecs():
+        codec_server = MCPJsonRpcServer(codec=codec_name)
+        codec_server.add_tool("bytes_tool", lambda params: {"data": b"\x00\x01"})
+        codec_outputs.add(codec_server.handle_request(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {"name": "bytes_tool", "arguments": {}},
+            "id": "c",
+        })))
+    assert len(codec_outputs) == 1
+    log_test("MCP JSON codecs", "PASS", ", ".join(available_codecs()))
+
+    # Test generator tools are joined into one result without a progress token
+    stream_server = MCPJsonRpcServer()
+    stream_server.add_tool("count", lambda params: (i for i in range(3)))
+    joined = json.loads(stream_server.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call",
+        "params": {"name": "count", "arguments": {}}, "id": "g",
+    })))["result"]
+    assert joined["result"] == [0, 1, 2]
+    log_test("MCP streamed tool result", "PASS", f"{len(joined['result'])} chunks joined")
+
+    # Test the sync path pulls async-generator chunks one at a time
+    stream_log = []
+
+    async def produce_chunks():
+        for i in range(3):
+            stream_log.append(f"produce {i}")
+            await asyncio.sleep(0)
+            yield i
+
+    for chunk in stream_server._iter_async_chunks(produce_chunks()):
+        stream_log.append(f"consume {chunk}")
+    assert stream_log[:4] == ["produce 0", "consume 0", "produce 1", "consume 1"]
+    log_test("MCP sync async-generator streaming", "PASS", "chunks interleaved")
+
+    # Test per-tool input schema and timeout
+    import time as _time
+    limits_server = MCPJsonRpcServer()
+    limits_server.add_tool("typed", lambda params: params, input_schema={
+        "type": "object", "properties": {"url": {"type": "string"}}, "required": ["url"],
+    })
+    limits_server.add_tool("stuck", lambda params: _time.sleep(1), timeout=0.05)
+    schema_error = json.loads(limits_server.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call",
+        "params": {"name": "typed", "arguments": {"url": 1}}, "id": "s",
+    })))["error"]
+    assert schema_error["code"] == -32602
+    timeout_error = json.loads(limits_server.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call",
+        "params": {"name": "stuck", "arguments": {}}, "id": "t",
+    })))["error"]
+    assert timeout_error["code"] == -32002
+    try:
+        limits_server.add_tool("misspelled", lambda params: params, input_schema={"type": "strnig"})
+        raise AssertionError("malformed schema registered")
+    except ValueError:
+        pass
+    assert limits_server.tool_specs["typed"].validator is not None
+    log_test("MCP tool schema and timeout", "PASS", timeout_error["message"])
+
+    # Test server/metrics reports the requests handled so far
+    metrics = json.loads(limits_server.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "server/metrics", "id": "m",
+    })))["result"]
+    assert metrics["tools"]["stuck"]["errors"] == 1
+    assert metrics["errors"]["TOOL_TIMEOUT"] == 1
+    assert "browseros_mcp_tools_total" in limits_server.metrics.to_prometheus()
+    log_test("MCP server metrics", "PASS", f"{metrics['methods']['tools/call']['count']} tool calls")
+
+    # Test idempotent tools are served from the result cache
+    from browseros.mcp import ToolResultCache
+    cache_server = MCPJsonRpcServer(result_cache=ToolResultCache())
+    cache_server.add_tool("lookup", lambda params: {"key": params["key"]}, idempotent=True)
+    for arguments in ({"key": "a", "x": 1}, {"x": 1, "key": "a"}):
+        cache_server.handle_request(json.dumps({
+            "jsonrpc": "2.0", "method": "tools/call",
+            "params": {"name": "lookup", "arguments": arguments}, "id": "r",
+        }))
+    cache_stats = cache_server.result_cache.stats()
+    assert cache_stats["hits"] == 1 and cache_stats["misses"] == 1
+    cache_prometheus = cache_server.metrics.to_prometheus()
+    assert "# TYPE browseros_mcp_result_cache_hits_total counter" in cache_prometheus
+    assert "# TYPE browseros_mcp_result_cache_bytes gauge" in cache_prometheus
+    log_test("MCP tool result cache", "PASS", f"hit rate {cache_stats['hit_rate']}")
+
+    # Test only a lone cancel notification bypasses the concurrency limit,
+    # and a tools/call id cannot be in flight twice
+    cancel_server = MCPJsonRpcServer()
+    cancel = {"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": "x"}}
+    assert cancel_server._is_cancel_notification(json.dumps(cancel).encode(), [])
+    assert not cancel_server._is_cancel_notification(json.dumps([cancel]).encode(), [])
+    assert not cancel_server._is_cancel_notification(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "id": "y",
+        "params": {"name": "echo", "arguments": {"text": "$/cancelRequest"}},
+    }).encode(), [])
+
+    async def call_same_id_twice():
+        async def wait(params):
+            await asyncio.sleep(0.05)
+            return "done"
+        cancel_server.add_tool("wait", wait)
+        line = json.dumps({"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "wait", "arguments": {}}, "id": 7})
+        return await asyncio.gather(cancel_server.handle_request_async(line), cancel_server.handle_request_async(line))
+
+    same_id = [json.loads(response) for response in asyncio.run(call_same_id_twice())]
+    assert "result" in same_id[0] and same_id[1]["error"]["code"] == -32600
+    log_test("MCP cancel isolation", "PASS", same_id[1]["error"]["message"])
+
+    # Test the benchmark harness drives a real server subprocess
+    from dataclasses import asdict
+    from browseros.mcp.benchmark import BenchmarkConfig, compare_to_baseline, run_benchmark
+    bench_result = asyncio.run(run_benchmark(BenchmarkConfig(concurrency=4, duration=0.3, warmup=0.1)))
+    assert bench_result.requests > 0 and not bench_result.errors
+    assert bench_result.latency_ms["p50"] <= bench_result.latency_ms["p99"]
+    log_test("MCP benchmark harness", "PASS", f"{bench_result.throughput_rps:.0f} req/s")
+
+    # Test benchmark baselines are only compared for the same workload
+    bench_run = {"config": asdict(BenchmarkConfig(tool="blob")), "throughput_rps": 800.0, "latency_ms": {"p99": 2.0}}
+    bench_baseline = {"config": asdict(BenchmarkConfig(tool="async_sleep")), "throughput_rps": 1000.0, "latency_ms": {"p99": 1.0}}
+    try:
+        compare_to_baseline(bench_run, bench_baseline, 0.1)
+        raise AssertionError("mismatched baseline was compared")
+    except ValueError as e:
+        mismatch = str(e)
+    assert "tool" in mismatch
+    bench_baseline["config"]["tool"] = "blob"
+    bench_baseline["config"]["duration"] = 60.0  # Only affects precision
+    assert len(compare_to_baseline(bench_run, bench_baseline, 0.1)) == 2
+    log_test("MCP benchmark baseline config", "PASS", mismatch.split(": ", 1)[1])
+
+    # Test content-length framing carries bytes as raw attachments
+    import io
+    from browseros.mcp.codec import get_codec
+    from browseros.mcp.framing import ContentLengthFraming, decode_message, encode_message
+    framing = ContentLengthFraming()
+    wire = encode_message(get_codec(), framing, {"id": "f", "result": {"data": b"\x00\xff"}})
+    body, attachments = framing.read(io.BytesIO(wire))
+    assert attachments == [b"\x00\xff"]
+    assert decode_message(get_codec(), body, attachments)["result"]["data"] == b"\x00\xff"
+    log_test("MCP content-length framing", "PASS", f"{len(wire)} bytes on the wire")
+
+    # Test frame lengths are bounds-checked before anything is read
+    for header in (b"Content-Length: -1", b"Content-Length: 10\r\nAttachment-Lengths: 1,-5", b"Content-Length: 2000"):
+        try:
+            ContentLengthFraming(max_message_size=1024).read(io.BytesIO(header + b"\r\n\r\n"))
+            raise AssertionError(f"accepted {header!r}")
+        except ValueError:
+            pass
+    bounded_server = MCPJsonRpcServer()
+    bounded_output = io.BytesIO()
+    asyncio.run(bounded_server.serve(io.BytesIO(b"Content-Length: 99999999999\r\n\r\n"), bounded_output, framing="content-length"))
+    frame_error = json.loads(ContentLengthFraming().read(io.BytesIO(bounded_output.getvalue()))[0])["error"]
+    assert frame_error["code"] == -32700 and "maximum message size" in frame_error["message"]
+    log_test("MCP frame length limits", "PASS", frame_error["message"])
+
 except ImportError as e:
     log_test("Import json_transport", "FAIL", str(e))
 except Exception as e: